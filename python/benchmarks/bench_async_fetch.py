@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+"""Compares the peak memory and the time of the async fetch response modes
+
+    python benchmarks/bench_async_fetch.py [--size 5] [--concurrency 20] [--rounds 3]
+
+Serves large json payloads from a local server and polls them concurrently
+with the default text mode, with aiohttp_read_bytes and with incremental
+decoding (when ijson is installed). The peak is measured with tracemalloc
+and includes the responses retained on the instance. Two shapes are served:
+a list of trade-like records and an order book-like list of number arrays,
+incremental decoding only pays off on the latter, ijson does not share the
+key strings between the records like json.loads does.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt.async_support as ccxt  # noqa: E402
+from ccxt.async_support.base import exchange as async_exchange  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+
+def serve(payload):
+
+    class Handler(BaseHTTPRequestHandler):
+
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server
+
+
+async def poll(config, url, concurrency, rounds):
+    exchanges = [ccxt.Exchange(dict(config, id='bench')) for i in range(0, concurrency)]
+    try:
+        tracemalloc.start()
+        start = time.perf_counter()
+        for i in range(0, rounds):
+            await asyncio.gather(*[exchange.fetch(url) for exchange in exchanges])
+        elapsed = time.perf_counter() - start
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return elapsed, peak
+    finally:
+        for exchange in exchanges:
+            await exchange.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size', type=float, default=5, help='payload size in megabytes')
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--rounds', type=int, default=3)
+    argv = parser.parse_args()
+    shapes = [
+        ('records', {'symbol': 'BTC/USDT', 'price': 12345.678, 'amount': 0.01234, 'timestamp': 1600000000000, 'side': 'buy'}),
+        ('arrays', [12345.678, 0.01234, 1600000000000]),
+    ]
+    modes = [
+        ('text', {}),
+        ('bytes', {'aiohttp_read_bytes': True}),
+    ]
+    if async_exchange.ijson is not None:
+        modes.append(('streamed', {'aiohttp_read_bytes': True, 'aiohttp_stream_threshold': 1024 * 1024}))
+    for shape, row in shapes:
+        count = int(argv.size * 1024 * 1024 / len(json.dumps(row)))
+        server = serve(json.dumps([row] * count).encode())
+        url = 'http://127.0.0.1:' + str(server.server_port) + '/'
+        for name, config in modes:
+            elapsed, peak = asyncio.run(poll(config, url, argv.concurrency, argv.rounds))
+            print('{:>8} {:>9} {} x {:.1f}MB x {} rounds: {:.2f}s, peak {:.0f}MB'.format(shape, name, argv.concurrency, argv.size, argv.rounds, elapsed, peak / 1024 / 1024))
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
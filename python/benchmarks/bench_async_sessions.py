@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+"""Compares the startup time and memory of many async instances
+
+    python benchmarks/bench_async_sessions.py [--instances 150]
+
+Opens the sessions of many instances the way open() used to (an SSL context
+loaded from the CA bundle and a connector per instance), with the cached
+SSL context and with one shared session. Each mode runs in a subprocess and
+reports its wall time and the growth of the resident set size.
+"""
+
+import argparse
+import asyncio
+import os
+import resource
+import ssl
+import subprocess
+import sys
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import aiohttp  # noqa: E402
+import ccxt.async_support as ccxt  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+
+class legacy(ccxt.Exchange):
+
+    def open(self):
+        """The former implementation, kept for comparison"""
+        if self.own_session and self.session is None:
+            context = ssl.create_default_context(cafile=self.cafile) if self.verify else self.verify
+            connector = aiohttp.TCPConnector(ssl=context, loop=self.asyncio_loop, enable_cleanup_closed=True)
+            self.session = aiohttp.ClientSession(loop=self.asyncio_loop, connector=connector, trust_env=self.aiohttp_trust_env)
+
+
+async def run(mode, instances):
+    exchange_class = legacy if mode == 'legacy' else ccxt.Exchange
+    config = {'id': 'bench', 'aiohttp_shared_session': mode == 'shared'}
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    exchanges = [exchange_class(config) for i in range(0, instances)]
+    for exchange in exchanges:
+        exchange.open()
+    elapsed = time.perf_counter() - start
+    growth = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss
+    sessions = len(set(id(exchange.session) for exchange in exchanges))
+    for exchange in exchanges:
+        await exchange.close()
+    return elapsed, growth, sessions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--instances', type=int, default=150)
+    parser.add_argument('--mode', choices=['legacy', 'cached', 'shared'])
+    argv = parser.parse_args()
+    if argv.mode:
+        elapsed, growth, sessions = asyncio.run(run(argv.mode, argv.instances))
+        print('{:>7} {} instances, {} sessions: {:.3f}s, rss +{:.1f}MB'.format(argv.mode, argv.instances, sessions, elapsed, growth / 1024))
+    else:
+        for mode in ('legacy', 'cached', 'shared'):
+            subprocess.check_call([sys.executable, os.path.abspath(__file__), '--mode', mode, '--instances', str(argv.instances)])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+"""Measures the binary codecs on the payloads that wavesexchange signs for its orders
+
+    python benchmarks/bench_binary_codecs.py [--payloads 20000]
+
+The before figures are the codecs as they were before, taken from the
+parity test, the after figures are the codecs of Exchange. A payload is that
+of create_order: the public keys and the assets in base58, the numbers in
+big endian and the concatenation of all of them, then the base58 of the
+signature of 64 bytes.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.base.exchange import Exchange  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+
+def measure(method, payloads):
+    start = time.perf_counter()
+    for i in range(0, payloads):
+        method()
+    return (time.perf_counter() - start) / payloads
+
+
+def compare(name, before, after, payloads):
+    assert before() == after(), name
+    elapsed = [min(measure(method, payloads) for i in range(0, 3)) for method in (before, after)]
+    print('{:>16} before {:7.2f}us  after {:6.2f}us per payload ({:.2f}x)'.format(name, elapsed[0] * 1e6, elapsed[1] * 1e6, elapsed[0] / elapsed[1]))
+
+
+def order_payload(codecs, keys, numbers):
+    """The bytes of an order of wavesexchange, as in its create_order"""
+    base58_to_binary, number_to_be, binary_concat, binary_concat_array = codecs
+    apiKey, matcherPublicKey, baseId, quoteId = keys
+    return binary_concat_array([
+        number_to_be(3, 1),
+        base58_to_binary(apiKey),
+        base58_to_binary(matcherPublicKey),
+        binary_concat(number_to_be(1, 1), base58_to_binary(baseId)),
+        binary_concat(number_to_be(1, 1), base58_to_binary(quoteId)),
+        number_to_be(0, 1),
+    ] + [number_to_be(number, 8) for number in numbers] + [
+        number_to_be(0, 1),
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--payloads', type=int, default=20000)
+    argv = parser.parse_args()
+    # the codecs of the parity test, without running the test
+    with open(os.path.join(root, 'test', 'test_binary_codecs.py')) as file:
+        source = file.read()
+    scope = {}
+    exec(source[source.index('alphabet = '):source.index('def call(')], scope)
+    random.seed(58)
+    keys = [Exchange.binary_to_base58(os.urandom(32)) for i in range(0, 4)]
+    # price, amount, timestamp, expiration and fee
+    numbers = [random.randint(1, 10 ** 12), random.randint(1, 10 ** 10), 1600000000000, 1602592000000, 300000]
+    signature = os.urandom(64)
+    encoded = Exchange.binary_to_base58(signature)
+    legacy = scope['legacy_base58_to_binary'], scope['legacy_number_to_be'], scope['legacy_binary_concat'], lambda array: scope['legacy_binary_concat'](*array)
+    codecs = Exchange.base58_to_binary, Exchange.number_to_be, Exchange.binary_concat, Exchange.binary_concat_array
+    compare('order payload', lambda: order_payload(legacy, keys, numbers), lambda: order_payload(codecs, keys, numbers), argv.payloads)
+    compare('number_to_be', lambda: [scope['legacy_number_to_be'](number, 8) for number in numbers], lambda: [Exchange.number_to_be(number, 8) for number in numbers], argv.payloads)
+    compare('base58_to_binary', lambda: scope['legacy_base58_to_binary'](keys[0]), lambda: Exchange.base58_to_binary(keys[0]), argv.payloads)
+    compare('binary_to_base58', lambda: scope['legacy_binary_to_base58'](signature), lambda: Exchange.binary_to_base58(signature), argv.payloads)
+    compare('signature', lambda: scope['legacy_base58_to_binary'](encoded), lambda: Exchange.base58_to_binary(encoded), argv.payloads)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+"""Measures the matching of error messages with the broad tables of exceptions of all the exchanges
+
+    python benchmarks/bench_broad_matcher.py [--messages 200]
+
+The before figures are the matching as it was before, taken from the parity
+test, the after figures are find_broadly_matched_key. The repeated messages
+are those of a degraded exchange, answering each request with one of the same
+few errors, the distinct messages are matched once each.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+from ccxt.base.broad_matcher import matchers  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+
+def measure(method, cases):
+    start = time.perf_counter()
+    for exchange, broad, message in cases:
+        method(exchange, broad, message)
+    return (time.perf_counter() - start) / len(cases)
+
+
+def compare(name, before, after, cases):
+    for case in cases:
+        assert before(*case) == after(*case), case
+    matchers.clear()
+    elapsed = [min(measure(method, cases) for i in range(0, 3)) for method in (before, after)]
+    print('{:>18} before {:6.2f}us  after {:5.2f}us per message ({:.2f}x)'.format(name, elapsed[0] * 1e6, elapsed[1] * 1e6, elapsed[0] / elapsed[1]))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--messages', type=int, default=200)
+    argv = parser.parse_args()
+    # the matching of the parity test, without running the test
+    with open(os.path.join(root, 'test', 'test_broad_matcher.py')) as file:
+        source = file.read()
+    scope = {}
+    exec(source[source.index('def legacy_find_broadly_matched_key('):source.index('def call(')], scope)
+    random.seed(25)
+    tables = []
+    for id in ccxt.exchanges:
+        exchange = getattr(ccxt, id)()
+        broad = exchange.exceptions.get('broad') if isinstance(exchange.exceptions, dict) else None
+        if broad:
+            tables.append((exchange, broad))
+    repeated = []
+    distinct = []
+    for exchange, broad in tables:
+        # the body of an error response with one of the keys or none of them
+        errors = ['{"code":-1,"msg":"' + random.choice(list(broad) + ['Internal server error']) + '"}' for i in range(0, 3)]
+        repeated += [(exchange, broad, random.choice(errors)) for i in range(0, argv.messages)]
+        distinct += [(exchange, broad, error[:-2] + ' (request ' + str(i) + ')"}') for i in range(0, argv.messages) for error in errors[:1]]
+
+    def before(exchange, broad, message):
+        return scope['legacy_find_broadly_matched_key'](broad, message)
+
+    def after(exchange, broad, message):
+        return exchange.find_broadly_matched_key(broad, message)
+
+    print('{} broad tables'.format(len(tables)))
+    compare('repeated messages', before, after, repeated)
+    compare('distinct messages', before, after, distinct)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+"""Measures decimal_to_precision on the prices and the amounts of an order book
+
+    python benchmarks/bench_decimal_to_precision.py [--levels 1000] [--repeat 20]
+
+The before figures are the implementation that checked its arguments and set
+the decimal context on every call, the batch figures are decimals_to_precision.
+"""
+
+import argparse
+import decimal
+import os
+import random
+import sys
+import timeit
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.base import decimal_to_precision as module  # noqa: E402
+from ccxt.base.decimal_to_precision import decimal_to_precision, decimals_to_precision  # noqa: E402
+from ccxt.base.decimal_to_precision import TRUNCATE, ROUND, DECIMAL_PLACES, SIGNIFICANT_DIGITS, TICK_SIZE, NO_PADDING  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--levels', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=20)
+    argv = parser.parse_args()
+    # the reference implementation of the parity test, without running the test
+    with open(os.path.join(root, 'test', 'test_decimal_to_precision_batch.py')) as file:
+        source = file.read()
+    scope = dict(vars(module))
+    exec(source[source.index('def legacy_decimal_to_precision('):source.index('def call(')], scope)
+    before = scope['legacy_decimal_to_precision']
+    random.seed(1)
+    prices = [47000 + random.randint(-100000, 100000) / 1000 for i in range(0, argv.levels)]
+    amounts = [random.randint(1, 10 ** 8) / 10 ** 8 for i in range(0, argv.levels)]
+    cases = [
+        ('price decimals', prices, ROUND, 2, DECIMAL_PLACES),
+        ('amount decimals', amounts, TRUNCATE, 5, DECIMAL_PLACES),
+        ('price significant', prices, ROUND, 5, SIGNIFICANT_DIGITS),
+        ('price tick', prices, ROUND, 0.01, TICK_SIZE),
+        ('amount tick', amounts, TRUNCATE, 0.00001, TICK_SIZE),
+    ]
+    for name, values, rounding_mode, precision, counting_mode in cases:
+        with decimal.localcontext():
+            legacy = [before(value, rounding_mode, precision, counting_mode, NO_PADDING) for value in values]
+        assert legacy == [decimal_to_precision(value, rounding_mode, precision, counting_mode, NO_PADDING) for value in values], name
+        assert legacy == decimals_to_precision(values, rounding_mode, precision, counting_mode, NO_PADDING), name
+        with decimal.localcontext():
+            elapsed = [min(timeit.repeat(method, number=argv.repeat, repeat=3)) / argv.repeat / argv.levels for method in (
+                lambda: [before(value, rounding_mode, precision, counting_mode, NO_PADDING) for value in values],
+                lambda: [decimal_to_precision(value, rounding_mode, precision, counting_mode, NO_PADDING) for value in values],
+                lambda: decimals_to_precision(values, rounding_mode, precision, counting_mode, NO_PADDING),
+            )]
+        print('{:>18} before {:6.0f}ns  after {:6.0f}ns ({:.1f}x)  batch {:6.0f}ns ({:.1f}x)'.format(
+            name, elapsed[0] * 1e9, elapsed[1] * 1e9, elapsed[0] / elapsed[1], elapsed[2] * 1e9, elapsed[0] / elapsed[2]))
+
+
+if __name__ == '__main__':
+    main()
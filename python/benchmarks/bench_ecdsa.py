@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+"""Measures Exchange.ecdsa on the curves of the exchanges
+
+    python benchmarks/bench_ecdsa.py [--signatures 20]
+
+The before figures sign with the vendored python-ecdsa and a new SigningKey
+per call, the first figure of a curve includes building its table, and
+secp256k1 is measured with libsecp256k1 when coincurve is installed.
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.base import ecdsa_signer  # noqa: E402
+from ccxt.base.exchange import Exchange  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+
+def measure(method, requests):
+    start = time.perf_counter()
+    for request in requests:
+        method(request)
+    return (time.perf_counter() - start) / len(requests)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--signatures', type=int, default=20)
+    argv = parser.parse_args()
+    # the reference implementation of the parity test, without running the test
+    with open(os.path.join(root, 'test', 'test_ecdsa.py')) as file:
+        source = file.read()
+    scope = dict(vars(sys.modules['ccxt.base.exchange']), ecdsa=ecdsa_signer.ecdsa, hashlib=hashlib)
+    exec(source[source.index('def legacy_ecdsa('):source.index('def call(')], scope)
+    before = scope['legacy_ecdsa']
+    secret = '1a' * 32
+    requests = [hashlib.sha256(str(i).encode()).hexdigest() for i in range(0, argv.signatures)]
+    native = ecdsa_signer.load_native()
+    cases = [
+        ('p256', secret, None),
+        ('p384', '1a' * 48, None),
+        ('p521', '01' + '1a' * 65, None),
+        ('secp256k1', secret, None),
+    ]
+    if native is not None:
+        cases.append(('secp256k1', secret, native))
+    for algorithm, key, backend in cases:
+        ecdsa_signer.native_module = backend
+        ecdsa_signer.keys.clear()
+        name = algorithm + (' native' if backend is not None else '')
+        first = measure(lambda request: Exchange.ecdsa(request, key, algorithm), requests[0:1])
+        assert [before(request, key, algorithm) for request in requests] == [Exchange.ecdsa(request, key, algorithm) for request in requests], name
+        legacy = measure(lambda request: before(request, key, algorithm), requests)
+        after = measure(lambda request: Exchange.ecdsa(request, key, algorithm), requests)
+        print('{:>16} before {:8.0f}us  after {:6.0f}us per signature ({:.0f}x), first {:.0f}ms'.format(name, legacy * 1e6, after * 1e6, legacy / after, first * 1e3))
+    ecdsa_signer.native_module = native
+
+
+if __name__ == '__main__':
+    main()
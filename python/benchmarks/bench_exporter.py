@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+"""Measures the peak memory of exporting a history against keeping it in a list
+
+    python benchmarks/bench_exporter.py [--days 365] [--format csv]
+
+The exchange makes up its candles of 1000 per page, as fetch_ohlcv with a
+limit of 1000 would return them. The before figure is fetch_history, which
+holds every candle before anything is written, as the examples do.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+start = 1600000000000
+
+
+class generating(ccxt.Exchange):
+
+    def fetch_ohlcv(self, symbol, timeframe='1m', since=None, limit=None, params={}):
+        end = min(since + limit * 60000, self.until)
+        return [[timestamp, 100.0, 101.0, 99.0, 100.5, 12.5] for timestamp in range(since, end, 60000)]
+
+
+def measure(method):
+    tracemalloc.start()
+    began = time.perf_counter()
+    method()
+    elapsed = time.perf_counter() - began
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024 / 1024, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--format', default='csv', choices=['csv', 'parquet', 'arrow'])
+    argv = parser.parse_args()
+    exchange = generating()
+    exchange.until = start + argv.days * 86400000
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, 'BTC-USDT.' + argv.format)
+        cases = [
+            ('fetch_history', lambda: exchange.fetch_history('fetch_ohlcv', 'BTC/USDT', start, 1000, {}, exchange.until)),
+            ('export_history', lambda: exchange.export_history('fetch_ohlcv', 'BTC/USDT', path, start, 1000, {}, exchange.until, '1m', argv.format)),
+        ]
+        print('{} 1m candles'.format(argv.days * 1440))
+        for name, method in cases:
+            peak, elapsed = measure(method)
+            print('{:>15} peak {:8.1f}MB {:8.2f}s'.format(name, peak, elapsed))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
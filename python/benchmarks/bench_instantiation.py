@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+"""Measures the time to instantiate every exchange in ccxt.exchanges
+
+    python benchmarks/bench_instantiation.py [--repeat 20] [ids ...]
+
+The cold figures clear the per-class caches (describe(), the camelcase
+aliases and the generated api methods) before each instantiation, which is
+what every instantiation used to cost, the warm figures reuse them.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+
+def clear_caches(exchange_class):
+    for name in ('_described', '_camelcase_attributes', '_rest_api_defined'):
+        if name in exchange_class.__dict__:
+            delattr(exchange_class, name)
+
+
+def measure(exchange_class, repeat, cold):
+    elapsed = 0.0
+    for i in range(0, repeat):
+        if cold:
+            clear_caches(exchange_class)
+        start = time.perf_counter()
+        exchange_class()
+        elapsed += time.perf_counter() - start
+    return elapsed / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('ids', nargs='*', help='exchange ids, all of ccxt.exchanges by default')
+    parser.add_argument('--repeat', type=int, default=20)
+    argv = parser.parse_args()
+    ids = argv.ids or ccxt.exchanges
+    classes = [getattr(ccxt, id) for id in ids]  # the module imports are not measured
+    totals = {'cold': 0.0, 'warm': 0.0}
+    rows = []
+    for exchange_class in classes:
+        cold = measure(exchange_class, argv.repeat, True)
+        warm = measure(exchange_class, argv.repeat, False)
+        totals['cold'] += cold
+        totals['warm'] += warm
+        rows.append((cold, warm, exchange_class.__name__))
+    for cold, warm, id in sorted(rows, reverse=True)[:10]:
+        print('{:>16} cold {:6.2f}ms  warm {:6.2f}ms'.format(id, cold * 1000, warm * 1000))
+    print('{:>16} cold {:6.2f}ms  warm {:6.2f}ms ({:.1f}x)'.format(
+        'all ' + str(len(classes)), totals['cold'] * 1000, totals['warm'] * 1000, totals['cold'] / totals['warm']))
+
+
+if __name__ == '__main__':
+    main()
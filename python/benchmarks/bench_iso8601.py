@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+"""Measures iso8601 and parse8601 on a page of trades
+
+    python benchmarks/bench_iso8601.py [--trades 1000] [--repeat 200]
+
+The trades are a few milliseconds apart, as in a page of fetch_trades, the
+before figures are the strftime and strptime implementations.
+"""
+
+import argparse
+import calendar
+import datetime
+import os
+import re
+import sys
+import timeit
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.base.exchange import Exchange  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+
+def before_iso8601(timestamp):
+    utc = datetime.datetime.utcfromtimestamp(timestamp // 1000)
+    return utc.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-6] + "{:03d}".format(int(timestamp) % 1000) + 'Z'
+
+
+def before_parse8601(timestamp):
+    regex = r'([0-9]{4})-?([0-9]{2})-?([0-9]{2})(?:T|[\s])?([0-9]{2}):?([0-9]{2}):?([0-9]{2})(\.[0-9]{1,3})?(?:(\+|\-)([0-9]{2})\:?([0-9]{2})|Z)?'
+    match = re.search(regex, timestamp, re.IGNORECASE)
+    yyyy, mm, dd, h, m, s, ms, sign, hours, minutes = match.groups()
+    ms = ((ms or '.000') + '00')[0:4]
+    sign = int((sign or '') + '1') * -1
+    offset = datetime.timedelta(hours=int(hours or 0) * sign, minutes=int(minutes or 0) * sign)
+    dt = datetime.datetime.strptime(yyyy + mm + dd + h + m + s + ms + 'Z', "%Y%m%d%H%M%S.%fZ") + offset
+    return calendar.timegm(dt.utctimetuple()) * 1000 + int(ms[1:])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--trades', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=200)
+    argv = parser.parse_args()
+    timestamps = [1640000000000 + i * 7 for i in range(0, argv.trades)]
+    strings = [Exchange.iso8601(timestamp) for timestamp in timestamps]
+    cases = [
+        ('iso8601', lambda: [before_iso8601(timestamp) for timestamp in timestamps], lambda: [Exchange.iso8601(timestamp) for timestamp in timestamps]),
+        ('parse8601', lambda: [before_parse8601(string) for string in strings], lambda: [Exchange.parse8601(string) for string in strings]),
+    ]
+    for name, before, after in cases:
+        assert before() == after(), name
+        before = min(timeit.repeat(before, number=argv.repeat, repeat=3)) / argv.repeat / argv.trades
+        after = min(timeit.repeat(after, number=argv.repeat, repeat=3)) / argv.repeat / argv.trades
+        print('{:>10} before {:6.0f}ns  after {:6.0f}ns per timestamp ({:.1f}x)'.format(name, before * 1e9, after * 1e9, before / after))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+"""Compares the decode/encode speed of the JSON codecs installed
+
+    python benchmarks/bench_json.py [--repeat 20] [payload.json ...]
+
+Without arguments it runs on synthetic payloads shaped like the typical
+large responses (exchangeInfo-style markets, a deep order book and a page of
+trades), pass recorded responses to measure on real data.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.base import json_codec  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+
+def synthetic_payloads():
+    rng = random.Random(0)
+    markets = {'timezone': 'UTC', 'serverTime': 1600000000000, 'symbols': [{
+        'symbol': 'COIN' + str(i) + 'USDT',
+        'status': 'TRADING',
+        'baseAsset': 'COIN' + str(i),
+        'quoteAsset': 'USDT',
+        'orderTypes': ['LIMIT', 'LIMIT_MAKER', 'MARKET', 'STOP_LOSS_LIMIT', 'TAKE_PROFIT_LIMIT'],
+        'filters': [
+            {'filterType': 'PRICE_FILTER', 'minPrice': '0.00000100', 'maxPrice': '100000.00000000', 'tickSize': '0.00000100'},
+            {'filterType': 'LOT_SIZE', 'minQty': '0.00100000', 'maxQty': '100000.00000000', 'stepSize': '0.00100000'},
+            {'filterType': 'MIN_NOTIONAL', 'minNotional': '10.00000000', 'applyToMarket': True, 'avgPriceMins': 5},
+        ],
+        'permissions': ['SPOT', 'MARGIN'],
+    } for i in range(0, 2000)]}
+    orderbook = {
+        'lastUpdateId': 1027024,
+        'bids': [[round(10000 - i * 0.01, 2), round(rng.random() * 10, 8)] for i in range(0, 5000)],
+        'asks': [[round(10000 + i * 0.01, 2), round(rng.random() * 10, 8)] for i in range(0, 5000)],
+    }
+    trades = [{
+        'id': 28457 + i,
+        'price': rng.random() * 10000,
+        'qty': rng.random() * 10,
+        'time': 1600000000000 + i,
+        'isBuyerMaker': bool(i % 2),
+    } for i in range(0, 1000)]
+    return [(name, json.dumps(payload).encode()) for name, payload in (('markets', markets), ('orderbook', orderbook), ('trades', trades))]
+
+
+def measure(function, argument, repeat):
+    best = float('inf')
+    for i in range(0, repeat):
+        start = time.perf_counter()
+        function(argument)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('files', nargs='*', help='recorded JSON responses')
+    parser.add_argument('--repeat', type=int, default=20)
+    argv = parser.parse_args()
+    if argv.files:
+        payloads = []
+        for path in argv.files:
+            with open(path, 'rb') as file:
+                payloads.append((os.path.basename(path), file.read()))
+    else:
+        payloads = synthetic_payloads()
+    codecs = [name for name, codec in json_codec.codecs.items() if codec is not None]
+    for name, payload in payloads:
+        data = json.loads(payload)
+        print('{} ({:.0f} KB)'.format(name, len(payload) / 1024))
+        baseline = None
+        for codec_name in codecs:
+            codec = json_codec.get_json_codec(codec_name)
+            decode = measure(codec.loads, payload, argv.repeat)
+            encode = measure(codec.dumps, data, argv.repeat)
+            baseline = baseline or (decode, encode)
+            print('    {:>10} loads {:8.2f}ms ({:4.1f}x)  dumps {:8.2f}ms ({:4.1f}x)'.format(
+                codec_name, decode * 1000, baseline[0] / decode, encode * 1000, baseline[1] / encode))
+        for numbers in ('string', 'decimal'):
+            codec = json_codec.get_json_codec('json', numbers)
+            decode = measure(codec.loads, payload, argv.repeat)
+            print('    {:>10} loads {:8.2f}ms ({:4.1f}x)'.format('json/' + numbers, decode * 1000, baseline[0] / decode))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+
+"""Measures the memory and the time of set_markets with many instances of one exchange
+
+    python benchmarks/bench_market_registry.py [--instances 10] [--markets 3000]
+
+Each instance parses its own copy of the markets, as if it fetched them, and
+keeps them with and without sharedMarkets. The reload figures are the time
+of set_markets with markets loaded before, unchanged and with one listing,
+against the full rebuild of an instance without them.
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+from bench_markets_cache import generate_markets  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+
+def measure(payload, instances, shared):
+    exchanges = []
+    elapsed = []
+    gc.collect()
+    tracemalloc.start()
+    for i in range(0, instances):
+        exchange = ccxt.binance({'sharedMarkets': shared})
+        markets = json.loads(payload)
+        start = time.perf_counter()
+        exchange.set_markets(markets)
+        elapsed.append(time.perf_counter() - start)
+        exchanges.append(exchange)
+        del markets
+    gc.collect()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return memory, elapsed
+
+
+def measure_reload(payload, repeat=5):
+    exchange = ccxt.binance()
+    exchange.set_markets(json.loads(payload))
+    listing = json.loads(payload)
+    listing.append(dict(listing[0], id='NEWUSDT', symbol='NEW/USDT', base='NEW', baseId='NEW'))
+    elapsed = {'rebuild': [], 'unchanged': [], 'listing': []}
+    for i in range(0, repeat):
+        for name in elapsed:
+            markets = [dict(market) for market in listing] if name == 'listing' else json.loads(payload)
+            if name == 'rebuild':
+                exchange.market_registry = None
+            start = time.perf_counter()
+            exchange.set_markets(markets)
+            elapsed[name].append(time.perf_counter() - start)
+            if name == 'listing':
+                exchange.set_markets(json.loads(payload))
+    return {name: min(values) for name, values in elapsed.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--instances', type=int, default=10)
+    parser.add_argument('--markets', type=int, default=3000)
+    argv = parser.parse_args()
+    payload = json.dumps(generate_markets(argv.markets))
+    for shared in (False, True):
+        memory, elapsed = measure(payload, argv.instances, shared)
+        # tracemalloc slows the calls down evenly, compare them with each other only
+        print('sharedMarkets {:5} {:8.1f}MB, set_markets first {:7.2f}ms, next {:7.2f}ms'.format(
+            str(shared), memory / 1024 / 1024, elapsed[0] * 1000, sum(elapsed[1:]) / max(len(elapsed) - 1, 1) * 1000))
+    for name, elapsed in measure_reload(payload).items():
+        print('reload {:>9} {:7.2f}ms'.format(name, elapsed * 1000))
+
+
+if __name__ == '__main__':
+    main()
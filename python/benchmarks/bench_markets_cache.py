@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+
+"""Measures the markets cache file with a synthetic exchange of many markets
+
+    python benchmarks/bench_markets_cache.py [--markets 3000] [--repeat 20] [--codec json]
+
+Prints the size of the file and the time to start from it, that is the time
+to read, decompress and parse it and to index the markets with set_markets,
+which is what load_markets costs instead of the fetch_markets requests.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+
+def generate_markets(count):
+    markets = []
+    for i in range(0, count):
+        base = 'COIN' + str(i)
+        markets.append({
+            'id': base + 'USDT', 'symbol': base + '/USDT', 'base': base, 'quote': 'USDT', 'baseId': base, 'quoteId': 'USDT',
+            'active': True, 'type': 'spot', 'spot': True, 'taker': 0.001, 'maker': 0.001,
+            'precision': {'amount': 8, 'price': 4},
+            'limits': {'amount': {'min': 0.0001, 'max': 90000}, 'price': {'min': 0.0001, 'max': 1000000}, 'cost': {'min': 10}},
+            'info': {'symbol': base + 'USDT', 'status': 'TRADING', 'baseAsset': base, 'quoteAsset': 'USDT', 'filters': [
+                {'filterType': 'PRICE_FILTER', 'minPrice': '0.00010000', 'maxPrice': '1000000.00000000', 'tickSize': '0.00010000'},
+                {'filterType': 'LOT_SIZE', 'minQty': '0.00010000', 'maxQty': '90000.00000000', 'stepSize': '0.00010000'},
+            ]},
+        })
+    return markets
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--markets', type=int, default=3000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--codec', default='json')
+    argv = parser.parse_args()
+    directory = tempfile.mkdtemp()
+    markets = generate_markets(argv.markets)
+
+    class synthetic(ccxt.Exchange):
+        id = 'synthetic'
+
+        def fetch_markets(self, params={}):
+            return generate_markets(argv.markets)
+
+    try:
+        config = {'marketsCache': directory, 'jsonCodec': argv.codec}
+        cache = synthetic(config).get_markets_cache()
+        start = time.perf_counter()
+        cache.write(markets)
+        written = time.perf_counter() - start
+        size = os.path.getsize(cache.path)
+        plain = len(ccxt.Exchange.json(markets))
+        elapsed = {'read': 0.0, 'load_markets': 0.0}
+        for i in range(0, argv.repeat):
+            start = time.perf_counter()
+            cache.read()
+            elapsed['read'] += time.perf_counter() - start
+            exchange = synthetic(config)
+            start = time.perf_counter()
+            exchange.load_markets()
+            elapsed['load_markets'] += time.perf_counter() - start
+        print('{} markets, {:.0f}KB of json, {:.0f}KB on disk, written in {:.1f}ms'.format(argv.markets, plain / 1024, size / 1024, written * 1000))
+        for name, value in elapsed.items():
+            print('{:>13} {:7.2f}ms'.format(name, value / argv.repeat * 1000))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
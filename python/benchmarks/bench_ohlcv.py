@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+"""Measures resample_ohlcv and build_ohlcvc_columns with and without NumPy
+
+    python benchmarks/bench_ohlcv.py [--days 365] [--trades 1000000]
+
+The candles are a year of 1m candles resampled to 15m, the trades are built
+into 1m candles. The loop figures are the 5m to 15m conversion of
+examples/py/bitmex-ohlcv-convert-5m-to-15m.py adapted to 1m candles, and
+build_ohlcvc.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+from ccxt.base import ohlcv  # noqa: E402
+from ccxt.base.ohlcv import ohlcv_columns  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+
+def loop_resample(ohlcv1):
+    ohlcv15 = []
+    for i in range(0, len(ohlcv1) - 14, 15):
+        candles = ohlcv1[i:i + 15]
+        highs = [candle[2] for candle in candles if candle[2]]
+        lows = [candle[3] for candle in candles if candle[3]]
+        volumes = [candle[5] for candle in candles if candle[5]]
+        ohlcv15.append([candles[0][0], candles[0][1], max(highs) if len(highs) else None, min(lows) if len(lows) else None, candles[-1][4], sum(volumes) if len(volumes) else None])
+    return ohlcv15
+
+
+def measure(method, repeat=3):
+    elapsed = []
+    for i in range(0, repeat):
+        start = time.perf_counter()
+        method()
+        elapsed.append(time.perf_counter() - start)
+    return min(elapsed) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--trades', type=int, default=1000000)
+    argv = parser.parse_args()
+    random.seed(1)
+    exchange = ccxt.Exchange()
+    start = 1600000000000 // 900000 * 900000
+    candles = [[start + i * 60000, 100.5, 101.0, 99.0, 100.0 + random.random(), random.uniform(0, 10)] for i in range(0, argv.days * 1440)]
+    trades = [{'timestamp': start + i * 70, 'price': random.uniform(100, 101), 'amount': random.random()} for i in range(0, argv.trades)]
+    numpy = ohlcv.numpy
+    print('{} 1m candles, {} trades'.format(len(candles), len(trades)))
+    print('{:>34} {:9.1f}ms'.format('resample loop', measure(lambda: loop_resample(candles))))
+    print('{:>34} {:9.1f}ms'.format('build_ohlcvc', measure(lambda: exchange.build_ohlcvc(trades, '1m'))))
+    for module_numpy, name in ((None, 'lists'), (numpy, 'numpy')):
+        if name == 'numpy' and numpy is None:
+            print('numpy is not installed')
+            continue
+        ohlcv.numpy = module_numpy
+        columns = ohlcv_columns(candles)
+        print('{:>34} {:9.1f}ms'.format('ohlcv_columns ' + name, measure(lambda: ohlcv_columns(candles))))
+        print('{:>34} {:9.1f}ms'.format('resample_ohlcv rows ' + name, measure(lambda: exchange.resample_ohlcv(candles, '15m'))))
+        print('{:>34} {:9.1f}ms'.format('resample_ohlcv columns ' + name, measure(lambda: exchange.resample_ohlcv(columns, '15m'))))
+        print('{:>34} {:9.1f}ms'.format('build_ohlcvc_columns ' + name, measure(lambda: exchange.build_ohlcvc_columns(trades, '1m'))))
+    ohlcv.numpy = numpy
+
+
+if __name__ == '__main__':
+    main()
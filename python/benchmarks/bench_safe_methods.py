@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+"""Measures the safe methods on a parsed trade, the way the parse methods of the exchanges call them
+
+    python benchmarks/bench_safe_methods.py [--number 200000]
+
+The before figures are the methods as they were before their dict fast
+paths, through key_exists and safe_either.
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.base.exchange import Exchange  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+
+class Before(object):
+
+    @staticmethod
+    def key_exists(dictionary, key):
+        if dictionary is None or key is None:
+            return False
+        if isinstance(dictionary, list):
+            if isinstance(key, int) and 0 <= key and key < len(dictionary):
+                return dictionary[key] is not None
+            else:
+                return False
+        if key in dictionary:
+            return dictionary[key] is not None
+        return False
+
+    @staticmethod
+    def safe_float(dictionary, key, default_value=None):
+        value = default_value
+        try:
+            if Before.key_exists(dictionary, key):
+                value = float(dictionary[key])
+        except ValueError:
+            value = default_value
+        return value
+
+    @staticmethod
+    def safe_string(dictionary, key, default_value=None):
+        return str(dictionary[key]) if Before.key_exists(dictionary, key) else default_value
+
+    @staticmethod
+    def safe_integer(dictionary, key, default_value=None):
+        if not Before.key_exists(dictionary, key):
+            return default_value
+        value = dictionary[key]
+        if isinstance(value, (int, float)) or (isinstance(value, str) and value.isnumeric()):
+            return int(value)
+        return default_value
+
+    @staticmethod
+    def safe_value(dictionary, key, default_value=None):
+        return dictionary[key] if Before.key_exists(dictionary, key) else default_value
+
+    @staticmethod
+    def safe_either(method, dictionary, key1, key2, default_value=None):
+        value = method(dictionary, key1)
+        return value if value is not None else method(dictionary, key2, default_value)
+
+    @staticmethod
+    def safe_string_2(dictionary, key1, key2, default_value=None):
+        return Before.safe_either(Before.safe_string, dictionary, key1, key2, default_value)
+
+
+trade = {'e': 'trade', 'E': 1640000000123, 's': 'BTCUSDT', 't': 1234567890, 'p': '47000.01', 'q': '0.00150000', 'b': 88, 'a': 50, 'T': 1640000000120, 'm': True, 'M': True}
+ohlcv = [1640000000000, '47000.01', '47100.00', '46900.00', '47050.00', '12.5']
+
+calls = {
+    'safe_string': lambda methods: methods.safe_string(trade, 'p'),
+    'safe_string missing': lambda methods: methods.safe_string(trade, 'x'),
+    'safe_float': lambda methods: methods.safe_float(trade, 'q'),
+    'safe_integer': lambda methods: methods.safe_integer(trade, 'T'),
+    'safe_value': lambda methods: methods.safe_value(trade, 'm'),
+    'safe_string_2': lambda methods: methods.safe_string_2(trade, 'x', 't'),
+    'safe_float list': lambda methods: methods.safe_float(ohlcv, 4),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--number', type=int, default=200000)
+    argv = parser.parse_args()
+    for name, method in calls.items():
+        assert method(Before) == method(Exchange), name
+        before = min(timeit.repeat(lambda: method(Before), number=argv.number, repeat=3)) / argv.number
+        after = min(timeit.repeat(lambda: method(Exchange), number=argv.number, repeat=3)) / argv.number
+        print('{:>20} before {:6.0f}ns  after {:6.0f}ns ({:.1f}x)'.format(name, before * 1e9, after * 1e9, before / after))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+"""Measures the signing of private requests by the exchanges that sign with hmac, jwt, rsa and eddsa
+
+    python benchmarks/bench_signing.py [--requests 2000]
+
+The before figures sign with the static methods of Exchange, the after
+figures with the signer of the instance. The RSA keys are generated with
+cryptography when it is installed, the eddsa signature of wavesexchange
+requires python-axolotl-curve25519. The base58 figures are the codec before
+and after its table of the pairs of digits.
+"""
+
+import argparse
+import base64
+import os
+import sys
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+from ccxt.base.exchange import Exchange  # noqa: E402
+from ccxt.base.signer import eddsa  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+
+def rsa_keys():
+    """A PEM private key and its base64 body, None without cryptography"""
+    try:
+        from cryptography.hazmat.backends import default_backend
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import rsa
+    except ImportError:
+        return None
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048, backend=default_backend())
+    pem = key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()).decode()
+    return pem, ''.join(pem.strip().split('\n')[1:-1])
+
+
+def measure(method, requests):
+    start = time.perf_counter()
+    for i in range(0, requests):
+        method()
+    return (time.perf_counter() - start) / requests
+
+
+def static(exchange):
+    """The exchange signing with the static methods of Exchange"""
+    for name in ('hmac', 'jwt', 'rsa', 'eddsa', 'base64_to_binary', 'base58_to_binary'):
+        setattr(exchange, name, getattr(Exchange, name))
+    return exchange
+
+
+def access_token(exchange):
+    """The eddsa signature of wavesexchange, without its request"""
+    def sign():
+        exchange.options['accessToken'] = None
+        return exchange.get_access_token()
+    exchange.privatePostOauth2Token = lambda request: {'access_token': request['password']}
+    return sign
+
+
+def compare(name, before, after, requests):
+    assert before() == after(), name
+    elapsed = [min(measure(method, requests) for i in range(0, 3)) for method in (before, after)]
+    print('{:>14} before {:8.1f}us  after {:6.1f}us per request ({:.2f}x)'.format(name, elapsed[0] * 1e6, elapsed[1] * 1e6, elapsed[0] / elapsed[1]))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=2000)
+    argv = parser.parse_args()
+    # the base58 codec of the parity test, without running the test
+    with open(os.path.join(root, 'test', 'test_binary_codecs.py')) as file:
+        source = file.read()
+    scope = {}
+    exec(source[source.index('alphabet = '):source.index('def call(')], scope)
+    secret = base64.b64encode(os.urandom(64)).decode()
+    params = {'symbol': 'BTCUSDT', 'side': 'BUY', 'type': 'LIMIT', 'quantity': '1', 'price': '0.1'}
+    cases = [
+        # hmac
+        ('binance', secret, ('private', 'POST', 'order')),
+        ('bitfinex2', secret, ('private', 'POST', 'auth/w/order/submit')),
+        # hmac with a base64 secret
+        ('kraken', secret, ('private', 'POST', 'AddOrder')),
+        ('coinbasepro', secret, ('private', 'POST', 'orders')),
+        # jwt
+        ('upbit', secret, ('private', 'POST', 'orders')),
+        ('bigone', secret, ('private', 'POST', 'orders')),
+    ]
+    keys = rsa_keys()
+    if keys is not None:
+        pem, body = keys
+        cases += [
+            # jwt with rsa and rsa
+            ('oceanex', pem, ('private', 'POST', 'orders')),
+            ('lbank', body, ('private', 'POST', 'create_order')),
+        ]
+    for id, key, endpoint in cases:
+        config = {'apiKey': 'key', 'secret': key, 'password': 'password', 'uid': '123'}
+        exchanges = [static(getattr(ccxt, id)(config)), getattr(ccxt, id)(config)]
+        for exchange in exchanges:
+            exchange.nonce = lambda: 1600000000000
+            exchange.signer.check(exchange.secret, exchange.apiKey)
+        api, method, path = endpoint
+        requests = argv.requests // 20 if id in ('oceanex', 'lbank') else argv.requests
+        compare(id, *[lambda exchange=exchange: exchange.sign(path, api, method, params) for exchange in exchanges], requests=requests)
+    if eddsa is not None:
+        config = {'apiKey': Exchange.binary_to_base58(os.urandom(32)), 'secret': Exchange.binary_to_base58(os.urandom(32))}
+        exchanges = [static(ccxt.wavesexchange(config)), ccxt.wavesexchange(config)]
+        exchanges[0].base58_to_binary = scope['legacy_base58_to_binary']
+        for exchange in exchanges:
+            exchange.seconds = lambda: 1600000000
+            exchange.signer.check(exchange.secret, exchange.apiKey)
+        compare('wavesexchange', *[access_token(exchange) for exchange in exchanges], requests=argv.requests)
+    binary = os.urandom(64)
+    string = Exchange.binary_to_base58(binary)
+    compare('binary_to_base58', lambda: scope['legacy_binary_to_base58'](binary), lambda: Exchange.binary_to_base58(binary), argv.requests)
+    compare('base58_to_binary', lambda: scope['legacy_base58_to_binary'](string), lambda: Exchange.base58_to_binary(string), argv.requests)
+
+
+if __name__ == '__main__':
+    main()
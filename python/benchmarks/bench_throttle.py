@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+"""Compares the event-driven Throttler against the former polling throttle
+
+    python benchmarks/bench_throttle.py [--instances 100] [--requests 20]
+
+Reports the event loop CPU time spent while many throttled instances wait
+for their tokens and the dispatch latency/throughput of a single instance.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.async_support.base.throttle import Throttler  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+
+def legacy_throttle(config=None):
+    """The polling implementation that Throttler replaces, kept verbatim for comparison"""
+
+    cfg = {
+        'lastTimestamp': time.time(),
+        'numTokens': 0,
+        'running': False,
+        'queue': asyncio.Queue(),
+        'delay': 0.001,
+        'refillRate': 0.001,
+        'defaultCost': 1.000,
+        'capacity': 1.000,
+    }
+
+    cfg.update(config)
+
+    async def run():
+        if not cfg['running']:
+            future = None
+            try:
+                cfg['running'] = True
+                while not cfg['queue'].empty():
+                    now = time.time()
+                    elapsed = (now - cfg['lastTimestamp'])
+                    cfg['lastTimestamp'] = now
+                    cfg['numTokens'] = min(cfg['capacity'], cfg['numTokens'] + elapsed * cfg['refillRate'] * 1000)
+                    if cfg['numTokens'] > 0 or cfg['refillRate'] == 0:
+                        if not cfg['queue'].empty():
+                            cost, future = cfg['queue'].get_nowait()
+                            cfg['numTokens'] -= (cost if cost else cfg['defaultCost'])
+                            if not future.done():
+                                future.set_result(None)
+                    await asyncio.sleep(cfg['delay'])
+            except BaseException as excp:
+                if future is not None:
+                    if not future.done():
+                        future.set_exception(excp)
+                while not cfg['queue'].empty():
+                    _, future = cfg['queue'].get_nowait()
+                    if not future.done():
+                        future.set_exception(excp)
+            finally:
+                cfg['running'] = False
+
+    def throttle(rate_limit, cost=None):
+        future = asyncio.Future()
+        cfg['refillRate'] = 0 if rate_limit == 0 else 1 / rate_limit
+        cfg['queue'].put_nowait((cost, future))
+        asyncio.ensure_future(run())
+        return future
+
+    return throttle
+
+
+def make_legacy(rate_limit):
+    throttle = legacy_throttle({'refillRate': 1 / rate_limit})
+    return lambda: throttle(rate_limit)
+
+
+def make_throttler(rate_limit):
+    throttler = Throttler({'refillRate': 1 / rate_limit})
+    return lambda: throttler()
+
+
+async def client(throttle, requests, latencies):
+    for i in range(0, requests):
+        start = time.perf_counter()
+        await throttle()
+        latencies.append(time.perf_counter() - start)
+
+
+async def many_instances(factory, instances, requests, rate_limit):
+    throttles = [factory(rate_limit) for i in range(0, instances)]
+    latencies = []
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    await asyncio.gather(*[client(throttle, requests, latencies) for throttle in throttles])
+    return time.process_time() - cpu, time.perf_counter() - wall
+
+
+async def single_instance(factory, requests, rate_limit):
+    throttle = factory(rate_limit)
+    latencies = []
+    wall = time.perf_counter()
+    await asyncio.gather(*[client(throttle, 1, latencies) for i in range(0, requests)])
+    elapsed = time.perf_counter() - wall
+    return requests / elapsed, sorted(latencies)[len(latencies) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--instances', type=int, default=100)
+    parser.add_argument('--requests', type=int, default=20)
+    parser.add_argument('--rate-limit', type=float, default=50, help='milliseconds per request')
+    argv = parser.parse_args()
+    for name, factory in (('polling', make_legacy), ('event-driven', make_throttler)):
+        cpu, wall = asyncio.run(many_instances(factory, argv.instances, argv.requests, argv.rate_limit))
+        print('{:>12} {} instances x {} requests: loop cpu {:.3f}s over {:.3f}s wall'.format(name, argv.instances, argv.requests, cpu, wall))
+        rate, median = asyncio.run(single_instance(factory, 5000, 0.01))
+        print('{:>12} 1 instance at 0.01ms rateLimit: {:.0f} requests/s, median wait {:.2f}ms'.format(name, rate, median * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -7,21 +7,34 @@ __version__ = '1.39.80'
 # -----------------------------------------------------------------------------
 
 import asyncio
+import collections
 import concurrent.futures
+import itertools
+import os
 import socket
 import certifi
 import aiohttp
-import ssl
 import sys
 import yarl
 
+# incremental json decoding
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 # -----------------------------------------------------------------------------
 
-from ccxt.async_support.base.throttle import throttle
+from ccxt.async_support.base.throttle import Throttler
+from ccxt.async_support.base.session import ssl_context
+from ccxt.async_support.base.session import tcp_connector
+from ccxt.async_support.base.session import shared_session
+from ccxt.async_support.base.session import release_session
 
 # -----------------------------------------------------------------------------
 
 from ccxt.base.errors import ExchangeError
+from ccxt.base.errors import DDoSProtection
 from ccxt.base.errors import ExchangeNotAvailable
 from ccxt.base.errors import RequestTimeout
 from ccxt.base.errors import NotSupported
@@ -29,6 +42,9 @@ from ccxt.base.errors import NotSupported
 # -----------------------------------------------------------------------------
 
 from ccxt.base.exchange import Exchange as BaseExchange
+from ccxt.base.ohlcv import ohlcv_array, ohlcv_columns
+from ccxt.base.pagination import Pagination
+from ccxt.base.exporter import Exporter
 
 # -----------------------------------------------------------------------------
 
@@ -42,6 +58,19 @@ __all__ = [
 
 class Exchange(BaseExchange):
 
+    aiohttp_read_bytes = False  # read the body once as bytes and decode json from it, see fetch()
+    aiohttp_stream_threshold = None  # with aiohttp_read_bytes, decode json bodies of this many bytes or more incrementally with ijson
+    aiohttp_stream_chunk_size = 65536  # also the length of the body prefix passed to handle_errors when streaming
+    aiohttp_connector = {
+        'limit': 100,  # simultaneous connections
+        'limit_per_host': 0,  # simultaneous connections to one host, 0 for no limit
+        'keepalive_timeout': 15,  # seconds to keep an idle connection open
+        'ttl_dns_cache': 10,  # seconds to cache the resolved addresses, None to cache forever
+        'ipv4_only': False,
+        'happy_eyeballs_delay': None,  # seconds before racing the next address, aiohttp 3.10+
+    }
+    aiohttp_shared_session = False  # share one session between the instances with the same loop and transport settings
+
     def __init__(self, config={}):
         if 'asyncio_loop' in config:
             self.asyncio_loop = config['asyncio_loop']
@@ -51,14 +80,29 @@ class Exchange(BaseExchange):
         self.own_session = 'session' not in config
         self.cafile = config.get('cafile', certifi.where())
         super(Exchange, self).__init__(config)
+        if self.aiohttp_read_bytes:
+            # large payloads are not retained on the instance unless requested explicitly
+            self.enableLastHttpResponse = config.get('enableLastHttpResponse', False)
+            self.enableLastJsonResponse = config.get('enableLastJsonResponse', False)
+        if self.aiohttp_stream_threshold is not None and ijson is None:
+            raise NotSupported(self.id + ' aiohttp_stream_threshold requires ijson, install it with `pip install ijson`')
         self.init_rest_rate_limiter()
         self.markets_loading = None
         self.reloading_markets = False
+        self.markets_refreshing = None
 
     def init_rest_rate_limiter(self):
-        self.throttle = throttle(self.extend({
-            'loop': self.asyncio_loop,
-        }, self.tokenBucket))
+        self.throttle = Throttler(self.tokenBucket, self.asyncio_loop, self.rateLimiter)
+        self.throttlers = {}
+        for name, bucket in self.rateLimitBuckets.items():
+            self.throttlers[name] = Throttler(bucket, self.asyncio_loop, self.rateLimiters[name])
+
+    def update_rate_limiter(self):
+        changed = super(Exchange, self).update_rate_limiter()
+        if changed:
+            # the waiters were scheduled at the former rate
+            self.throttle.set_refill_rate(self.tokenBucket['refillRate'])
+        return changed
 
     def __del__(self):
         if self.session is not None:
@@ -74,25 +118,56 @@ class Exchange(BaseExchange):
 
     def open(self):
         if self.own_session and self.session is None:
-            # Create our SSL context object with our CA cert file
-            context = ssl.create_default_context(cafile=self.cafile) if self.verify else self.verify
-            # Pass this SSL context to aiohttp and create a TCPConnector
-            connector = aiohttp.TCPConnector(ssl=context, loop=self.asyncio_loop, enable_cleanup_closed=True)
-            self.session = aiohttp.ClientSession(loop=self.asyncio_loop, connector=connector, trust_env=self.aiohttp_trust_env)
+            # The SSL context for our CA cert file is created once and shared by all instances
+            context = ssl_context(self.cafile, self.verify)
+            if self.aiohttp_shared_session:
+                self.session = shared_session(self.asyncio_loop, self.aiohttp_connector, context, self.aiohttp_trust_env)
+            else:
+                # Pass this SSL context to aiohttp and create a TCPConnector
+                connector = tcp_connector(self.aiohttp_connector, context, self.asyncio_loop)
+                self.session = aiohttp.ClientSession(loop=self.asyncio_loop, connector=connector, trust_env=self.aiohttp_trust_env)
 
     async def close(self):
+        if self.markets_refreshing is not None:
+            self.markets_refreshing.cancel()
+            self.markets_refreshing = None
         if self.session is not None:
             if self.own_session:
-                await self.session.close()
+                if self.aiohttp_shared_session:
+                    await release_session(self.session)
+                else:
+                    await self.session.close()
             self.session = None
 
     async def fetch2(self, path, api='public', method='GET', params={}, headers=None, body=None):
         """A better wrapper over request for deferred signing"""
-        if self.enableRateLimit:
-            await self.throttle(self.rateLimit)
-        self.lastRestRequestTimestamp = self.milliseconds()
-        request = self.sign(path, api, method, params, headers, body)
-        return await self.fetch(request['url'], request['method'], request['headers'], request['body'])
+        retries = 0
+        while True:
+            if self.enableRateLimit:
+                self.update_rate_limiter()
+                endpoint = self.api_endpoint(path, api, method)
+                priority = self.calculate_rate_limiter_priority(api, method, path, params, endpoint)
+                for bucket, weight in endpoint['buckets'].items():
+                    if bucket in self.throttlers:
+                        await self.throttlers[bucket](weight, priority)
+                await self.throttle(self.calculate_rate_limiter_cost(api, method, path, params, endpoint), priority)
+            self.lastRestRequestTimestamp = self.milliseconds()
+            self.signer.check(self.secret, self.apiKey)
+            request = self.sign(path, api, method, params, headers, body)
+            try:
+                return await self.fetch(request['url'], request['method'], request['headers'], request['body'])
+            except DDoSProtection as e:
+                if not self.adaptiveRateLimit:
+                    raise e
+                # hold back all requests, not just the retried one
+                delay = self.rate_limit_backoff_delay(retries)
+                self.pause_rate_limiters(delay)
+                if not self.is_rate_limit_retryable(request['method'], retries, e):
+                    raise e
+                self.logger.debug("%s %s, rate limited, retrying in %d ms", method, path, delay)
+                if not self.enableRateLimit:
+                    await self.sleep(delay)
+                retries += 1
 
     async def fetch(self, url, method='GET', headers=None, body=None):
         """Perform a HTTP request and return decoded JSON data"""
@@ -106,23 +181,41 @@ class Exchange(BaseExchange):
         request_body = body
         encoded_body = body.encode() if body else None
         self.open()
+
+        # the responses not kept otherwise are those of the errors of this request only, see keep_error_response
+        if not self.enableLastHttpResponse:
+            self.last_http_response = None
+        if not self.enableLastJsonResponse:
+            self.last_json_response = None
         session_method = getattr(self.session, method.lower())
 
         http_response = None
         http_status_code = None
         http_status_text = None
         json_response = None
+        content = None
         try:
             async with session_method(yarl.URL(url, encoded=True),
                                       data=encoded_body,
                                       headers=request_headers,
                                       timeout=(self.timeout / 1000),
                                       proxy=self.aiohttp_proxy) as response:
-                http_response = await response.text()
                 http_status_code = response.status
                 http_status_text = response.reason
-                json_response = self.parse_json(http_response)
                 headers = response.headers
+                if self.is_streamed_response(http_status_code, headers):
+                    http_response, json_response = await self.read_json_stream(response)
+                elif self.aiohttp_read_bytes:
+                    content = await response.read()
+                    # does not try to detect encoding, parses json straight from the bytes
+                    json_response = self.parse_json(content)
+                    if self.is_response_text_required(http_status_code, json_response):
+                        http_response = content.decode('utf-8', 'replace')
+                else:
+                    http_response = await response.text()
+                    json_response = self.parse_json(http_response)
+                if self.adaptiveRateLimit:
+                    self.handle_rate_limit_headers(http_status_code, headers)
                 if self.enableLastHttpResponse:
                     self.last_http_response = http_response
                 if self.enableLastResponseHeaders:
@@ -149,13 +242,41 @@ class Exchange(BaseExchange):
             details = ' '.join([self.id, method, url])
             raise ExchangeError(details) from e
 
-        self.handle_errors(http_status_code, http_status_text, url, method, headers, http_response, json_response, request_headers, request_body)
-        self.handle_http_status_code(http_status_code, http_status_text, url, method, http_response)
+        try:
+            self.handle_errors(http_status_code, http_status_text, url, method, headers, http_response, json_response, request_headers, request_body)
+            self.handle_http_status_code(http_status_code, http_status_text, url, method, http_response)
+        except Exception:
+            self.keep_error_response(http_response, json_response)
+            raise
         if json_response is not None:
             return json_response
         if self.is_text_response(headers):
             return http_response
-        return response.content
+        return content if self.aiohttp_read_bytes else response.content
+
+    def is_streamed_response(self, http_status_code, headers):
+        if self.aiohttp_stream_threshold is None or not self.aiohttp_read_bytes or http_status_code >= 400:
+            return False
+        if self.jsonNumbers == 'string' or not headers.get('Content-Type', '').startswith('application/json'):
+            return False
+        # chunked responses of unknown length are read whole
+        length = headers.get('Content-Length')
+        return length is not None and length.isdigit() and int(length) >= self.aiohttp_stream_threshold
+
+    async def read_json_stream(self, response):
+        """Decodes a json body chunk by chunk as it arrives, returns the body prefix and the decoded json"""
+        results = ijson.sendable_list()
+        decoder = ijson.items_coro(results, '', use_float=self.jsonNumbers != 'decimal')
+        prefix = None
+        try:
+            async for chunk in response.content.iter_chunked(self.aiohttp_stream_chunk_size):
+                if prefix is None:
+                    prefix = chunk.decode('utf-8', 'replace')
+                decoder.send(chunk)
+            decoder.close()
+        except ijson.JSONError:
+            return prefix or '', None
+        return prefix or '', results[0] if results else None
 
     async def load_markets_helper(self, reload=False, params={}):
         if not reload:
@@ -163,12 +284,38 @@ class Exchange(BaseExchange):
                 if not self.markets_by_id:
                     return self.set_markets(self.markets)
                 return self.markets
+        cache = self.get_markets_cache()
+        if cache is not None and not reload:
+            # the file io, the decompression and the flock are left to the default executor, off the event loop
+            cached = await self.asyncio_loop.run_in_executor(None, cache.read)
+            if cached is not None:
+                # an expired file still seeds the markets, they are refreshed in the background
+                if not cached['fresh'] and (self.markets_refreshing is None or self.markets_refreshing.done()):
+                    self.markets_refreshing = asyncio.ensure_future(self.refresh_cached_markets(cache, params))
+                return self.set_markets(cached['markets'], cached['currencies'])
         currencies = None
         if self.has['fetchCurrencies']:
             currencies = await self.fetch_currencies()
         markets = await self.fetch_markets(params)
+        if cache is not None:
+            await self.asyncio_loop.run_in_executor(None, cache.write, markets, currencies)
         return self.set_markets(markets, currencies)
 
+    async def refresh_cached_markets(self, cache, params={}):
+        if not await self.asyncio_loop.run_in_executor(None, cache.lock, False):
+            return  # another process is refreshing the file
+        try:
+            currencies = None
+            if self.has['fetchCurrencies']:
+                currencies = await self.fetch_currencies()
+            markets = await self.fetch_markets(params)
+            await self.asyncio_loop.run_in_executor(None, cache.write, markets, currencies)
+            self.set_markets(markets, currencies)
+        except Exception as e:
+            self.logger.warning(self.id + ' failed to refresh the cached markets: ' + str(e))
+        finally:
+            await self.asyncio_loop.run_in_executor(None, cache.unlock)
+
     async def load_markets(self, reload=False, params={}):
         if (reload and not self.reloading_markets) or not self.markets_loading:
             self.reloading_markets = True
@@ -264,6 +411,93 @@ class Exchange(BaseExchange):
     async def fetchOHLCV(self, symbol, timeframe='1m', since=None, limit=None, params={}):
         return await self.fetch_ohlcv(symbol, timeframe, since, limit, params)
 
+    async def fetch_ohlcv_columns(self, symbol, timeframe='1m', since=None, limit=None, params={}):
+        return ohlcv_columns(await self.fetch_ohlcv(symbol, timeframe, since, limit, params))
+
+    async def fetch_ohlcv_array(self, symbol, timeframe='1m', since=None, limit=None, params={}):
+        return ohlcv_array(await self.fetch_ohlcv(symbol, timeframe, since, limit, params))
+
+    async def paginate(self, method, symbol=None, since=None, limit=None, params={}, until=None, timeframe='1m', concurrency=None):
+        """Yields the pages of fetch_ohlcv, fetch_trades or fetch_my_trades from since until until, without repeated items,
+        the windows of time of the exchanges that page by since are fetched concurrently"""
+        if until is None and since is not None:
+            until = self.milliseconds()
+        pagination = Pagination(self, method, symbol, since, until, limit, params, timeframe)
+        windows = pagination.windows()
+        if not windows or len(windows) < 2:
+            while True:
+                request = pagination.request()
+                if request is None:
+                    return
+                page = pagination.advance(await getattr(self, method)(*pagination.arguments(*request)))
+                if page:
+                    yield page
+        # the throttler keeps the requests within the rate limit, the windows are fetched at most concurrency
+        # ahead of the consumer, the pages of the ones that it has not reached yet are all that is kept
+        if not concurrency:
+            # the windows of a second of requests, 4 without a rate limit
+            concurrency = max(1, int(1000 / self.rateLimit)) if self.rateLimit else 4
+
+        async def fetch_window(start, end):
+            window = Pagination(self, method, symbol, start, end, limit, params, timeframe)
+            pages = []
+            while True:
+                request = window.request()
+                if request is None:
+                    return pages
+                pages.append(window.advance(await getattr(self, method)(*window.arguments(*request))))
+
+        windows = iter(windows)
+        tasks = collections.deque(asyncio.ensure_future(fetch_window(start, end)) for start, end in itertools.islice(windows, concurrency))
+        try:
+            while tasks:
+                pages = await tasks.popleft()
+                for start, end in itertools.islice(windows, 1):
+                    tasks.append(asyncio.ensure_future(fetch_window(start, end)))
+                for page in pages:
+                    page = pagination.filter(page)
+                    if page:
+                        yield page
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def fetch_history(self, method, symbol=None, since=None, limit=None, params={}, until=None, timeframe='1m', concurrency=None):
+        """All the items of paginate() in chronological order"""
+        items = []
+        async for page in self.paginate(method, symbol, since, limit, params, until, timeframe, concurrency):
+            items.extend(page)
+        return self.sort_by(items, 0 if method == 'fetch_ohlcv' else 'timestamp')
+
+    async def export_history(self, method, symbol, path, since=None, limit=None, params={}, until=None, timeframe='1m', format=None):
+        """Appends the pages of paginate() to a file as they are fetched, after the items written to it before,
+        returns the count of items appended"""
+        exporter = Exporter(path, method, format)
+        pagination = Pagination(self, method, symbol, since, until, limit, params, timeframe)
+        exporter.resume(pagination)
+        try:
+            while True:
+                request = pagination.request()
+                if request is None:
+                    break
+                exporter.write(pagination.advance(await getattr(self, method)(*pagination.arguments(*request))))
+        finally:
+            exporter.close()
+        return exporter.count
+
+    async def export_histories(self, method, symbols, directory, since=None, limit=None, params={}, until=None, timeframe='1m', format='csv', concurrency=4):
+        """export_history() of many symbols concurrently, to a file per symbol in directory"""
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def export(symbol):
+            async with semaphore:
+                return await self.export_history(method, symbol, os.path.join(directory, Exporter.filename(symbol, format)), since, limit, params, until, timeframe, format)
+
+        counts = await asyncio.gather(*[export(symbol) for symbol in symbols])
+        return dict(zip(symbols, counts))
+
     async def fetch_full_tickers(self, symbols=None, params={}):
         return await self.fetch_tickers(symbols, params)
 
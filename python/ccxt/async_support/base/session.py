@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+"""SSL contexts, connectors and sessions shared by the async exchange instances"""
+
+import socket
+import ssl
+
+import aiohttp
+
+__all__ = [
+    'ssl_context',
+    'tcp_connector',
+    'shared_session',
+    'release_session',
+]
+
+ssl_contexts = {}
+
+
+def ssl_context(cafile=None, verify=True):
+    """Returns the SSL context for a CA bundle, the bundle is parsed once per process"""
+    if not verify:
+        return False
+    context = ssl_contexts.get(cafile)
+    if context is None:
+        context = ssl_contexts[cafile] = ssl.create_default_context(cafile=cafile)
+    return context
+
+
+def tcp_connector(config, ssl, loop=None):
+    """Creates a TCPConnector from the Exchange.aiohttp_connector config"""
+    options = {
+        'limit': config.get('limit', 100),
+        'limit_per_host': config.get('limit_per_host', 0),
+        'keepalive_timeout': config.get('keepalive_timeout', 15),
+        'ttl_dns_cache': config.get('ttl_dns_cache', 10),
+        'enable_cleanup_closed': True,
+    }
+    if config.get('ipv4_only'):
+        options['family'] = socket.AF_INET
+    if config.get('happy_eyeballs_delay') is not None:
+        # aiohttp 3.10+, None keeps the default of the installed version
+        options['happy_eyeballs_delay'] = config['happy_eyeballs_delay']
+    return aiohttp.TCPConnector(ssl=ssl, loop=loop, **options)
+
+
+class SharedSession(object):
+
+    def __init__(self, key, session):
+        self.key = key
+        self.session = session
+        self.references = 0
+
+
+shared_sessions = {}
+
+
+def session_key(loop, config, ssl, trust_env):
+    return (loop, tuple(sorted(config.items())), id(ssl), trust_env)
+
+
+def shared_session(loop, config, ssl, trust_env=False):
+    """Returns the session shared by the instances with the same loop and transport settings
+
+    Every call must be paired with release_session(), the session is closed
+    when the last instance releases it. Shared sessions do not keep cookies,
+    so that the instances do not see each other's cookies.
+    """
+    key = session_key(loop, config, ssl, trust_env)
+    shared = shared_sessions.get(key)
+    if shared is None or shared.session.closed:
+        session = aiohttp.ClientSession(
+            loop=loop,
+            connector=tcp_connector(config, ssl, loop),
+            trust_env=trust_env,
+            cookie_jar=aiohttp.DummyCookieJar(loop=loop),
+        )
+        shared = shared_sessions[key] = SharedSession(key, session)
+    shared.references += 1
+    return shared.session
+
+
+async def release_session(session):
+    """Releases a session returned by shared_session(), closing it after its last user"""
+    for key, shared in list(shared_sessions.items()):
+        if shared.session is session:
+            shared.references -= 1
+            if shared.references <= 0:
+                del shared_sessions[key]
+                await session.close()
+            return
+    await session.close()
@@ -1,62 +1,101 @@
 # -*- coding: utf-8 -*-
 
-from asyncio import Queue, sleep, Future, ensure_future, get_event_loop
-from time import time
+import asyncio
+import heapq
+import itertools
+
+from ccxt.base.token_bucket import TokenBucket
 
 __all__ = [
+    'Throttler',
     'throttle',
 ]
 
 
-def throttle(config=None):
+class Throttler(object):
+    """An event-driven token bucket
 
-    cfg = {
-        'lastTimestamp': time(),
-        'numTokens': 0,
-        'running': False,
-        'queue': Queue(),
-        'loop': get_event_loop(),
-        'delay': 0.001,
-        'refillRate': 0.001,
-        'defaultCost': 1.000,
-        'capacity': 1.000,
-    }
-
-    cfg.update(config)
-
-    async def run():
-        if not cfg['running']:
-            future = None
-            try:
-                cfg['running'] = True
-                while not cfg['queue'].empty():
-                    now = time()
-                    elapsed = (now - cfg['lastTimestamp'])
-                    cfg['lastTimestamp'] = now
-                    cfg['numTokens'] = min(cfg['capacity'], cfg['numTokens'] + elapsed * cfg['refillRate'] * 1000)
-                    if cfg['numTokens'] > 0 or cfg['refillRate'] == 0:
-                        if not cfg['queue'].empty():
-                            cost, future = cfg['queue'].get_nowait()
-                            cfg['numTokens'] -= (cost if cost else cfg['defaultCost'])
-                            if not future.done():
-                                future.set_result(None)
-                    await sleep(cfg['delay'])
-            except BaseException as excp:
-                if future is not None:
-                    if not future.done():
-                        future.set_exception(excp)
-                while not cfg['queue'].empty():
-                    _, future = cfg['queue'].get_nowait()
-                    if not future.done():
-                        future.set_exception(excp)
-            finally:
-                cfg['running'] = False
+    Waiters are kept in a heap ordered by priority (higher first) and arrival,
+    the bucket sleeps exactly until the next token is available and releases
+    as many waiters as the tokens allow on every wake-up. The tokens live in
+    a TokenBucket that may be shared with other instances and processes.
 
-    def throttle(rate_limit, cost=None):
-        future = Future()
-        cfg['refillRate'] = 0 if rate_limit == 0 else 1 / rate_limit
-        cfg['queue'].put_nowait((cost, future))
-        ensure_future(run())
+    A waiter goes ahead of the waiters of a lower priority that arrived less
+    than priorityAging seconds per level of priority before it, so the waiters
+    of a low priority are not held back forever by a steady flow of higher ones.
+    """
+
+    def __init__(self, config, loop=None, bucket=None):
+        self.config = {
+            'refillRate': 0.001,  # tokens per millisecond
+            'capacity': 1.000,
+            'defaultCost': 1.000,
+            'priorityAging': 1.000,  # seconds
+        }
+        self.config.update(config)
+        self.loop = loop or self.config.get('loop') or asyncio.get_event_loop()
+        self.bucket = bucket if bucket is not None else TokenBucket(self.config)
+        self.queue = []
+        self.counter = itertools.count()
+        self.timer = None
+        self.wait = 0.0
+
+    def __call__(self, cost=None, priority=0):
+        cost = self.config['defaultCost'] if cost is None else cost
+        future = self.loop.create_future()
+        if not self.queue and self.acquire(cost):
+            # fast path, nobody is waiting and there is enough tokens
+            future.set_result(None)
+            return future
+        # the earlier of the arrival moved back by the priority, then the order of arrival
+        deadline = self.loop.time() - priority * self.config['priorityAging']
+        heapq.heappush(self.queue, (deadline, next(self.counter), cost, future))
+        if self.timer is None:
+            self.schedule()
         return future
 
+    def acquire(self, cost):
+        self.wait = self.bucket.take(cost)
+        return self.wait == 0
+
+    def set_refill_rate(self, refill_rate):
+        """Changes the rate of the bucket, the waiters are released at the new rate from now on"""
+        self.config['refillRate'] = refill_rate
+        if isinstance(self.bucket, TokenBucket):
+            self.bucket.set_refill_rate(refill_rate)
+        if self.timer is not None:
+            self.timer.cancel()
+            self.release()
+
+    def schedule(self):
+        # sleep until the bucket gets positive again
+        self.timer = self.loop.call_later(self.wait, self.release)
+
+    def release(self):
+        self.timer = None
+        queue = self.queue
+        while queue:
+            _, _, cost, future = queue[0]
+            if future.done():
+                # cancelled by the caller
+                heapq.heappop(queue)
+            elif self.acquire(cost):
+                heapq.heappop(queue)
+                future.set_result(None)
+            else:
+                break
+        if queue:
+            self.schedule()
+
+
+def throttle(config=None):
+    """The former interface, a function of (rate_limit, cost) that follows the rate_limit of every call"""
+    throttler = Throttler(config or {})
+
+    def throttle(rate_limit, cost=None):
+        refill_rate = 0 if rate_limit == 0 else 1 / rate_limit
+        if refill_rate != throttler.config['refillRate']:
+            throttler.set_refill_rate(refill_rate)
+        return throttler(cost)
+
     return throttle
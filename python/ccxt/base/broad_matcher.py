@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+"""The broad tables of exceptions of the exchanges, compiled once and shared by the instances with the same table"""
+
+__all__ = [
+    'BroadMatcher',
+    'broad_matcher',
+    'matchers',
+]
+
+# the matchers by the keys of their tables, the instances of an exchange have equal tables
+matchers = {}
+max_matchers = 256
+
+# the key matched by a message when it matches none
+unmatched = object()
+
+
+class BroadMatcher(object):
+    """The keys of a broad table in their order and the first of them found in each of the recent messages
+
+    A degraded exchange returns the same few error messages over and over, each of them is looked up
+    once in the messages matched already. The messages longer than max_length are bodies with their
+    own timestamps and ids more often than not, they are matched without being kept.
+    """
+
+    __slots__ = ('keys', 'matches', 'size', 'max_length')
+
+    def __init__(self, keys, size=1024, max_length=1024):
+        self.keys = keys
+        self.matches = {}
+        self.size = size
+        self.max_length = max_length
+
+    def match(self, string):
+        """The first key of the table found in a string, None if there is none"""
+        key = self.matches.get(string, unmatched)
+        if key is not unmatched:
+            return key
+        key = None
+        for candidate in self.keys:
+            if candidate in string:
+                key = candidate
+                break
+        if len(string) <= self.max_length:
+            if len(self.matches) >= self.size:
+                self.matches.clear()
+            self.matches[string] = key
+        return key
+
+
+def broad_matcher(broad):
+    """The matcher of the current keys of a broad table, keys added to the table later get a matcher of their own"""
+    keys = tuple(broad)
+    matcher = matchers.get(keys)
+    if matcher is None:
+        if len(matchers) >= max_matchers:
+            matchers.clear()
+        matcher = matchers[keys] = BroadMatcher(keys)
+    return matcher
@@ -14,6 +14,7 @@ __all__ = [
     'NO_PADDING',
     'PAD_WITH_ZERO',
     'decimal_to_precision',
+    'decimals_to_precision',
 ]
 
 
@@ -34,132 +35,207 @@ PAD_WITH_ZERO = 6
 
 
 def decimal_to_precision(n, rounding_mode=ROUND, precision=None, counting_mode=DECIMAL_PLACES, padding_mode=NO_PADDING):
-    assert precision is not None
-    if counting_mode == TICK_SIZE:
-        assert(isinstance(precision, float) or isinstance(precision, numbers.Integral))
-    else:
-        assert(isinstance(precision, numbers.Integral))
-    assert rounding_mode in [TRUNCATE, ROUND]
-    assert counting_mode in [DECIMAL_PLACES, SIGNIFICANT_DIGITS, TICK_SIZE]
-    assert padding_mode in [NO_PADDING, PAD_WITH_ZERO]
-
-    context = decimal.getcontext()
-
-    if counting_mode != TICK_SIZE:
-        precision = min(context.prec - 2, precision)
-
-    # all default except decimal.Underflow (raised when a number is rounded to zero)
-    context.traps[decimal.Underflow] = True
-    context.rounding = decimal.ROUND_HALF_UP  # rounds 0.5 away from zero
-
-    dec = decimal.Decimal(str(n))
-    precision_dec = decimal.Decimal(str(precision))
-    string = '{:f}'.format(dec)  # convert to string using .format to avoid engineering notation
-    precise = None
-
-    def power_of_10(x):
-        return decimal.Decimal('10') ** (-x)
-
-    if precision < 0:
+    return get_quantizer(rounding_mode, precision, counting_mode, padding_mode)(n)
+
+
+def decimals_to_precision(values, rounding_mode=ROUND, precision=None, counting_mode=DECIMAL_PLACES, padding_mode=NO_PADDING):
+    """decimal_to_precision() of every number of a list or an array, with the arguments checked once"""
+    quantizer = get_quantizer(rounding_mode, precision, counting_mode, padding_mode)
+    return [quantizer(n) for n in values]
+
+
+# the quantizers by their arguments and the precision of the decimal context of the thread
+quantizers = {}
+quantizers_size = 4096
+
+# the contexts of the quantizers by precision, only the precision is taken from the context of the thread,
+# the other settings are those of decimal.DefaultContext as shipped, rounding 0.5 away from zero and raising
+# decimal.Underflow (when a number is rounded to zero), the contexts of the threads are left as they are
+contexts = {}
+
+
+def get_context(prec):
+    context = contexts.get(prec)
+    if context is None:
+        context = decimal.Context(
+            prec=prec,
+            rounding=decimal.ROUND_HALF_UP,
+            Emin=-999999,
+            Emax=999999,
+            capitals=1,
+            clamp=0,
+            flags=[],
+            traps=[decimal.InvalidOperation, decimal.DivisionByZero, decimal.Overflow, decimal.Underflow],
+        )
+        contexts[prec] = context
+    return context
+
+
+def get_quantizer(rounding_mode, precision, counting_mode, padding_mode):
+    prec = decimal.getcontext().prec
+    key = (rounding_mode, precision, type(precision), counting_mode, padding_mode, prec)
+    try:
+        quantizer = quantizers.get(key)
+    except TypeError:  # an unhashable precision is rejected by the asserts
+        return Quantizer(rounding_mode, precision, counting_mode, padding_mode, prec)
+    if quantizer is None:
+        quantizer = Quantizer(rounding_mode, precision, counting_mode, padding_mode, prec)
+        if len(quantizers) >= quantizers_size:
+            quantizers.clear()
+        quantizers[key] = quantizer
+    return quantizer
+
+
+class Quantizer(object):
+    """decimal_to_precision() of one set of arguments, what does not depend on the number is computed once"""
+
+    def __init__(self, rounding_mode, precision, counting_mode, padding_mode, prec):
+        assert precision is not None
         if counting_mode == TICK_SIZE:
-            raise ValueError('TICK_SIZE cant be used with negative numPrecisionDigits')
-        to_nearest = power_of_10(precision)
-        if rounding_mode == ROUND:
-            return "{:f}".format(to_nearest * decimal.Decimal(decimal_to_precision(dec / to_nearest, rounding_mode, 0, DECIMAL_PLACES, padding_mode)))
-        elif rounding_mode == TRUNCATE:
-            return decimal_to_precision(dec - dec % to_nearest, rounding_mode, 0, DECIMAL_PLACES, padding_mode)
-
-    if counting_mode == TICK_SIZE:
-        # python modulo with negative numbers behaves different than js/php, so use abs first
-        missing = abs(dec) % precision_dec
-        if missing != 0:
+            assert(isinstance(precision, float) or isinstance(precision, numbers.Integral))
+        else:
+            assert(isinstance(precision, numbers.Integral))
+        assert rounding_mode in [TRUNCATE, ROUND]
+        assert counting_mode in [DECIMAL_PLACES, SIGNIFICANT_DIGITS, TICK_SIZE]
+        assert padding_mode in [NO_PADDING, PAD_WITH_ZERO]
+
+        self.context = context = get_context(prec)
+        if counting_mode != TICK_SIZE:
+            precision = min(prec - 2, precision)
+        self.rounding_mode = rounding_mode
+        self.precision = precision
+        self.counting_mode = counting_mode
+        self.padding_mode = padding_mode
+        self.precision_dec = decimal.Decimal(str(precision))
+        self.quantum = None
+        self.to_nearest = None
+        self.rounder = None
+        if precision < 0:
+            if counting_mode != TICK_SIZE:
+                self.to_nearest = power_of_10(precision, context)
+        elif counting_mode == TICK_SIZE:
+            self.half = precision / 2
+            parts = re.sub(r'0+$', '', '{:f}'.format(self.precision_dec)).split('.')
+            if len(parts) > 1:
+                new_precision = len(parts[1])
+            else:
+                match = re.search(r'0+$', parts[0])
+                if match is None:
+                    new_precision = 0
+                else:
+                    new_precision = - len(match.group(0))
+            self.rounder = get_quantizer(ROUND, new_precision, DECIMAL_PLACES, padding_mode)
+        elif rounding_mode == ROUND and counting_mode == DECIMAL_PLACES:
+            self.quantum = power_of_10(precision, context)
+
+    def __call__(self, n):
+        context = self.context
+        rounding_mode = self.rounding_mode
+        counting_mode = self.counting_mode
+        padding_mode = self.padding_mode
+        precision = self.precision
+
+        dec = decimal.Decimal(str(n))
+        precise = None
+
+        if precision < 0:
+            if counting_mode == TICK_SIZE:
+                raise ValueError('TICK_SIZE cant be used with negative numPrecisionDigits')
+            to_nearest = self.to_nearest
             if rounding_mode == ROUND:
-                if dec > 0:
-                    if missing >= precision / 2:
-                        dec = dec - missing + precision_dec
+                return "{:f}".format(context.multiply(to_nearest, decimal.Decimal(decimal_to_precision(context.divide(dec, to_nearest), rounding_mode, 0, DECIMAL_PLACES, padding_mode))))
+            elif rounding_mode == TRUNCATE:
+                return decimal_to_precision(context.subtract(dec, context.remainder(dec, to_nearest)), rounding_mode, 0, DECIMAL_PLACES, padding_mode)
+
+        if counting_mode == TICK_SIZE:
+            precision_dec = self.precision_dec
+            # python modulo with negative numbers behaves different than js/php, so use abs first
+            missing = context.remainder(context.abs(dec), precision_dec)
+            if missing != 0:
+                if rounding_mode == ROUND:
+                    if dec > 0:
+                        if missing >= self.half:
+                            dec = context.add(context.subtract(dec, missing), precision_dec)
+                        else:
+                            dec = context.subtract(dec, missing)
                     else:
-                        dec = dec - missing
-                else:
-                    if missing >= precision / 2:
-                        dec = dec + missing - precision_dec
+                        if missing >= self.half:
+                            dec = context.subtract(context.add(dec, missing), precision_dec)
+                        else:
+                            dec = context.add(dec, missing)
+                elif rounding_mode == TRUNCATE:
+                    if dec < 0:
+                        dec = context.add(dec, missing)
                     else:
-                        dec = dec + missing
-            elif rounding_mode == TRUNCATE:
-                if dec < 0:
-                    dec = dec + missing
-                else:
-                    dec = dec - missing
-        parts = re.sub(r'0+$', '', '{:f}'.format(precision_dec)).split('.')
-        if len(parts) > 1:
-            new_precision = len(parts[1])
-        else:
-            match = re.search(r'0+$', parts[0])
-            if match is None:
-                new_precision = 0
-            else:
-                new_precision = - len(match.group(0))
-        return decimal_to_precision('{:f}'.format(dec), ROUND, new_precision, DECIMAL_PLACES, padding_mode)
-
-    if rounding_mode == ROUND:
-        if counting_mode == DECIMAL_PLACES:
-            precise = '{:f}'.format(dec.quantize(power_of_10(precision)))  # ROUND_HALF_EVEN is default context
-        elif counting_mode == SIGNIFICANT_DIGITS:
-            q = precision - dec.adjusted() - 1
-            sigfig = power_of_10(q)
-            if q < 0:
-                string_to_precision = string[:precision]
-                # string_to_precision is '' when we have zero precision
-                below = sigfig * decimal.Decimal(string_to_precision if string_to_precision else '0')
-                above = below + sigfig
-                precise = '{:f}'.format(min((below, above), key=lambda x: abs(x - dec)))
-            else:
-                precise = '{:f}'.format(dec.quantize(sigfig))
-        if precise == ('-0.' + len(precise) * '0')[:2] or precise == '-0':
-            precise = precise[1:]
-
-    elif rounding_mode == TRUNCATE:
-        # Slice a string
-        if counting_mode == DECIMAL_PLACES:
-            before, after = string.split('.') if '.' in string else (string, '')
-            precise = before + '.' + after[:precision]
-        elif counting_mode == SIGNIFICANT_DIGITS:
-            if precision == 0:
-                return '0'
-            dot = string.index('.') if '.' in string else len(string)
-            start = dot - dec.adjusted()
-            end = start + precision
-            # need to clarify these conditionals
-            if dot >= end:
-                end -= 1
-            if precision >= len(string.replace('.', '')):
-                precise = string
-            else:
-                precise = string[:end].ljust(dot, '0')
-        if precise == ('-0.' + len(precise) * '0')[:3] or precise == '-0':
-            precise = precise[1:]
-        precise = precise.rstrip('.')
-
-    if padding_mode == NO_PADDING:
-        return precise.rstrip('0').rstrip('.') if '.' in precise else precise
-    elif padding_mode == PAD_WITH_ZERO:
-        if '.' in precise:
+                        dec = context.subtract(dec, missing)
+            return self.rounder('{:f}'.format(dec))
+
+        if rounding_mode == ROUND:
             if counting_mode == DECIMAL_PLACES:
-                before, after = precise.split('.')
-                return before + '.' + after.ljust(precision, '0')
+                precise = '{:f}'.format(dec.quantize(self.quantum, context=context))
+            elif counting_mode == SIGNIFICANT_DIGITS:
+                q = precision - dec.adjusted() - 1
+                sigfig = power_of_10(q, context)
+                if q < 0:
+                    string = '{:f}'.format(dec)  # convert to string using .format to avoid engineering notation
+                    string_to_precision = string[:precision]
+                    # string_to_precision is '' when we have zero precision
+                    below = context.multiply(sigfig, decimal.Decimal(string_to_precision if string_to_precision else '0'))
+                    above = context.add(below, sigfig)
+                    precise = '{:f}'.format(min((below, above), key=lambda x: context.abs(context.subtract(x, dec))))
+                else:
+                    precise = '{:f}'.format(dec.quantize(sigfig, context=context))
+            if precise == ('-0.' + len(precise) * '0')[:2] or precise == '-0':
+                precise = precise[1:]
 
+        elif rounding_mode == TRUNCATE:
+            string = '{:f}'.format(dec)
+            # Slice a string
+            if counting_mode == DECIMAL_PLACES:
+                before, after = string.split('.') if '.' in string else (string, '')
+                precise = before + '.' + after[:precision]
             elif counting_mode == SIGNIFICANT_DIGITS:
-                fsfg = len(list(itertools.takewhile(lambda x: x == '.' or x == '0', precise)))
-                if '.' in precise[fsfg:]:
-                    precision += 1
-                return precise[:fsfg] + precise[fsfg:].rstrip('0').ljust(precision, '0')
-        else:
-            if counting_mode == SIGNIFICANT_DIGITS:
-                if precision > len(precise):
-                    return precise + '.' + (precision - len(precise)) * '0'
-            elif counting_mode == DECIMAL_PLACES:
-                if precision > 0:
-                    return precise + '.' + precision * '0'
-            return precise
+                if precision == 0:
+                    return '0'
+                dot = string.index('.') if '.' in string else len(string)
+                start = dot - dec.adjusted()
+                end = start + precision
+                # need to clarify these conditionals
+                if dot >= end:
+                    end -= 1
+                if precision >= len(string.replace('.', '')):
+                    precise = string
+                else:
+                    precise = string[:end].ljust(dot, '0')
+            if precise == ('-0.' + len(precise) * '0')[:3] or precise == '-0':
+                precise = precise[1:]
+            precise = precise.rstrip('.')
+
+        if padding_mode == NO_PADDING:
+            return precise.rstrip('0').rstrip('.') if '.' in precise else precise
+        elif padding_mode == PAD_WITH_ZERO:
+            if '.' in precise:
+                if counting_mode == DECIMAL_PLACES:
+                    before, after = precise.split('.')
+                    return before + '.' + after.ljust(precision, '0')
+
+                elif counting_mode == SIGNIFICANT_DIGITS:
+                    fsfg = len(list(itertools.takewhile(lambda x: x == '.' or x == '0', precise)))
+                    if '.' in precise[fsfg:]:
+                        precision += 1
+                    return precise[:fsfg] + precise[fsfg:].rstrip('0').ljust(precision, '0')
+            else:
+                if counting_mode == SIGNIFICANT_DIGITS:
+                    if precision > len(precise):
+                        return precise + '.' + (precision - len(precise)) * '0'
+                elif counting_mode == DECIMAL_PLACES:
+                    if precision > 0:
+                        return precise + '.' + precision * '0'
+                return precise
+
+
+def power_of_10(x, context):
+    return context.power(decimal.Decimal('10'), -x)
 
 
 def number_to_string(x):
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+
+"""The deterministic ECDSA signatures of Exchange.ecdsa, with a table of the multiples of the generator of each curve"""
+
+import base64
+
+from ccxt.base.lazy import LazyModule
+
+# the curves, the nonces and the errors are those of the vendored python-ecdsa, the signatures are identical
+ecdsa = LazyModule('ccxt.static_dependencies.ecdsa')
+rfc6979 = LazyModule('ccxt.static_dependencies.ecdsa.rfc6979')
+
+__all__ = [
+    'Curve',
+    'SigningKey',
+    'signing_key',
+]
+
+# the bits of the scalar taken by each row of the table of the generator
+window = 5
+
+
+def inverse(x, modulus):
+    try:
+        return pow(x, -1, modulus)
+    except ValueError:  # before Python 3.8, the moduli of the curves and their orders are primes
+        return pow(x, modulus - 2, modulus)
+
+
+def number_from_bytes(string):
+    return int(base64.b16encode(string), 16) if string else 0
+
+
+class Curve(object):
+    """The arithmetic of a curve y^2 = x^3 + ax + b in Jacobian coordinates
+
+    The table of the generator has a row for each window of bits of a scalar, the row i holds
+    j * 2^(window * i) * G for j < 2^window, a multiplication by the generator is one addition
+    per window and no doublings.
+    """
+
+    instances = {}
+
+    def __init__(self, curve):
+        self.curve = curve
+        self.name = curve.name
+        self.p = curve.curve.p()
+        self.a = curve.curve.a()
+        self.order = curve.order
+        self.baselen = curve.baselen
+        self.generator = (curve.generator.x(), curve.generator.y())
+        self.table = None
+
+    @classmethod
+    def get(cls, curve):
+        """The instance of a curve of the vendored python-ecdsa"""
+        instance = cls.instances.get(curve.name)
+        if instance is None:
+            instance = cls.instances[curve.name] = cls(curve)
+        return instance
+
+    def double(self, point):
+        if point is None:
+            return None
+        x, y, z = point
+        if not y:
+            return None
+        p = self.p
+        yy = y * y % p
+        s = 4 * x * yy % p
+        m = (3 * x * x + self.a * pow(z, 4, p)) % p
+        x3 = (m * m - 2 * s) % p
+        return x3, (m * (s - x3) - 8 * yy * yy) % p, 2 * y * z % p
+
+    def add(self, point, affine):
+        """The sum of a point in Jacobian coordinates and a point in affine coordinates"""
+        x2, y2 = affine
+        if point is None:
+            return x2, y2, 1
+        x1, y1, z1 = point
+        p = self.p
+        zz = z1 * z1 % p
+        h = (x2 * zz - x1) % p
+        r = (y2 * zz * z1 - y1) % p
+        if not h:
+            return self.double(point) if not r else None
+        hh = h * h % p
+        hhh = h * hh % p
+        v = x1 * hh % p
+        x3 = (r * r - hhh - 2 * v) % p
+        return x3, (r * (v - x3) - y1 * hhh) % p, z1 * h % p
+
+    def affine(self, point):
+        if point is None:
+            return None
+        x, y, z = point
+        p = self.p
+        zi = inverse(z, p)
+        zzi = zi * zi % p
+        return x * zzi % p, y * zzi * zi % p
+
+    def affines(self, points):
+        """The affine coordinates of points, with a single inversion"""
+        p = self.p
+        products = []
+        product = 1
+        for x, y, z in points:
+            product = product * z % p
+            products.append(product)
+        product = inverse(product, p)
+        result = [None] * len(points)
+        for i in range(len(points) - 1, -1, -1):
+            x, y, z = points[i]
+            zi = product * products[i - 1] % p if i else product
+            product = product * z % p
+            zzi = zi * zi % p
+            result[i] = (x * zzi % p, y * zzi * zi % p)
+        return result
+
+    def precompute(self):
+        size = 1 << window
+        rows = (self.order.bit_length() + window - 1) // window
+        points = []
+        base = self.generator
+        for i in range(0, rows):
+            point = None
+            for j in range(1, size):
+                point = self.add(point, base)
+                points.append(point)
+            base = self.affine(self.add(point, base))
+        points = self.affines(points)
+        self.table = [[None] + points[i * (size - 1):(i + 1) * (size - 1)] for i in range(0, rows)]
+        return self.table
+
+    def multiply_generator(self, k):
+        """The affine coordinates of k * G, for 0 < k < order"""
+        table = self.table or self.precompute()
+        mask = (1 << window) - 1
+        point = None
+        i = 0
+        while k:
+            digit = k & mask
+            if digit:
+                point = self.add(point, table[i][digit])
+            k >>= window
+            i += 1
+        return self.affine(point)
+
+
+class SigningKey(object):
+    """A private key of a curve, signs as SigningKey.sign_digest_deterministic with sigencode_strings_canonize"""
+
+    def __init__(self, curve, secexp):
+        self.curve = curve
+        self.secexp = secexp
+        self.native = None
+        if curve.name == 'SECP256k1':
+            native = load_native()
+            if native is not None:
+                self.native = native.PrivateKey(number_to_bytes(secexp, curve.baselen))
+
+    def encode(self, number):
+        """The big-endian bytes of a number of the size of the order of the curve, as util.number_to_string"""
+        return number_to_bytes(number, self.curve.baselen)
+
+    def sign_digest_deterministic(self, digest, hashfunc, extra_entropy=b''):
+        """The r, s and recovery parameter of a digest, s is at most half of the order"""
+        curve = self.curve
+        if len(digest) > curve.baselen:
+            raise ecdsa.BadDigestError('this curve (%s) is too short for your digest (%d)' % (curve.name, 8 * len(digest)))
+        if self.native is not None and len(digest) == 32 and len(extra_entropy) in (0, 32):
+            signature = self.sign_native(digest, extra_entropy)
+            if signature is not None:
+                return signature
+        return self.sign_python(digest, hashfunc, extra_entropy)
+
+    def sign_python(self, digest, hashfunc, extra_entropy=b''):
+        curve = self.curve
+        order = curve.order
+        number = number_from_bytes(digest)
+        retry_gen = 0
+        while True:
+            k = rfc6979.generate_k(order, self.secexp, hashfunc, digest, retry_gen=retry_gen, extra_entropy=extra_entropy)
+            k = k % order
+            x, y = curve.multiply_generator(k)
+            r = x % order
+            s = inverse(k, order) * (number + (self.secexp * r) % order) % order
+            if r and s:
+                break
+            retry_gen += 1
+        v = y % 2 or (2 if x == k else 0)
+        # the float comparison of util.sigencode_strings_canonize
+        if s > order / 2:
+            s = order - s
+            v ^= 1
+        return r, s, v
+
+    def sign_native(self, digest, extra_entropy):
+        """The signature of libsecp256k1, None when it may not be the one of sign_python()"""
+        curve = self.curve
+        order = curve.order
+        nonce = native_ffi.new('unsigned char[32]', extra_entropy) if extra_entropy else native_ffi.NULL
+        signature = self.native.sign_recoverable(digest, hasher=None, custom_nonce=(native_ffi.NULL, nonce))
+        r = number_from_bytes(signature[0:32])
+        s = number_from_bytes(signature[32:64])
+        v = bytearray(signature[64:65])[0]
+        if r < curve.p - order:
+            # x may be above the order, its recovery parameter is not the one of python-ecdsa
+            return None
+        # libsecp256k1 compares s to half of the order exactly, python-ecdsa with a float
+        low = order - s if s > order / 2 else s
+        if low != (s if (order - s) > order / 2 else order - s):
+            return None
+        return r, low, v if low == s else v ^ 1
+
+
+def number_to_bytes(number, size):
+    string = '%x' % number
+    return base64.b16decode(('0' * (2 * size - len(string)) + string).upper())
+
+
+# libsecp256k1 through coincurve, the native backend of secp256k1 when it is installed and signs as sign_python()
+native_module = None
+native_ffi = None
+native_checked = False
+
+
+def load_native():
+    global native_module, native_ffi, native_checked
+    if native_checked:
+        return native_module
+    native_checked = True
+    try:
+        import coincurve
+        from coincurve._libsecp256k1 import ffi
+    except (ImportError, AttributeError):
+        return None
+    import hashlib
+    native_module = coincurve
+    native_ffi = ffi
+    try:
+        key = SigningKey(Curve.get(ecdsa.SECP256k1), 0xc0ffee)
+        for i in range(0, 4):
+            digest = hashlib.sha256(str(i).encode()).digest()
+            entropy = b'' if i % 2 else number_to_bytes(i, 32)
+            if key.sign_native(digest, entropy) != key.sign_python(digest, hashlib.sha256, entropy):
+                native_module = None
+                break
+    except Exception:
+        native_module = None
+    return native_module
+
+
+# the keys of the secrets signed with, by secret and curve
+keys = {}
+
+
+def signing_key(secret, curve):
+    """The SigningKey of a hexadecimal secret on a curve of the vendored python-ecdsa"""
+    key = keys.get((secret, curve.name))
+    if key is None:
+        string = base64.b16decode(secret, casefold=True)
+        # the checks of SigningKey.from_string and SigningKey.from_secret_exponent
+        assert len(string) == curve.baselen, (len(string), curve.baselen)
+        secexp = number_from_bytes(string)
+        assert 1 <= secexp < curve.order
+        if len(keys) >= 1024:
+            keys.clear()
+        key = keys[(secret, curve.name)] = SigningKey(Curve.get(curve), secexp)
+    return key
@@ -23,21 +23,32 @@ from ccxt.base.errors import RateLimitExceeded
 # -----------------------------------------------------------------------------
 
 from ccxt.base.decimal_to_precision import decimal_to_precision
+from ccxt.base.decimal_to_precision import decimals_to_precision
 from ccxt.base.decimal_to_precision import DECIMAL_PLACES, NO_PADDING, TRUNCATE, ROUND, ROUND_UP, ROUND_DOWN
 from ccxt.base.decimal_to_precision import number_to_string
 
 # -----------------------------------------------------------------------------
 
-# rsa jwt signing
-from cryptography.hazmat import backends
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.asymmetric import padding
-from cryptography.hazmat.primitives.serialization import load_pem_private_key
+from ccxt.base.token_bucket import TokenBucket
+from ccxt.base.token_bucket import shared_token_bucket
+from ccxt.base.http_adapter import InstrumentedHTTPAdapter
+from ccxt.base.http_adapter import transport_stats
+from ccxt.base.json_codec import NumberString
+from ccxt.base.json_codec import get_json_codec
+from ccxt.base.lazy import LazyModule
+from ccxt.base.markets_cache import MarketsCache
+from ccxt.base.markets_cache import default_markets_cache_directory
+from ccxt.base.market_registry import MarketRegistry
+from ccxt.base.market_registry import registries
+from ccxt.base.pagination import Pagination
+from ccxt.base.exporter import Exporter
+from ccxt.base.ecdsa_signer import signing_key
+from ccxt.base.signer import Signer
+from ccxt.base.broad_matcher import broad_matcher
+from ccxt.base.ohlcv import ohlcv_array, ohlcv_columns, ohlcv_rows, build_ohlcvc_columns, resample_ohlcv_columns, timeframe_months
 
 # -----------------------------------------------------------------------------
 
-# ecdsa signing
-from ccxt.static_dependencies import ecdsa
 # eddsa signing
 try:
     import axolotl_curve25519 as eddsa
@@ -58,18 +69,25 @@ import logging
 import base64
 import calendar
 import collections
+import concurrent.futures
+import copy
 import datetime
 from email.utils import parsedate
 import functools
 import gzip
 import hashlib
 import hmac
+import importlib.util
 import io
+import itertools
 import json
 import math
 from numbers import Number
+import os
+import random
 import re
 from requests import Session
+from requests.adapters import DEFAULT_POOLSIZE
 from requests.utils import default_user_agent
 from requests.exceptions import HTTPError, Timeout, TooManyRedirects, RequestException, ConnectionError as requestsConnectionError
 # import socket
@@ -102,15 +120,52 @@ except ImportError:
     import urllib as _urlencode          # Python 2
 
 # -----------------------------------------------------------------------------
-# web3/0x imports
 
-try:
-    from web3 import Web3, HTTPProvider
-except ImportError:
-    Web3 = HTTPProvider = None  # web3/0x not supported in Python 2
+# the signing dependencies are imported on first use
+
+# rsa jwt signing
+backends = LazyModule('cryptography.hazmat.backends')
+hashes = LazyModule('cryptography.hazmat.primitives.hashes')
+padding = LazyModule('cryptography.hazmat.primitives.asymmetric.padding')
+serialization = LazyModule('cryptography.hazmat.primitives.serialization')
+
+# -----------------------------------------------------------------------------
+
+# ecdsa signing
+ecdsa = LazyModule('ccxt.static_dependencies.ecdsa')
+
+# -----------------------------------------------------------------------------
+# web3/0x imports, on first use
+
+web3 = LazyModule('web3')  # web3/0x not supported in Python 2
 # -----------------------------------------------------------------------------
 
 
+camelcase_names = {}
+
+# -----------------------------------------------------------------------------
+# iso8601 and parse8601 tables and caches, the dates are cached per day and second
+
+iso8601_regex = re.compile(r'([0-9]{4})-?([0-9]{2})-?([0-9]{2})(?:T|[\s])?([0-9]{2}):?([0-9]{2}):?([0-9]{2})(\.[0-9]{1,3})?(?:(\+|\-)([0-9]{2})\:?([0-9]{2})|Z)?', re.IGNORECASE)
+iso8601_two_digits = ['%02d' % i for i in range(0, 60)]
+iso8601_milliseconds = ['.%03dZ' % i for i in range(0, 1000)]
+iso8601_max_timestamp = 253402300800000  # 10000-01-01T00:00:00.000Z
+iso8601_epoch_ordinal = 719163  # datetime.date(1970, 1, 1).toordinal()
+iso8601_cache_size = 8192
+iso8601_seconds = {}  # 'YYYY-MM-DDTHH:MM:SS' by the seconds since the epoch
+iso8601_days = {}  # 'YYYY-MM-DDT' by the days since the epoch
+parse8601_seconds = {}  # the seconds since the epoch by the matched date and time
+parse8601_min_seconds = -62135596800  # 0001-01-01T00:00:00Z
+parse8601_max_seconds = 253402300799  # 9999-12-31T23:59:59Z
+
+# no lower case l or upper case I, O
+base58_alphabet = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+base58_powers = [58 ** i for i in range(0, 11)]
+base58_digit_values = {c: i for i, c in enumerate(base58_alphabet)}
+base58_pairs = [a + b for a in base58_alphabet for b in base58_alphabet]  # the 58 ** 2 pairs of digits
+base58_pair_values = {pair: i for i, pair in enumerate(base58_pairs)}
+
+
 class Exchange(object):
     """Base exchange class"""
     id = None
@@ -122,10 +177,22 @@ class Exchange(object):
     # rate limiter settings
     enableRateLimit = False
     rateLimit = 2000  # milliseconds = seconds * 1000
+    rateLimitBuckets = None  # named buckets besides the default one, {'orders': {'rateLimit': 100}}
+    rateLimitBackend = None  # share the buckets between instances: 'process', 'file' or a callable(key, config)
+    rateLimitKey = None  # instances with the same key share their buckets, id + api hostname by default
+    adaptiveRateLimit = False  # resync the buckets from the response headers, back off and retry GETs on 429
+    rateLimitHeaders = None  # {'X-MBX-USED-WEIGHT-1M': {'type': 'used', 'limit': 1200, 'window': 60000}}
+    rateLimitMaxRetries = 3
+    rateLimitBackoff = 1000  # milliseconds, doubled on every retry
+    rateLimitRetryAfter = None
+    apiEndpoints = None  # (api, METHOD, path) → {'cost': 1, 'buckets': {}}, of the class or of an instance with its own api
+    httpMethods = ('get', 'post', 'put', 'delete', 'patch', 'head', 'options')
     timeout = 10000   # milliseconds = seconds * 1000
     asyncio_loop = None
     aiohttp_proxy = None
     aiohttp_trust_env = False
+    requests_pool_connections = None  # number of hosts to keep connection pools for, 10 by default
+    requests_pool_maxsize = None  # connections kept alive per host, raise it when many threads share an instance
     session = None  # Session () by default
     verify = True  # SSL verification
     logger = None  # logging.getLogger(__name__) by default
@@ -313,14 +380,41 @@ class Exchange(object):
     last_http_response = None
     last_json_response = None
     last_response_headers = None
+    clearCookies = True  # drop the cookies set by the previous response before every sync request
+    static_request_headers = None
+    static_request_headers_source = None
+    jsonCodec = 'json'  # json, orjson, ujson, simdjson or auto for the fastest one installed
+    jsonNumbers = None  # float by default, 'string' or 'decimal' to keep the exact values of the fractional numbers
+    marketsCache = False  # True or a directory to keep the loaded markets in a file shared by the processes
+    marketsCacheTTL = 3600000  # milliseconds
+    # the options the markets depend on, the ones the exchanges read in fetch_markets and fetch_currencies
+    marketsCacheOptions = [
+        'currencies',
+        'defaultPrecision',
+        'defaultType',
+        'fees',
+        'fetchCurrencies',
+        'fetchMarkets',
+        'fetchMarketsMethod',
+        'fiatCurrencies',
+        'inactiveCurrencies',
+        'language',
+        'limits',
+        'precision',
+        'promotionalMarkets',
+        'quoteIds',
+        'tradingFeesByQuoteCurrency',
+    ]
+    sharedMarkets = False  # share the indexed markets with the other instances that load the same ones, read-only
+    market_registry = None
+    onMarketsChange = None  # called with {'added', 'removed', 'changed'} markets by symbol when a reload changes them
 
     requiresWeb3 = False
     requiresEddsa = False
     web3 = None
-    base58_encoder = None
-    base58_decoder = None
-    # no lower case l or upper case I, O
-    base58_alphabet = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+    base58_encoder = dict(enumerate(base58_alphabet))
+    base58_decoder = base58_digit_values
+    base58_alphabet = base58_alphabet
 
     commonCurrencies = {
         'XBT': 'BTC',
@@ -355,7 +449,7 @@ class Exchange(object):
         self.origin = self.uuid()
         self.userAgent = default_user_agent()
 
-        settings = self.deep_extend(self.describe(), config)
+        settings = self.deep_extend(self.deep_copy(self.cached_describe()), config)
 
         for key in settings:
             if hasattr(self, key) and isinstance(getattr(self, key), dict):
@@ -363,38 +457,74 @@ class Exchange(object):
             else:
                 setattr(self, key, settings[key])
 
-        if self.api:
-            self.define_rest_api(self.api, 'request')
+        # the generated methods are defined once per class, unless this instance brings its own api
+        cls = type(self)
+        if self.api and ('api' in config or not cls.__dict__.get('_rest_api_defined')):
+            endpoints = self.define_rest_api(self.api, 'request')
+            if 'api' in config:
+                # the costs of an api of its own are this instance's, not those of the other instances
+                self.apiEndpoints = endpoints
+            else:
+                cls.apiEndpoints = endpoints
+            cls._rest_api_defined = 'api' not in config
 
         if self.markets:
             self.set_markets(self.markets)
 
         # convert all properties from underscore notation foo_bar to camelcase notation fooBar
-        cls = type(self)
-        for name in dir(self):
+        for name, camelcase in cls.define_camelcase_aliases():
+            setattr(self, camelcase, getattr(self, name))
+        for name in list(self.__dict__):
             if name[0] != '_' and name[-1] != '_' and '_' in name:
-                parts = name.split('_')
-                # fetch_ohlcv → fetchOHLCV (not fetchOhlcv!)
-                exceptions = {'ohlcv': 'OHLCV', 'le': 'LE', 'be': 'BE'}
-                camelcase = parts[0] + ''.join(exceptions.get(i, self.capitalize(i)) for i in parts[1:])
-                attr = getattr(self, name)
-                if isinstance(attr, types.MethodType):
-                    setattr(cls, camelcase, getattr(cls, name))
-                else:
-                    setattr(self, camelcase, attr)
+                setattr(self, Exchange.camelcase(name), getattr(self, name))
 
         self.tokenBucket = self.extend({
             'refillRate': 1.0 / self.rateLimit if self.rateLimit > 0 else float('inf'),
+            'rateLimit': self.rateLimit,  # the rateLimit the refillRate follows, see update_rate_limiter
             'delay': 0.001,
             'capacity': 1.0,
             'defaultCost': 1.0,
         }, getattr(self, 'tokenBucket', {}))
-
-        self.session = self.session if self.session or self.asyncio_loop else Session()
+        self.rateLimitBuckets = self.init_rate_limit_buckets(self.rateLimitBuckets or {})
+        self.rateLimiter = self.create_token_bucket(self.tokenBucket)
+        self.rateLimiters = {}
+        for name, bucket in self.rateLimitBuckets.items():
+            self.rateLimiters[name] = self.create_token_bucket(bucket, name)
+
+        self.json_codec = get_json_codec(self.jsonCodec, self.jsonNumbers)
+        self.json = self.json_codec.dumps
+        self.unjson = self.json_codec.loads
+
+        # the signatures of this instance reuse the keyed contexts, the private keys and the decoded credentials
+        self.signer = Signer(Exchange)
+        self.hmac = self.signer.hmac
+        self.jwt = self.signer.jwt
+        self.rsa = self.signer.rsa
+        self.eddsa = self.signer.eddsa
+        self.base64_to_binary = self.base64ToBinary = self.signer.base64_to_binary
+        self.base58_to_binary = self.base58ToBinary = self.signer.base58_to_binary
+
+        # the matchers of the broad tables of exceptions by the id of their table
+        self.broadMatchers = {}
+
+        self.transport_stats = transport_stats()
+        if not self.session and not self.asyncio_loop:
+            self.session = self.create_session()
         self.logger = self.logger if self.logger else logging.getLogger(__name__)
 
-        if self.requiresWeb3 and Web3 and not Exchange.web3:
-            Exchange.web3 = Web3(HTTPProvider())
+        if self.requiresWeb3 and not Exchange.web3 and Exchange.has_web3():
+            Exchange.web3 = web3.Web3(web3.HTTPProvider())
+
+    def create_session(self):
+        session = Session()
+        adapter = InstrumentedHTTPAdapter(
+            self.transport_stats,
+            pool_connections=self.requests_pool_connections or DEFAULT_POOLSIZE,
+            pool_maxsize=self.requests_pool_maxsize or DEFAULT_POOLSIZE,
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
 
     def __del__(self):
         if self.session:
@@ -421,15 +551,54 @@ class Exchange(object):
             del self.urls['api_backup']
 
     @classmethod
-    def define_rest_api(cls, api, method_name, paths=[]):
+    def cached_describe(cls):
+        """The describe() of the class, computed once and shared by its instances, do not modify"""
+        if '_described' not in cls.__dict__:
+            cls._described = cls.describe(cls.__new__(cls))
+        return cls._described
+
+    @staticmethod
+    def camelcase(name):
+        camelcase = camelcase_names.get(name)
+        if camelcase is None:
+            parts = name.split('_')
+            # fetch_ohlcv → fetchOHLCV (not fetchOhlcv!)
+            exceptions = {'ohlcv': 'OHLCV', 'le': 'LE', 'be': 'BE'}
+            camelcase = camelcase_names[name] = parts[0] + ''.join(exceptions.get(i, Exchange.capitalize(i)) for i in parts[1:])
+        return camelcase
+
+    @classmethod
+    def define_camelcase_aliases(cls):
+        """Aliases the methods of the class once, returns the (name, camelcase) pairs of its other attributes"""
+        if '_camelcase_attributes' not in cls.__dict__:
+            attributes = []
+            for name in dir(cls):
+                if name[0] != '_' and name[-1] != '_' and '_' in name:
+                    camelcase = Exchange.camelcase(name)
+                    descriptor = next(klass.__dict__[name] for klass in cls.__mro__ if name in klass.__dict__)
+                    if isinstance(descriptor, (types.FunctionType, classmethod)):
+                        setattr(cls, camelcase, getattr(cls, name))
+                    elif isinstance(descriptor, staticmethod):
+                        setattr(cls, camelcase, descriptor)
+                    else:
+                        attributes.append((name, camelcase))
+            cls._camelcase_attributes = attributes
+        return cls._camelcase_attributes
+
+    @classmethod
+    def define_rest_api(cls, api, method_name, paths=[], endpoints=None):
+        """Defines the generated methods of an api, returns its endpoints by (api, METHOD, path)"""
         delimiters = re.compile('[^a-zA-Z0-9]')
         entry = getattr(cls, method_name)  # returns a function (instead of a bound method)
+        endpoints = {} if endpoints is None else endpoints
         for key, value in api.items():
-            if isinstance(value, list):
+            # a list of paths or a dict of path → cost/config under an http verb
+            if isinstance(value, list) or (isinstance(value, dict) and key.lower() in cls.httpMethods):
                 uppercase_method = key.upper()
                 lowercase_method = key.lower()
                 camelcase_method = lowercase_method.capitalize()
                 for path in value:
+                    endpoint = value[path] if isinstance(value, dict) else None
                     path = path.strip()
                     split_path = delimiters.split(path)
                     lowercase_path = [x.strip().lower() for x in split_path]
@@ -448,6 +617,8 @@ class Exchange(object):
                             api_argument = paths[0]
                     camelcase = camelcase_prefix + camelcase_method + Exchange.capitalize(camelcase_suffix)
                     underscore = underscore_prefix + '_' + lowercase_method + '_' + underscore_suffix.lower()
+                    endpoint_key = (tuple(paths) if len(paths) > 1 else api_argument, uppercase_method, path)
+                    endpoints[endpoint_key] = cls.parse_api_endpoint(endpoint)
 
                     def partialer():
                         outer_kwargs = {'path': path, 'api': api_argument, 'method': uppercase_method}
@@ -468,22 +639,168 @@ class Exchange(object):
                     setattr(cls, camelcase, to_bind)
                     setattr(cls, underscore, to_bind)
             else:
-                cls.define_rest_api(value, method_name, paths + [key])
+                cls.define_rest_api(value, method_name, paths + [key], endpoints)
+        return endpoints
+
+    @staticmethod
+    def parse_api_endpoint(endpoint=None):
+        """Normalizes an api definition entry: None (a plain list of paths), a number (cost) or a dict"""
+        if endpoint is None:
+            return {'cost': 1, 'buckets': {}}
+        if isinstance(endpoint, Number):
+            return {'cost': endpoint, 'buckets': {}}
+        return Exchange.extend({'cost': 1}, endpoint, {'buckets': dict(endpoint.get('buckets') or {})})
+
+    def init_rate_limit_buckets(self, buckets):
+        result = {}
+        for name, bucket in buckets.items():
+            if 'rateLimit' in bucket:
+                rate_limit = bucket['rateLimit']
+            elif bucket.get('refillRate'):
+                rate_limit = 1.0 / bucket['refillRate']
+            else:
+                rate_limit = 0
+            result[name] = self.extend(self.tokenBucket, {
+                'refillRate': 1.0 / rate_limit if rate_limit > 0 else float('inf'),
+                'rateLimit': rate_limit,
+            }, bucket)
+        return result
 
-    def throttle(self):
-        now = float(self.milliseconds())
-        elapsed = now - self.lastRestRequestTimestamp
-        if elapsed < self.rateLimit:
-            delay = self.rateLimit - elapsed
-            time.sleep(delay / 1000.0)
+    def get_rate_limit_key(self):
+        if self.rateLimitKey is not None:
+            return self.rateLimitKey
+        urls = self.urls or {}
+        api = urls.get('api')
+        if isinstance(api, dict):
+            api = next(iter(api.values()), None) if len(api) else None
+        hostname = _urlencode.urlparse(self.implode_params(api, {'hostname': self.hostname})).hostname if isinstance(api, basestring) else None
+        return self.id + ':' + (hostname or self.hostname or '')
+
+    def create_token_bucket(self, config, name=None):
+        """Returns an instance-local bucket or the shared bucket of the configured rateLimitBackend"""
+        if self.rateLimitBackend is None:
+            return TokenBucket(config)
+        key = self.get_rate_limit_key() + ('' if name is None else ':' + name)
+        if callable(self.rateLimitBackend):
+            return self.rateLimitBackend(key, config)
+        return shared_token_bucket(key, config, self.rateLimitBackend)
+
+    def api_endpoint(self, path, api='public', method='GET'):
+        api_key = tuple(api) if isinstance(api, list) else api
+        endpoints = self.apiEndpoints or {}
+        endpoint = endpoints.get((api_key, method, path))
+        return endpoint if endpoint is not None else self.parse_api_endpoint()
+
+    def calculate_rate_limiter_cost(self, api, method, path, params, config={}):
+        return self.safe_value(config, 'cost', 1)
+
+    def calculate_rate_limiter_priority(self, api, method, path, params, config={}):
+        """Queued requests with a higher priority are sent first, orders and cancels go ahead of market data"""
+        return self.safe_integer(config, 'priority', 0 if method == 'GET' else 1)
+
+    def update_rate_limiter(self):
+        """Applies a rateLimit changed after the instance was built to the default bucket, returns whether it changed"""
+        if self.rateLimit == self.tokenBucket.get('rateLimit'):
+            return False
+        refill_rate = 1.0 / self.rateLimit if self.rateLimit > 0 else float('inf')
+        self.tokenBucket['rateLimit'] = self.rateLimit
+        self.tokenBucket['refillRate'] = refill_rate
+        # the buckets of a callable rateLimitBackend keep the rate they were made with
+        if isinstance(self.rateLimiter, TokenBucket):
+            self.rateLimiter.set_refill_rate(refill_rate)
+        return True
+
+    def throttle(self, cost=None, bucket=None):
+        """Blocks the calling thread until the bucket lets the request through"""
+        self.update_rate_limiter()
+        rate_limiter = self.rateLimiter if bucket is None else self.rateLimiters[bucket]
+        delay = rate_limiter.take(cost)
+        while delay > 0:
+            time.sleep(delay)
+            delay = rate_limiter.take(cost)
+
+    def handle_rate_limit_headers(self, http_status_code, headers):
+        """Resyncs the buckets with the budget reported in the response headers, pauses them on 418/429"""
+        if headers is None:
+            return
+        for header, config in (self.rateLimitHeaders or {}).items():
+            value = self.safe_float(headers, header)
+            if value is None:
+                continue
+            limit = self.safe_float(config, 'limit')
+            if config.get('type', 'used') == 'used':
+                if limit is None:
+                    continue  # the budget used tells nothing without the limit
+                remaining = limit - value
+            else:
+                remaining = value
+            window = self.safe_float(config, 'window')
+            refill_rate = (limit / window) if (limit and window) else None
+            # a used up budget is back when the window resets, the windows are aligned to the clock
+            hold = (window - self.milliseconds() % window) / 1000 if (remaining <= 0 and window) else None
+            bucket = config.get('bucket')
+            rate_limiter = self.rateLimiter if bucket is None else self.rateLimiters.get(bucket)
+            if rate_limiter is not None:
+                # keep one unit in reserve for the requests in flight
+                rate_limiter.sync(remaining - 1, refill_rate, limit, hold)
+        self.rateLimitRetryAfter = None
+        if http_status_code in (418, 429):
+            self.rateLimitRetryAfter = self.parse_retry_after(headers.get('Retry-After'))
+
+    def pause_rate_limiters(self, milliseconds):
+        seconds = milliseconds / 1000
+        self.rateLimiter.pause(seconds)
+        for rate_limiter in self.rateLimiters.values():
+            rate_limiter.pause(seconds)
+
+    def parse_retry_after(self, value):
+        """Retry-After in milliseconds, the header holds either seconds or an http date"""
+        if value is None:
+            return None
+        try:
+            return max(float(value), 0) * 1000
+        except ValueError:
+            timestamp = self.parse_date(value)
+            return None if timestamp is None else max(timestamp - self.milliseconds(), 0)
+
+    def rate_limit_backoff_delay(self, retries):
+        """Milliseconds to wait before retrying a rate-limited request, exponential with jitter"""
+        delay = self.rateLimitBackoff * (2 ** retries)
+        delay = delay / 2 + random.uniform(0, delay / 2)
+        if self.rateLimitRetryAfter is not None:
+            delay = max(delay, self.rateLimitRetryAfter)
+        return delay
+
+    def is_rate_limit_retryable(self, method, retries, error):
+        return method in ('GET', 'HEAD') and retries < self.rateLimitMaxRetries
 
     def fetch2(self, path, api='public', method='GET', params={}, headers=None, body=None):
         """A better wrapper over request for deferred signing"""
-        if self.enableRateLimit:
-            self.throttle()
-        self.lastRestRequestTimestamp = self.milliseconds()
-        request = self.sign(path, api, method, params, headers, body)
-        return self.fetch(request['url'], request['method'], request['headers'], request['body'])
+        retries = 0
+        while True:
+            if self.enableRateLimit:
+                endpoint = self.api_endpoint(path, api, method)
+                for bucket, weight in endpoint['buckets'].items():
+                    if bucket in self.rateLimitBuckets:
+                        self.throttle(weight, bucket)
+                self.throttle(self.calculate_rate_limiter_cost(api, method, path, params, endpoint))
+            self.lastRestRequestTimestamp = self.milliseconds()
+            self.signer.check(self.secret, self.apiKey)
+            request = self.sign(path, api, method, params, headers, body)
+            try:
+                return self.fetch(request['url'], request['method'], request['headers'], request['body'])
+            except DDoSProtection as e:
+                if not self.adaptiveRateLimit:
+                    raise e
+                # hold back all requests, not just the retried one
+                delay = self.rate_limit_backoff_delay(retries)
+                self.pause_rate_limiters(delay)
+                if not self.is_rate_limit_retryable(request['method'], retries, e):
+                    raise e
+                self.logger.debug("%s %s, rate limited, retrying in %d ms", method, path, delay)
+                if not self.enableRateLimit:
+                    self.sleep(delay)
+                retries += 1
 
     def request(self, path, api='public', method='GET', params={}, headers=None, body=None):
         """Exchange.request is the entry point for all generated methods"""
@@ -510,6 +827,15 @@ class Exchange(object):
 
     def find_broadly_matched_key(self, broad, string):
         """A helper method for matching error strings exactly vs broadly"""
+        if type(string) is str:
+            # a table is compiled on its first lookup and again when it is replaced or when keys are added or removed
+            entry = self.broadMatchers.get(id(broad))
+            if entry is None or len(entry[0]) != entry[1]:
+                if len(self.broadMatchers) >= 64:
+                    self.broadMatchers.clear()
+                entry = self.broadMatchers[id(broad)] = (broad, len(broad), broad_matcher(broad))
+            return entry[2].match(string)
+        # the other types fail in their find as before
         keys = list(broad.keys())
         for i in range(0, len(keys)):
             key = keys[i]
@@ -520,17 +846,28 @@ class Exchange(object):
     def handle_errors(self, code, reason, url, method, headers, body, response, request_headers, request_body):
         pass
 
+    def get_static_request_headers(self):
+        """The headers sent with every request, recomputed only when one of their sources changes"""
+        source = (self.headers, self.userAgent, self.proxy, self.origin)
+        if self.static_request_headers is None or source != self.static_request_headers_source:
+            headers = dict(self.headers)
+            if self.userAgent:
+                if type(self.userAgent) is str:
+                    headers['User-Agent'] = self.userAgent
+                elif (type(self.userAgent) is dict) and ('User-Agent' in self.userAgent):
+                    headers.update(self.userAgent)
+            if self.proxy:
+                headers['Origin'] = self.origin
+            headers['Accept-Encoding'] = 'gzip, deflate'
+            self.static_request_headers = headers
+            # copies, the dicts changed in place are told apart from the ones the headers were made of
+            user_agent = dict(self.userAgent) if type(self.userAgent) is dict else self.userAgent
+            self.static_request_headers_source = (dict(self.headers), user_agent, self.proxy, self.origin)
+        return self.static_request_headers
+
     def prepare_request_headers(self, headers=None):
         headers = headers or {}
-        headers.update(self.headers)
-        if self.userAgent:
-            if type(self.userAgent) is str:
-                headers.update({'User-Agent': self.userAgent})
-            elif (type(self.userAgent) is dict) and ('User-Agent' in self.userAgent):
-                headers.update(self.userAgent)
-        if self.proxy:
-            headers.update({'Origin': self.origin})
-        headers.update({'Accept-Encoding': 'gzip, deflate'})
+        headers.update(self.get_static_request_headers())
         return self.set_headers(headers)
 
     def print(self, *args):
@@ -550,9 +887,17 @@ class Exchange(object):
 
         request_body = body
         if body:
-            body = body.encode()
+            body = body.encode() if isinstance(body, str) else body
+            self.transport_stats.add('bytesOut', len(body))
+
+        if self.clearCookies and len(self.session.cookies):
+            self.session.cookies.clear()
 
-        self.session.cookies.clear()
+        # the responses not kept otherwise are those of the errors of this request only, see keep_error_response
+        if not self.enableLastHttpResponse:
+            self.last_http_response = None
+        if not self.enableLastJsonResponse:
+            self.last_json_response = None
 
         http_response = None
         http_status_code = None
@@ -568,13 +913,18 @@ class Exchange(object):
                 proxies=self.proxies,
                 verify=self.verify
             )
-            # does not try to detect encoding
-            response.encoding = 'utf-8'
-            http_response = response.text
+            self.transport_stats.add('requests', 1)
+            content = response.content
+            self.transport_stats.add('bytesIn', len(content))
             http_status_code = response.status_code
             http_status_text = response.reason
-            json_response = self.parse_json(http_response)
+            # does not try to detect encoding, parses json straight from the bytes
+            json_response = self.parse_json(content)
+            if self.is_response_text_required(http_status_code, json_response):
+                http_response = content.decode('utf-8', 'replace')
             headers = response.headers
+            if self.adaptiveRateLimit:
+                self.handle_rate_limit_headers(http_status_code, headers)
             # FIXME remove last_x_responses from subclasses
             if self.enableLastHttpResponse:
                 self.last_http_response = http_response
@@ -601,6 +951,7 @@ class Exchange(object):
 
         except HTTPError as e:
             details = ' '.join([self.id, method, url])
+            self.keep_error_response(http_response, json_response)
             self.handle_errors(http_status_code, http_status_text, url, method, headers, http_response, json_response, request_headers, request_body)
             self.handle_http_status_code(http_status_code, http_status_text, url, method, http_response)
             raise ExchangeError(details) from e
@@ -621,7 +972,11 @@ class Exchange(object):
             else:
                 raise ExchangeError(details) from e
 
-        self.handle_errors(http_status_code, http_status_text, url, method, headers, http_response, json_response, request_headers, request_body)
+        try:
+            self.handle_errors(http_status_code, http_status_text, url, method, headers, http_response, json_response, request_headers, request_body)
+        except Exception:
+            self.keep_error_response(http_response, json_response)
+            raise
         if json_response is not None:
             return json_response
         elif self.is_text_response(headers):
@@ -629,6 +984,26 @@ class Exchange(object):
         else:
             return response.content
 
+    def is_response_text_required(self, http_status_code, json_response):
+        """Whether the body of a response is decoded to text
+
+        It is when it is kept, printed or logged, when it is returned or reported as an error and when
+        the exchange reads it in its handle_errors. The json responses of the other exchanges are only
+        parsed from the bytes.
+        """
+        if json_response is None or http_status_code >= 400:
+            return True
+        if self.enableLastHttpResponse or self.verbose or self.logger.isEnabledFor(logging.DEBUG):
+            return True
+        return getattr(self.handle_errors, '__func__', None) is not Exchange.handle_errors
+
+    def keep_error_response(self, http_response, json_response):
+        """Keeps the response of an error when the responses are not kept, the error mapping of the exchanges reads it"""
+        if not self.enableLastHttpResponse:
+            self.last_http_response = http_response
+        if not self.enableLastJsonResponse:
+            self.last_json_response = json_response
+
     def handle_http_status_code(self, http_status_code, http_status_text, url, method, body):
         string_code = str(http_status_code)
         if string_code in self.httpExceptions:
@@ -638,7 +1013,13 @@ class Exchange(object):
     def parse_json(self, http_response):
         try:
             if Exchange.is_json_encoded_object(http_response):
-                return json.loads(http_response)
+                return self.json_codec.loads(http_response)
+        except UnicodeDecodeError:
+            # the bytes of a body with invalid utf-8 are parsed as the text decoded like the body of the error
+            try:
+                return self.json_codec.loads(http_response.decode('utf-8', 'replace'))
+            except ValueError:
+                pass
         except ValueError:  # superclass of JsonDecodeError (python2)
             pass
 
@@ -662,40 +1043,73 @@ class Exchange(object):
 
     @staticmethod
     def safe_float(dictionary, key, default_value=None):
-        value = default_value
+        # the dicts and lists are looked up once, the other types go through key_exists
+        if type(dictionary) is dict and key is not None:
+            value = dictionary.get(key)
+        elif type(dictionary) is list and type(key) is int and 0 <= key < len(dictionary):
+            value = dictionary[key]
+        else:
+            value = Exchange.safe_value(dictionary, key)
+        if value is None:
+            return default_value
         try:
-            if Exchange.key_exists(dictionary, key):
-                value = float(dictionary[key])
-        except ValueError as e:
-            value = default_value
-        return value
+            return float(value)
+        except ValueError:
+            return default_value
 
     @staticmethod
     def safe_string(dictionary, key, default_value=None):
-        return str(dictionary[key]) if Exchange.key_exists(dictionary, key) else default_value
+        if type(dictionary) is dict and key is not None:
+            value = dictionary.get(key)
+        elif type(dictionary) is list and type(key) is int and 0 <= key < len(dictionary):
+            value = dictionary[key]
+        else:
+            value = Exchange.safe_value(dictionary, key)
+        if value is None:
+            return default_value
+        return value if type(value) is str else str(value)
 
     @staticmethod
     def safe_string_lower(dictionary, key, default_value=None):
-        return str(dictionary[key]).lower() if Exchange.key_exists(dictionary, key) else default_value
+        value = dictionary.get(key) if type(dictionary) is dict and key is not None else Exchange.safe_value(dictionary, key)
+        return default_value if value is None else str(value).lower()
 
     @staticmethod
     def safe_string_upper(dictionary, key, default_value=None):
-        return str(dictionary[key]).upper() if Exchange.key_exists(dictionary, key) else default_value
+        value = dictionary.get(key) if type(dictionary) is dict and key is not None else Exchange.safe_value(dictionary, key)
+        return default_value if value is None else str(value).upper()
 
     @staticmethod
     def safe_integer(dictionary, key, default_value=None):
-        if not Exchange.key_exists(dictionary, key):
+        if type(dictionary) is dict and key is not None:
+            value = dictionary.get(key)
+        elif type(dictionary) is list and type(key) is int and 0 <= key < len(dictionary):
+            value = dictionary[key]
+        else:
+            value = Exchange.safe_value(dictionary, key)
+        if value is None:
             return default_value
-        value = dictionary[key]
+        value_type = type(value)
+        if value_type is int:
+            return value
+        if value_type is str:
+            return int(value) if value.isnumeric() else default_value
         if isinstance(value, Number) or (isinstance(value, basestring) and value.isnumeric()):
             return int(value)
+        if isinstance(value, NumberString):
+            return int(float(value))
         return default_value
 
     @staticmethod
     def safe_integer_product(dictionary, key, factor, default_value=None):
-        if not Exchange.key_exists(dictionary, key):
+        if type(dictionary) is dict and key is not None:
+            value = dictionary.get(key)
+        elif type(dictionary) is list and type(key) is int and 0 <= key < len(dictionary):
+            value = dictionary[key]
+        else:
+            value = Exchange.safe_value(dictionary, key)
+        if value is None:
             return default_value
-        value = dictionary[key]
         if isinstance(value, Number):
             return int(value * factor)
         elif isinstance(value, basestring):
@@ -711,6 +1125,14 @@ class Exchange(object):
 
     @staticmethod
     def safe_value(dictionary, key, default_value=None):
+        if type(dictionary) is dict:
+            if key is None:
+                return default_value
+            value = dictionary.get(key)
+            return default_value if value is None else value
+        if type(dictionary) is list and type(key) is int:
+            value = dictionary[key] if 0 <= key < len(dictionary) else None
+            return default_value if value is None else value
         return dictionary[key] if Exchange.key_exists(dictionary, key) else default_value
 
     # we're not using safe_floats with a list argument as we're trying to save some cycles here
@@ -718,23 +1140,35 @@ class Exchange(object):
 
     @staticmethod
     def safe_float_2(dictionary, key1, key2, default_value=None):
-        return Exchange.safe_either(Exchange.safe_float, dictionary, key1, key2, default_value)
+        value = Exchange.safe_float(dictionary, key1)
+        return value if value is not None else Exchange.safe_float(dictionary, key2, default_value)
 
     @staticmethod
     def safe_string_2(dictionary, key1, key2, default_value=None):
-        return Exchange.safe_either(Exchange.safe_string, dictionary, key1, key2, default_value)
+        if type(dictionary) is dict and key1 is not None and key2 is not None:
+            value = dictionary.get(key1)
+            if value is None:
+                value = dictionary.get(key2)
+                if value is None:
+                    return default_value
+            return value if type(value) is str else str(value)
+        value = Exchange.safe_string(dictionary, key1)
+        return value if value is not None else Exchange.safe_string(dictionary, key2, default_value)
 
     @staticmethod
     def safe_string_lower_2(dictionary, key1, key2, default_value=None):
-        return Exchange.safe_either(Exchange.safe_string_lower, dictionary, key1, key2, default_value)
+        value = Exchange.safe_string_lower(dictionary, key1)
+        return value if value is not None else Exchange.safe_string_lower(dictionary, key2, default_value)
 
     @staticmethod
     def safe_string_upper_2(dictionary, key1, key2, default_value=None):
-        return Exchange.safe_either(Exchange.safe_string_upper, dictionary, key1, key2, default_value)
+        value = Exchange.safe_string_upper(dictionary, key1)
+        return value if value is not None else Exchange.safe_string_upper(dictionary, key2, default_value)
 
     @staticmethod
     def safe_integer_2(dictionary, key1, key2, default_value=None):
-        return Exchange.safe_either(Exchange.safe_integer, dictionary, key1, key2, default_value)
+        value = Exchange.safe_integer(dictionary, key1)
+        return value if value is not None else Exchange.safe_integer(dictionary, key2, default_value)
 
     @staticmethod
     def safe_integer_product_2(dictionary, key1, key2, factor, default_value=None):
@@ -747,7 +1181,8 @@ class Exchange(object):
 
     @staticmethod
     def safe_value_2(dictionary, key1, key2, default_value=None):
-        return Exchange.safe_either(Exchange.safe_value, dictionary, key1, key2, default_value)
+        value = Exchange.safe_value(dictionary, key1)
+        return value if value is not None else Exchange.safe_value(dictionary, key2, default_value)
 
     @staticmethod
     def safe_either(method, dictionary, key1, key2, default_value=None):
@@ -811,6 +1246,15 @@ class Exchange(object):
             return result
         return {}
 
+    @staticmethod
+    def deep_copy(value):
+        """Copies the nested dicts and lists, the other values are shared"""
+        if isinstance(value, dict):
+            return {key: Exchange.deep_copy(value[key]) for key in value}
+        if isinstance(value, list):
+            return [Exchange.deep_copy(item) for item in value]
+        return value
+
     @staticmethod
     def deep_extend(*args):
         result = None
@@ -982,6 +1426,23 @@ class Exchange(object):
     def iso8601(timestamp=None):
         if timestamp is None:
             return timestamp
+        if type(timestamp) is int and 0 <= timestamp < iso8601_max_timestamp:
+            seconds, milliseconds = divmod(timestamp, 1000)
+            prefix = iso8601_seconds.get(seconds)
+            if prefix is None:
+                days, seconds_of_day = divmod(seconds, 86400)
+                day = iso8601_days.get(days)
+                if day is None:
+                    if len(iso8601_days) >= iso8601_cache_size:
+                        iso8601_days.clear()
+                    day = iso8601_days[days] = datetime.date.fromordinal(iso8601_epoch_ordinal + days).isoformat() + 'T'
+                hours, seconds_of_hour = divmod(seconds_of_day, 3600)
+                minutes, seconds_of_minute = divmod(seconds_of_hour, 60)
+                prefix = day + iso8601_two_digits[hours] + ':' + iso8601_two_digits[minutes] + ':' + iso8601_two_digits[seconds_of_minute]
+                if len(iso8601_seconds) >= iso8601_cache_size:
+                    iso8601_seconds.clear()
+                iso8601_seconds[seconds] = prefix
+            return prefix + iso8601_milliseconds[milliseconds]
         if not isinstance(timestamp, (int, long)):
             return None
         if int(timestamp) < 0:
@@ -1037,32 +1498,33 @@ class Exchange(object):
     def parse8601(timestamp=None):
         if timestamp is None:
             return timestamp
-        yyyy = '([0-9]{4})-?'
-        mm = '([0-9]{2})-?'
-        dd = '([0-9]{2})(?:T|[\\s])?'
-        h = '([0-9]{2}):?'
-        m = '([0-9]{2}):?'
-        s = '([0-9]{2})'
-        ms = '(\\.[0-9]{1,3})?'
-        tz = '(?:(\\+|\\-)([0-9]{2})\\:?([0-9]{2})|Z)?'
-        regex = r'' + yyyy + mm + dd + h + m + s + ms + tz
         try:
-            match = re.search(regex, timestamp, re.IGNORECASE)
+            match = iso8601_regex.search(timestamp)
             if match is None:
                 return None
-            yyyy, mm, dd, h, m, s, ms, sign, hours, minutes = match.groups()
-            ms = ms or '.000'
-            ms = (ms + '00')[0:4]
-            msint = int(ms[1:])
-            sign = sign or ''
-            sign = int(sign + '1') * -1
-            hours = int(hours or 0) * sign
-            minutes = int(minutes or 0) * sign
-            offset = datetime.timedelta(hours=hours, minutes=minutes)
-            string = yyyy + mm + dd + h + m + s + ms + 'Z'
-            dt = datetime.datetime.strptime(string, "%Y%m%d%H%M%S.%fZ")
-            dt = dt + offset
-            return calendar.timegm(dt.utctimetuple()) * 1000 + msint
+            # the date and time up to the seconds, in the format of the match
+            text = timestamp[match.start():match.end(6)]
+            seconds = parse8601_seconds.get(text)
+            if seconds is None:
+                yyyy, mm, dd, h, m, s = match.group(1, 2, 3, 4, 5, 6)
+                # raises ValueError for the dates that do not exist
+                days = datetime.date(int(yyyy), int(mm), int(dd)).toordinal() - iso8601_epoch_ordinal
+                h = int(h)
+                m = int(m)
+                s = int(s)
+                if h > 23 or m > 59 or s > 59:
+                    return None
+                seconds = days * 86400 + h * 3600 + m * 60 + s
+                if len(parse8601_seconds) >= iso8601_cache_size:
+                    parse8601_seconds.clear()
+                parse8601_seconds[text] = seconds
+            ms, sign, hours, minutes = match.group(7, 8, 9, 10)
+            if sign is not None:
+                offset = int(hours) * 3600 + int(minutes) * 60
+                seconds = seconds - offset if sign == '+' else seconds + offset
+                if seconds < parse8601_min_seconds or seconds > parse8601_max_seconds:
+                    return None
+            return seconds * 1000 + (int((ms + '00')[1:4]) if ms else 0)
         except (TypeError, OverflowError, OSError, ValueError):
             return None
 
@@ -1091,17 +1553,11 @@ class Exchange(object):
 
     @staticmethod
     def binary_concat(*args):
-        result = bytes()
-        for arg in args:
-            result = result + arg
-        return result
+        return b''.join(args)
 
     @staticmethod
     def binary_concat_array(array):
-        result = bytes()
-        for element in array:
-            result = result + element
-        return result
+        return b''.join(array)
 
     @staticmethod
     def base64urlencode(s):
@@ -1154,7 +1610,7 @@ class Exchange(object):
             "RS512": hashes.SHA512(),
         }
         algorithm = algorithms[alg]
-        priv_key = load_pem_private_key(secret, None, backends.default_backend())
+        priv_key = serialization.load_pem_private_key(secret, None, backends.default_backend())
         return priv_key.sign(Exchange.encode(request), padding.PKCS1v15(), algorithm)
 
     @staticmethod
@@ -1177,21 +1633,15 @@ class Exchange(object):
             digest = Exchange.hash(encoded_request, hash, 'binary')
         else:
             digest = base64.b16decode(encoded_request, casefold=True)
-        key = ecdsa.SigningKey.from_string(base64.b16decode(Exchange.encode(secret),
-                                                            casefold=True), curve=curve_info[0])
-        r_binary, s_binary, v = key.sign_digest_deterministic(digest, hashfunc=hash_function,
-                                                              sigencode=ecdsa.util.sigencode_strings_canonize)
-        r_int, s_int = ecdsa.util.sigdecode_strings((r_binary, s_binary), key.privkey.order)
+        key = signing_key(Exchange.encode(secret), curve_info[0])
+        r_int, s_int, v = key.sign_digest_deterministic(digest, hash_function)
         counter = 0
         minimum_size = (1 << (8 * 31)) - 1
-        half_order = key.privkey.order / 2
+        half_order = key.curve.order / 2
         while fixed_length and (r_int > half_order or r_int <= minimum_size or s_int <= minimum_size):
-            r_binary, s_binary, v = key.sign_digest_deterministic(digest, hashfunc=hash_function,
-                                                                  sigencode=ecdsa.util.sigencode_strings_canonize,
-                                                                  extra_entropy=Exchange.number_to_le(counter, 32))
-            r_int, s_int = ecdsa.util.sigdecode_strings((r_binary, s_binary), key.privkey.order)
+            r_int, s_int, v = key.sign_digest_deterministic(digest, hash_function, extra_entropy=Exchange.number_to_le(counter, 32))
             counter += 1
-        r, s = Exchange.decode(base64.b16encode(r_binary)).lower(), Exchange.decode(base64.b16encode(s_binary)).lower()
+        r, s = Exchange.decode(base64.b16encode(key.encode(r_int))).lower(), Exchange.decode(base64.b16encode(key.encode(s_int))).lower()
         return {
             'r': r,
             's': s,
@@ -1216,6 +1666,8 @@ class Exchange(object):
 
     @staticmethod
     def is_json_encoded_object(input):
+        if isinstance(input, bytes):
+            return (len(input) >= 2) and (input[:1] in (b'{', b'['))
         return (isinstance(input, basestring) and
                 (len(input) >= 2) and
                 ((input[0] == '{') or (input[0] == '[')))
@@ -1293,22 +1745,101 @@ class Exchange(object):
     def currency_to_precision(self, currency, fee):
         return self.decimal_to_precision(fee, ROUND, self.currencies[currency]['precision'], self.precisionMode, self.paddingMode)
 
+    def prices_to_precision(self, symbol, prices):
+        if type(self).price_to_precision is not Exchange.price_to_precision:
+            return [self.price_to_precision(symbol, price) for price in prices]
+        return decimals_to_precision(prices, ROUND, self.markets[symbol]['precision']['price'], self.precisionMode, self.paddingMode)
+
+    def amounts_to_precision(self, symbol, amounts):
+        if type(self).amount_to_precision is not Exchange.amount_to_precision:
+            return [self.amount_to_precision(symbol, amount) for amount in amounts]
+        return decimals_to_precision(amounts, TRUNCATE, self.markets[symbol]['precision']['amount'], self.precisionMode, self.paddingMode)
+
     def set_markets(self, markets, currencies=None):
+        # a reload updates the markets loaded before, unless they were replaced
+        previous = self.market_registry if self.market_registry is not None and self.market_registry.markets is self.markets else None
+        registry = None
+        key = None
+        if self.sharedMarkets:
+            values = list(markets.values()) if type(markets) is dict else markets
+            fingerprint = MarketRegistry.fingerprint(values, currencies, self.fees['trading'], self.precision, self.limits, self.currencies)
+            if fingerprint is not None:
+                key = (self.id, fingerprint)
+                registry = registries.get(key)
+        if registry is None:
+            registry = self.build_markets(markets, currencies, previous)
+            changes = registry.changes
+            if key is not None:
+                registries[key] = registry
+        else:
+            # built by another instance from other markets loaded before
+            changes = MarketRegistry.diff(previous.markets, registry.markets) if previous is not None else None
+        self.market_registry = registry
+        self.markets = registry.markets
+        self.markets_by_id = registry.markets_by_id
+        self.marketsById = self.markets_by_id
+        self.symbols = registry.symbols
+        self.ids = registry.ids
+        self.currencies = registry.currencies
+        self.currencies_by_id = registry.currencies_by_id
+        if registry.base_currencies is not None:
+            self.base_currencies = registry.base_currencies
+            self.quote_currencies = registry.quote_currencies
+        if changes and self.onMarketsChange and (changes['added'] or changes['removed'] or changes['changed']):
+            self.onMarketsChange(changes)
+        return self.markets
+
+    def build_markets(self, markets, currencies=None, previous=None):
+        registry = MarketRegistry()
         values = list(markets.values()) if type(markets) is dict else markets
+        defaults = self.extend(self.fees['trading'], {'precision': self.precision, 'limits': self.limits})
+        registry.defaults = self.deep_extend(defaults)
+        # a reload keeps the markets that have not changed as they are
+        existing = previous.markets if previous is not None and previous.defaults == defaults else {}
+        reused = 0
         for i in range(0, len(values)):
-            values[i] = self.extend(
-                self.fees['trading'],
-                {'precision': self.precision, 'limits': self.limits},
-                values[i]
-            )
-        self.markets = self.index_by(values, 'symbol')
-        self.markets_by_id = self.index_by(values, 'id')
-        self.marketsById = self.markets_by_id
-        self.symbols = sorted(self.markets.keys())
-        self.ids = sorted(self.markets_by_id.keys())
+            market = dict(defaults)
+            market.update(values[i])
+            found = existing.get(market.get('symbol'))
+            if found is not None and found == market:
+                market = found
+                reused += 1
+            values[i] = market
+        if self.sharedMarkets:
+            MarketRegistry.intern(values)
+        registry.markets = self.index_by(values, 'symbol')
+        registry.source_currencies = currencies
+        if previous is None:
+            registry.markets_by_id = self.index_by(values, 'id')
+            registry.symbols = sorted(registry.markets.keys())
+            registry.ids = sorted(registry.markets_by_id.keys())
+            unchanged = False
+        else:
+            if reused == len(values) and len(registry.markets) == len(previous.markets):
+                # the same markets, each of them found by its symbol
+                changes = {'added': {}, 'removed': {}, 'changed': {}}
+            else:
+                changes = MarketRegistry.diff(previous.markets, registry.markets, True)
+            self.update_markets_indexes(registry, previous, changes)
+            registry.changes = changes
+            unchanged = not (changes['added'] or changes['removed'] or changes['changed'])
+        derived = previous is not None and not previous.source_currencies and previous.base_currencies is not None and previous.currencies is self.currencies
         if currencies:
-            self.currencies = self.deep_extend(currencies, self.currencies)
+            if previous is not None and previous.currencies is self.currencies:
+                registry.currencies = self.update_currencies(currencies, previous)
+            else:
+                registry.currencies = self.deep_extend(currencies, self.currencies)
+        elif derived and unchanged:
+            registry.currencies = previous.currencies
+            registry.base_currencies = previous.base_currencies
+            registry.quote_currencies = previous.quote_currencies
         else:
+            # a reload derives the currencies of the markets that changed only
+            codes = None
+            if derived:
+                codes = set()
+                for market in itertools.chain(changes['added'].values(), changes['removed'].values(), changes['changed'].values(), (previous.markets[symbol] for symbol in changes['changed'])):
+                    codes.update(market[key] for key in ('base', 'quote') if key in market)
             base_currencies = [{
                 'id': market['baseId'] if (('baseId' in market) and (market['baseId'] is not None)) else market['base'],
                 'numericId': market['baseNumericId'] if 'baseNumericId' in market else None,
@@ -1318,7 +1849,7 @@ class Exchange(object):
                         market['precision']['amount'] if 'amount' in market['precision'] else None
                     )
                 ) if 'precision' in market else 8,
-            } for market in values if 'base' in market]
+            } for market in values if 'base' in market and (codes is None or market['base'] in codes)]
             quote_currencies = [{
                 'id': market['quoteId'] if (('quoteId' in market) and (market['quoteId'] is not None)) else market['quote'],
                 'numericId': market['quoteNumericId'] if 'quoteNumericId' in market else None,
@@ -1328,15 +1859,87 @@ class Exchange(object):
                         market['precision']['price'] if 'price' in market['precision'] else None
                     )
                 ) if 'precision' in market else 8,
-            } for market in values if 'quote' in market]
+            } for market in values if 'quote' in market and (codes is None or market['quote'] in codes)]
             base_currencies = self.sort_by(base_currencies, 'code')
             quote_currencies = self.sort_by(quote_currencies, 'code')
-            self.base_currencies = self.index_by(base_currencies, 'code')
-            self.quote_currencies = self.index_by(quote_currencies, 'code')
+            registry.base_currencies = self.index_by(base_currencies, 'code')
+            registry.quote_currencies = self.index_by(quote_currencies, 'code')
+            if codes is not None:
+                registry.base_currencies = self.update_currencies_index(previous.base_currencies, registry.base_currencies, codes)
+                registry.quote_currencies = self.update_currencies_index(previous.quote_currencies, registry.quote_currencies, codes)
             currencies = self.sort_by(base_currencies + quote_currencies, 'code')
-            self.currencies = self.deep_extend(self.index_by(currencies, 'code'), self.currencies)
-        self.currencies_by_id = self.index_by(list(self.currencies.values()), 'id')
-        return self.markets
+            registry.currencies = self.merge_currencies(self.index_by(currencies, 'code'))
+        if previous is not None and registry.currencies is previous.currencies:
+            registry.currencies_by_id = previous.currencies_by_id
+        else:
+            registry.currencies_by_id = self.index_by(list(registry.currencies.values()), 'id')
+        return registry
+
+    def update_markets_indexes(self, registry, previous, changes):
+        """Applies the changes to copies of the indexes of the previous markets"""
+        if not (changes['added'] or changes['removed'] or changes['changed']):
+            registry.markets = previous.markets
+            registry.markets_by_id = previous.markets_by_id
+            registry.symbols = previous.symbols
+            registry.ids = previous.ids
+            return
+        markets_by_id = dict(previous.markets_by_id)
+        for symbol in itertools.chain(changes['removed'], changes['changed']):
+            market = previous.markets[symbol]
+            if markets_by_id.get(market['id']) is market:
+                del markets_by_id[market['id']]
+        for market in itertools.chain(changes['added'].values(), changes['changed'].values()):
+            markets_by_id[market['id']] = market
+        registry.markets_by_id = markets_by_id
+        if changes['added'] or changes['removed']:
+            registry.symbols = sorted(registry.markets.keys())
+        else:
+            registry.symbols = previous.symbols
+        if changes['added'] or changes['removed'] or any(market['id'] != previous.markets[symbol]['id'] for symbol, market in changes['changed'].items()):
+            registry.ids = sorted(markets_by_id.keys())
+        else:
+            registry.ids = previous.ids
+
+    def update_currencies_index(self, index, currencies, codes):
+        """A copy of the index with the currencies of the codes replaced or removed"""
+        result = dict(index)
+        for code in codes:
+            if code in currencies:
+                result[code] = currencies[code]
+            elif code in result:
+                del result[code]
+        return result
+
+    def merge_currencies(self, currencies):
+        """deep_extend(currencies, self.currencies) repeating the currencies loaded before that have all the keys"""
+        result = {}
+        for code, currency in currencies.items():
+            if code not in self.currencies:
+                result[code] = self.deep_extend(currency)
+                continue
+            existing = self.currencies[code]
+            if isinstance(existing, dict) and all(key in existing for key in currency):
+                result[code] = existing
+            else:
+                result[code] = self.deep_extend(currency, existing)
+        for code, currency in self.currencies.items():
+            if code not in result:
+                result[code] = currency
+        return result
+
+    def update_currencies(self, currencies, previous):
+        """deep_extend(currencies, self.currencies) repeating the results of the currencies unchanged since the previous load"""
+        result = {}
+        source = previous.source_currencies or {}
+        for code, currency in currencies.items():
+            if code in self.currencies and code in source and source[code] == currency:
+                result[code] = self.currencies[code]
+            else:
+                result[code] = self.deep_extend(currency, self.currencies[code]) if code in self.currencies else self.deep_extend(currency)
+        for code, currency in self.currencies.items():
+            if code not in result:
+                result[code] = currency
+        return result
 
     def load_markets(self, reload=False, params={}):
         if not reload:
@@ -1344,12 +1947,46 @@ class Exchange(object):
                 if not self.markets_by_id:
                     return self.set_markets(self.markets)
                 return self.markets
+        cache = self.get_markets_cache()
+        if cache is not None:
+            return self.load_cached_markets(cache, reload, params)
         currencies = None
         if self.has['fetchCurrencies']:
             currencies = self.fetch_currencies()
         markets = self.fetch_markets(params)
         return self.set_markets(markets, currencies)
 
+    def get_markets_cache(self):
+        if not self.marketsCache:
+            return None
+        directory = self.marketsCache if isinstance(self.marketsCache, basestring) else default_markets_cache_directory()
+        # the urls cover the sandbox mode, the version covers the changes of the market structures, the options
+        # changed at runtime that do not change the markets, like the timeDifference of binance, are left out
+        options = dict((name, self.options[name]) for name in self.marketsCacheOptions if name in self.options)
+        key = [__version__, self.id, self.safe_value(self.urls, 'api'), options]
+        return MarketsCache(directory, self.id, key, self.marketsCacheTTL, self.json_codec)
+
+    def load_cached_markets(self, cache, reload=False, params={}):
+        if not reload:
+            cached = cache.read()
+            if cached is not None and cached['fresh']:
+                return self.set_markets(cached['markets'], cached['currencies'])
+        # one process refreshes an expired file, the others wait for it and read its result
+        cache.lock()
+        try:
+            if not reload:
+                cached = cache.read()
+                if cached is not None and cached['fresh']:
+                    return self.set_markets(cached['markets'], cached['currencies'])
+            currencies = None
+            if self.has['fetchCurrencies']:
+                currencies = self.fetch_currencies()
+            markets = self.fetch_markets(params)
+            cache.write(markets, currencies)  # before set_markets extends the markets in place
+        finally:
+            cache.unlock()
+        return self.set_markets(markets, currencies)
+
     def load_accounts(self, reload=False, params={}):
         if reload:
             self.accounts = self.fetch_accounts(params)
@@ -1571,6 +2208,65 @@ class Exchange(object):
         ohlcvs = self.fetch_ohlcvc(symbol, timeframe, since, limit, params)
         return [ohlcv[0:-1] for ohlcv in ohlcvs]
 
+    def fetch_ohlcv_columns(self, symbol, timeframe='1m', since=None, limit=None, params={}):
+        return ohlcv_columns(self.fetch_ohlcv(symbol, timeframe, since, limit, params))
+
+    def fetch_ohlcv_array(self, symbol, timeframe='1m', since=None, limit=None, params={}):
+        return ohlcv_array(self.fetch_ohlcv(symbol, timeframe, since, limit, params))
+
+    def paginate(self, method, symbol=None, since=None, limit=None, params={}, until=None, timeframe='1m'):
+        """Yields the pages of fetch_ohlcv, fetch_trades or fetch_my_trades from since until until, without repeated items"""
+        pagination = Pagination(self, method, symbol, since, until, limit, params, timeframe)
+        while True:
+            page = pagination.fetch()
+            if page is None:
+                return
+            if page:
+                yield page
+
+    def fetch_history(self, method, symbol=None, since=None, limit=None, params={}, until=None, timeframe='1m'):
+        """All the items of paginate() in chronological order"""
+        items = [item for page in self.paginate(method, symbol, since, limit, params, until, timeframe) for item in page]
+        return self.sort_by(items, 0 if method == 'fetch_ohlcv' else 'timestamp')
+
+    def export_history(self, method, symbol, path, since=None, limit=None, params={}, until=None, timeframe='1m', format=None):
+        """Appends the pages of paginate() to a file as they are fetched, after the items written to it before,
+        returns the count of items appended"""
+        exporter = Exporter(path, method, format)
+        pagination = Pagination(self, method, symbol, since, until, limit, params, timeframe)
+        exporter.resume(pagination)
+        try:
+            while True:
+                page = pagination.fetch()
+                if page is None:
+                    break
+                exporter.write(page)
+        finally:
+            exporter.close()
+        return exporter.count
+
+    def export_histories(self, method, symbols, directory, since=None, limit=None, params={}, until=None, timeframe='1m', format='csv', concurrency=4):
+        """export_history() of many symbols in parallel threads, to a file per symbol in directory"""
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        def export(symbol):
+            # a copy of this instance for each symbol, its session and its last responses are not shared by the threads,
+            # its rate limiter, its transport_stats, its options and its markets are
+            exchange = copy.copy(self)
+            exchange.session = self.create_session()
+            exchange.last_http_response = None
+            exchange.last_json_response = None
+            exchange.last_response_headers = None
+            try:
+                return exchange.export_history(method, symbol, os.path.join(directory, Exporter.filename(symbol, format)), since, limit, params, until, timeframe, format)
+            finally:
+                exchange.session.close()
+
+        with concurrent.futures.ThreadPoolExecutor(concurrency) as executor:
+            futures = [(symbol, executor.submit(export, symbol)) for symbol in symbols]
+            return {symbol: future.result() for symbol, future in futures}
+
     def fetch_status(self, params={}):
         if self.has['fetchTime']:
             updated = self.fetch_time(params)
@@ -1647,6 +2343,23 @@ class Exchange(object):
                 ohlcvs[candle][count] += 1
         return ohlcvs
 
+    def build_ohlcvc_columns(self, trades, timeframe='1m', since=None, limit=None):
+        if since is not None:
+            trades = [trade for trade in trades if trade['timestamp'] >= since]
+        ms = self.parse_timeframe(timeframe) * 1000
+        columns = build_ohlcvc_columns([trade['timestamp'] for trade in trades], [trade['price'] for trade in trades], [trade['amount'] for trade in trades], ms, timeframe_months(timeframe))
+        if limit is not None:
+            columns = {field: column[0:limit] for field, column in columns.items()}
+        return columns
+
+    def resample_ohlcv(self, ohlcvs, timeframe='1h'):
+        columns = resample_ohlcv_columns(ohlcvs, self.parse_timeframe(timeframe) * 1000, timeframe_months(timeframe))
+        if isinstance(ohlcvs, dict):
+            return columns
+        if isinstance(ohlcvs, list):
+            return ohlcv_rows(columns)
+        return ohlcv_array(columns)
+
     @staticmethod
     def parse_timeframe(timeframe):
         amount = int(timeframe[0:-1])
@@ -1822,7 +2535,7 @@ class Exchange(object):
 
     def market_id(self, symbol):
         market = self.market(symbol)
-        return market['id'] if type(market) is dict else symbol
+        return market['id'] if isinstance(market, dict) else symbol
 
     def calculate_fee(self, symbol, type, side, amount, price, takerOrMaker='taker', params={}):
         market = self.markets[symbol]
@@ -1879,7 +2592,7 @@ class Exchange(object):
 
     @staticmethod
     def has_web3():
-        return Web3 is not None
+        return importlib.util.find_spec('web3') is not None
 
     def check_required_dependencies(self):
         if self.requiresWeb3 and not Exchange.has_web3():
@@ -1990,11 +2703,9 @@ class Exchange(object):
 
     @staticmethod
     def decimal_to_bytes(n, endian='big'):
-        """int.from_bytes and int.to_bytes don't work in python2"""
+        """The bytes of a positive integer without the leading zeros, empty for zero"""
         if n > 0:
-            next_byte = Exchange.decimal_to_bytes(n // 0x100, endian)
-            remainder = bytes([n % 0x100])
-            return next_byte + remainder if endian == 'big' else remainder + next_byte
+            return n.to_bytes((n.bit_length() + 7) // 8, 'big' if endian == 'big' else 'little')
         else:
             return b''
 
@@ -2017,11 +2728,17 @@ class Exchange(object):
 
     @staticmethod
     def number_to_le(n, size):
-        return Exchange.decimal_to_bytes(int(n), 'little').ljust(size, b'\x00')
+        n = int(n)
+        if 0 <= n < 1 << (8 * size):
+            return n.to_bytes(size, 'little')
+        return Exchange.decimal_to_bytes(n, 'little').ljust(size, b'\x00')
 
     @staticmethod
     def number_to_be(n, size):
-        return Exchange.decimal_to_bytes(int(n), 'big').rjust(size, b'\x00')
+        n = int(n)
+        if 0 <= n < 1 << (8 * size):
+            return n.to_bytes(size, 'big')
+        return Exchange.decimal_to_bytes(n, 'big').rjust(size, b'\x00')
 
     @staticmethod
     def base16_to_binary(s):
@@ -2050,34 +2767,39 @@ class Exchange(object):
     @staticmethod
     def base58_to_binary(s):
         """encodes a base58 string to as a big endian integer"""
-        if Exchange.base58_decoder is None:
-            Exchange.base58_decoder = {}
-            Exchange.base58_encoder = {}
-            for i, c in enumerate(Exchange.base58_alphabet):
-                Exchange.base58_decoder[c] = i
-                Exchange.base58_encoder[i] = c
+        pair_values = base58_pair_values
         result = 0
-        for i in range(len(s)):
-            result *= 58
-            result += Exchange.base58_decoder[s[i]]
-        return Exchange.decimal_to_bytes(result)
+        # two digits at a time from the table of the pairs, ten digits at a time below 2 ** 63
+        start = len(s) % 10
+        if start:
+            chunk = base58_digit_values[s[0]] if start % 2 else 0
+            for i in range(start % 2, start, 2):
+                chunk = chunk * 3364 + pair_values[s[i:i + 2]]
+            result = chunk
+        for i in range(start, len(s), 10):
+            chunk = pair_values[s[i:i + 2]] * 3364 + pair_values[s[i + 2:i + 4]]
+            chunk = (chunk * 3364 + pair_values[s[i + 4:i + 6]]) * 3364 + pair_values[s[i + 6:i + 8]]
+            result = result * base58_powers[10] + chunk * 3364 + pair_values[s[i + 8:i + 10]]
+        return result.to_bytes((result.bit_length() + 7) // 8, 'big')
 
     @staticmethod
     def binary_to_base58(b):
-        if Exchange.base58_encoder is None:
-            Exchange.base58_decoder = {}
-            Exchange.base58_encoder = {}
-            for i, c in enumerate(Exchange.base58_alphabet):
-                Exchange.base58_decoder[c] = i
-                Exchange.base58_encoder[i] = c
-        result = 0
-        # undo decimal_to_bytes
-        for byte in b:
-            result *= 0x100
-            result += byte
+        pairs = base58_pairs
+        result = int.from_bytes(b, 'big')
         string = []
+        # ten digits at a time, as five pairs of the table
+        while result >= base58_powers[10]:
+            result, chunk = divmod(result, base58_powers[10])
+            chunk, fifth = divmod(chunk, 3364)
+            chunk, fourth = divmod(chunk, 3364)
+            chunk, third = divmod(chunk, 3364)
+            first, second = divmod(chunk, 3364)
+            string.append(pairs[first] + pairs[second] + pairs[third] + pairs[fourth] + pairs[fifth])
+        head = []
         while result > 0:
             result, next_character = divmod(result, 58)
-            string.append(Exchange.base58_encoder[next_character])
+            head.append(base58_alphabet[next_character])
+        head.reverse()
+        string.append(''.join(head))
         string.reverse()
         return ''.join(string)
@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+
+"""Appends the pages of a history to a file as they are fetched, Parquet or Arrow IPC with pyarrow and CSV otherwise"""
+
+import csv
+import io
+import os
+import re
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+from ccxt.base.errors import NotSupported
+
+__all__ = [
+    'Exporter',
+    'export_fields',
+]
+
+# the columns of each history, a name with a dot is a key of a nested dict
+export_fields = {
+    'fetch_ohlcv': (('timestamp', int), ('open', float), ('high', float), ('low', float), ('close', float), ('volume', float)),
+    'fetch_trades': (
+        ('id', str), ('timestamp', int), ('datetime', str), ('symbol', str), ('order', str), ('type', str), ('side', str),
+        ('takerOrMaker', str), ('price', float), ('amount', float), ('cost', float), ('fee.cost', float), ('fee.currency', str),
+    ),
+    'fetch_ledger': (
+        ('id', str), ('timestamp', int), ('datetime', str), ('direction', str), ('account', str), ('referenceId', str),
+        ('referenceAccount', str), ('type', str), ('currency', str), ('amount', float), ('before', float), ('after', float),
+        ('status', str), ('fee.cost', float), ('fee.currency', str),
+    ),
+}
+export_fields['fetch_my_trades'] = export_fields['fetch_trades']
+
+export_formats = {
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.arrow': 'arrow',
+    '.feather': 'arrow',
+}
+
+
+class Exporter(object):
+    """Appends the items of a history to a CSV file or to the parts of a Parquet or Arrow directory
+
+    The rows are written as the pages come, with a batch of at most batch_size rows in memory, a CSV file is
+    appended to and a Parquet or Arrow directory gets a new part every part_size rows, renamed from its .tmp
+    name once it is complete, so a crash loses the rows of the last part only. resume() reads the last rows
+    back for a history to continue where it stopped, the count of the rows of a CSV file is kept in a .count
+    file next to it so that only the rows written after it are counted again.
+    """
+
+    def __init__(self, path, method, format=None, batch_size=65536, part_size=262144):
+        if method not in export_fields:
+            raise NotSupported('export of ' + method + '() is not supported, only of ' + ', '.join(sorted(export_fields)))
+        if format is None:
+            format = export_formats.get(os.path.splitext(path)[1].lower())
+            if format is None or (format != 'csv' and pyarrow is None):
+                format = 'csv'
+        if format != 'csv' and pyarrow is None:
+            raise NotSupported('export to ' + format + ' requires pyarrow, use csv without it')
+        self.path = path
+        self.method = method
+        self.format = format
+        self.fields = export_fields[method]
+        self.names = [name for name, kind in self.fields]
+        self.batch_size = batch_size
+        self.part_size = part_size
+        self.part_rows = 0
+        self.batch = []
+        self.count = 0
+        self.file = None
+        self.writer = None
+        self.part = None
+        self.rows = None  # the count of the rows of a CSV file, None until it is read or written
+
+    @staticmethod
+    def filename(symbol, format='csv'):
+        """The file of the history of a symbol or a currency code in a directory"""
+        name = re.sub(r'[^\w.-]+', '-', symbol) if symbol else 'all'
+        return name + {'csv': '.csv', 'parquet': '.parquet', 'arrow': '.arrow'}[format]
+
+    # reading back
+
+    def parts(self):
+        extension = '.parquet' if self.format == 'parquet' else '.arrow'
+        if not os.path.isdir(self.path):
+            return []
+        return sorted(os.path.join(self.path, name) for name in os.listdir(self.path) if re.match(r'^part-\d+' + re.escape(extension) + '$', name))
+
+    def read_tail(self):
+        """The count of rows and the last rows of the same timestamp"""
+        if self.format == 'csv':
+            return self.read_csv_tail()
+        parts = self.parts()
+        count = 0
+        for part in parts:
+            if self.format == 'parquet':
+                count += pyarrow.parquet.ParquetFile(part).metadata.num_rows
+            else:
+                with pyarrow.ipc.open_file(part) as reader:
+                    count += sum(reader.get_batch(i).num_rows for i in range(0, reader.num_record_batches))
+        # the rows of the last timestamp, from the last row groups back
+        rows = []
+        for part in reversed(parts):
+            if self.format == 'parquet':
+                file = pyarrow.parquet.ParquetFile(part)
+                groups = [file.read_row_group(i).to_pylist() for i in reversed(range(0, file.num_row_groups))]
+            else:
+                with pyarrow.ipc.open_file(part) as reader:
+                    groups = [reader.get_batch(i).to_pylist() for i in reversed(range(0, reader.num_record_batches))]
+            for group in groups:
+                rows = group + rows
+                tail = self.same_timestamp(rows)
+                if len(tail) < len(rows):
+                    return count, tail
+        return count, self.same_timestamp(rows)
+
+    def read_csv_tail(self, chunk=65536):
+        if not os.path.exists(self.path):
+            return 0, []
+        with open(self.path, 'rb+') as file:
+            size = file.seek(0, os.SEEK_END)
+            # a row cut by a crash is dropped
+            end = size
+            while end > 0:
+                file.seek(max(0, end - chunk))
+                data = file.read(end - max(0, end - chunk))
+                newline = data.rfind(b'\n')
+                if newline >= 0:
+                    end = max(0, end - chunk) + newline + 1
+                    break
+                end = max(0, end - chunk)
+            if end < size:
+                file.truncate(end)
+            # the rows after the ones counted in the .count file, or all of them without it
+            offset, count = self.read_count()
+            if offset is None or offset > end:
+                offset, count = 0, -1  # the header
+            file.seek(offset)
+            while offset < end:
+                data = file.read(min(chunk, end - offset))
+                count += data.count(b'\n')
+                offset += len(data)
+            count = max(count, 0)
+            self.rows = count
+            # the rows of the last timestamp, from the end of the file
+            start = end
+            rows = []
+            while start > 0:
+                start = max(0, start - chunk)
+                file.seek(start)
+                data = file.read(end - start)
+                lines = data.split(b'\n')
+                if start > 0:
+                    lines = lines[1:]  # cut
+                rows = [row for row in csv.reader(io.StringIO(b'\n'.join(lines).decode('utf-8')))]
+                rows = [self.parse_row(row) for row in rows if row and row != self.names]
+                tail = self.same_timestamp(rows)
+                if len(tail) < len(rows) or start == 0:
+                    return count, tail
+            return count, []
+
+    def read_count(self):
+        """The size of the CSV file and its count of rows when they were last written, None, None without them"""
+        try:
+            with open(self.path + '.count') as file:
+                offset, count = file.read().split()
+            return int(offset), int(count)
+        except (IOError, OSError, ValueError):
+            return None, None
+
+    def write_count(self):
+        with open(self.path + '.count.tmp', 'w') as file:
+            file.write('%d %d\n' % (os.fstat(self.file.fileno()).st_size, self.rows))
+        os.replace(self.path + '.count.tmp', self.path + '.count')
+
+    def parse_row(self, row):
+        item = {}
+        for (name, kind), value in zip(self.fields, row):
+            if value == '':
+                item[name] = None
+            elif kind is int and not value.isdigit():
+                item[name] = int(float(value))
+            else:
+                item[name] = kind(value)
+        return item
+
+    def same_timestamp(self, rows):
+        if not rows:
+            return []
+        timestamp = rows[-1]['timestamp']
+        tail = []
+        for row in reversed(rows):
+            if row['timestamp'] != timestamp:
+                break
+            tail.append(row)
+        return list(reversed(tail))
+
+    def resume(self, pagination):
+        """Moves the pagination past the rows written before, returns the count of them"""
+        if self.format != 'csv' and os.path.isdir(self.path):
+            for name in os.listdir(self.path):
+                if name.endswith('.tmp'):  # the part of a run that did not end
+                    os.remove(os.path.join(self.path, name))
+        count, tail = self.read_tail()
+        if tail:
+            keys = [pagination.identify([row['timestamp']] if pagination.ohlcv else row) for row in tail if pagination.ohlcv or row.get('id') is not None]
+            pagination.resume(tail[-1], keys, count)
+        return count
+
+    # writing
+
+    def row(self, item):
+        if self.method == 'fetch_ohlcv':
+            return list(item[0:6])
+        row = []
+        for name in self.names:
+            if '.' in name:
+                key, subkey = name.split('.')
+                value = (item.get(key) or {}).get(subkey)
+            else:
+                value = item.get(name)
+            row.append(value)
+        return row
+
+    def write(self, page):
+        self.batch.extend(self.row(item) for item in page)
+        self.count += len(page)
+        if len(self.batch) >= self.batch_size or self.format == 'csv':
+            self.flush()
+
+    def flush(self):
+        if not self.batch:
+            return
+        batch, self.batch = self.batch, []
+        if self.format == 'csv':
+            if self.file is None:
+                new = not os.path.exists(self.path) or not os.path.getsize(self.path)
+                if new:
+                    self.rows = 0
+                elif self.rows is None:
+                    self.read_csv_tail()
+                self.file = open(self.path, 'a', newline='', encoding='utf-8')
+                self.writer = csv.writer(self.file)
+                if new:
+                    self.writer.writerow(self.names)
+            self.writer.writerows(batch)
+            self.file.flush()
+            self.rows += len(batch)
+            self.write_count()
+            return
+        columns = {}
+        for i, (name, kind) in enumerate(self.fields):
+            values = [row[i] for row in batch]
+            if kind is str:
+                values = [None if value is None else str(value) for value in values]
+            columns[name] = values
+        table = pyarrow.table(columns, schema=self.schema())
+        if self.writer is None:
+            if not os.path.isdir(self.path):
+                os.makedirs(self.path)
+            parts = self.parts()
+            number = int(re.search(r'(\d+)', os.path.basename(parts[-1])).group(1)) + 1 if parts else 0
+            self.part = os.path.join(self.path, 'part-%05d' % number + ('.parquet' if self.format == 'parquet' else '.arrow'))
+            if self.format == 'parquet':
+                self.writer = pyarrow.parquet.ParquetWriter(self.part + '.tmp', table.schema)
+            else:
+                self.file = pyarrow.OSFile(self.part + '.tmp', 'wb')
+                self.writer = pyarrow.ipc.new_file(self.file, table.schema)
+        self.writer.write_table(table)
+        self.part_rows += len(batch)
+        if self.part_rows >= self.part_size:
+            self.close_part()
+
+    def schema(self):
+        types = {int: pyarrow.int64(), float: pyarrow.float64(), str: pyarrow.string()}
+        return pyarrow.schema([(name, types[kind]) for name, kind in self.fields])
+
+    def close_part(self):
+        """Closes the part being written and renames it, the next batch starts a new one"""
+        try:
+            self.writer.close()
+            if self.file is not None:
+                self.file.close()
+        finally:
+            self.file = None
+            self.writer = None
+        os.replace(self.part + '.tmp', self.part)
+        self.part_rows = 0
+
+    def close(self):
+        """Writes the rest of the batch, and renames the part being written when there is one"""
+        try:
+            self.flush()
+        finally:
+            if self.format == 'csv':
+                if self.file is not None:
+                    self.file.close()
+                self.file = None
+                self.writer = None
+            elif self.writer is not None:
+                self.close_part()
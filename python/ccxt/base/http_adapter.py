@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+"""A requests transport adapter that counts connections and handshake time"""
+
+import threading
+import time
+
+from requests.adapters import HTTPAdapter, DEFAULT_POOLSIZE
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+__all__ = [
+    'InstrumentedHTTPAdapter',
+    'TransportStats',
+    'transport_stats',
+]
+
+
+class TransportStats(dict):
+    """The counters of an instance, added to under a lock by the threads that share the instance"""
+
+    def __init__(self, *args, **kwargs):
+        super(TransportStats, self).__init__(*args, **kwargs)
+        self.lock = threading.Lock()
+
+    def __reduce__(self):
+        # copied and pickled without the lock
+        return TransportStats, (dict(self),)
+
+    def add(self, name, value):
+        with self.lock:
+            self[name] += value
+
+
+def transport_stats():
+    return TransportStats({
+        'requests': 0,
+        'connectionsOpened': 0,
+        'connectionsReused': 0,
+        'bytesIn': 0,
+        'bytesOut': 0,
+        'connectTime': 0.0,  # seconds spent establishing tcp connections
+        'tlsHandshakeTime': 0.0,  # seconds spent in tls handshakes on top of that
+    })
+
+
+def instrumented_pool(pool_class, connection_class, stats):
+
+    class Connection(connection_class):
+
+        tcp_time = 0.0
+
+        def _new_conn(self):
+            start = time.perf_counter()
+            sock = super(Connection, self)._new_conn()
+            self.tcp_time = time.perf_counter() - start
+            return sock
+
+        def connect(self):
+            start = time.perf_counter()
+            super(Connection, self).connect()
+            elapsed = time.perf_counter() - start
+            stats.add('connectTime', self.tcp_time)
+            if isinstance(self, HTTPSConnection):
+                stats.add('tlsHandshakeTime', max(elapsed - self.tcp_time, 0.0))
+
+    class Pool(pool_class):
+
+        ConnectionCls = Connection
+
+        def _new_conn(self):
+            stats.add('connectionsOpened', 1)
+            return super(Pool, self)._new_conn()
+
+        def _make_request(self, conn, *args, **kwargs):
+            if getattr(conn, 'sock', None) is not None:
+                stats.add('connectionsReused', 1)
+            return super(Pool, self)._make_request(conn, *args, **kwargs)
+
+    return Pool
+
+
+class InstrumentedHTTPAdapter(HTTPAdapter):
+    """Mounted on the sessions created by Exchange, fills the transport_stats of the instance"""
+
+    def __init__(self, stats=None, pool_connections=DEFAULT_POOLSIZE, pool_maxsize=DEFAULT_POOLSIZE, **kwargs):
+        self.stats = transport_stats() if stats is None else stats
+        super(InstrumentedHTTPAdapter, self).__init__(pool_connections=pool_connections, pool_maxsize=pool_maxsize, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super(InstrumentedHTTPAdapter, self).init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': instrumented_pool(HTTPConnectionPool, HTTPConnection, self.stats),
+            'https': instrumented_pool(HTTPSConnectionPool, HTTPSConnection, self.stats),
+        }
+
+    def __setstate__(self, state):
+        self.stats = transport_stats()
+        super(InstrumentedHTTPAdapter, self).__setstate__(state)
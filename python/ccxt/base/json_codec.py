@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+
+"""JSON encoders/decoders selectable per exchange instance with the jsonCodec property"""
+
+import json
+import re
+from decimal import Decimal
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+from ccxt.base.errors import NotSupported
+
+__all__ = [
+    'NumberString',
+    'get_json_codec',
+]
+
+
+class NumberString(str):
+    """A JSON number with a fraction or an exponent kept as its source text, see jsonNumbers = 'string'"""
+    pass
+
+
+# orjson turns the integers wider than 64 bits into floats, the inputs with a run of 20 digits, or of 19 after a minus
+# sign (below -2 ** 63), are left to the standard library
+digits = bytes(ord('0') if ord('0') <= i <= ord('9') else i if i == ord('-') else ord('.') for i in range(0, 256))
+wide_integer = b'0' * 20
+wide_negative_integer = b'-' + b'0' * 19
+# a run of 20 digits, or of a minus sign and 19 digits, has 5 of them in a row among every fourth character and the runs
+# of 16 digits and less never do, so the inputs with timestamps in milliseconds or microseconds are decided by a sample
+sampled_digits = bytes(ord('0') if ord('0') <= i <= ord('9') or i == ord('-') else ord('.') for i in range(0, 256))
+sampled_run = b'0' * 5
+
+# orjson writes the exponents of floats as 1e-7 and 1e16, the standard library as 1e-07 and 1e+16
+exponent = re.compile('[0-9]e[-0-9]')
+
+
+def exact(input):
+    """True if a fast decoder is guaranteed to return the same numbers as the standard library"""
+    sample = input[::4]
+    if not isinstance(sample, bytes):
+        sample = sample.encode('utf-8', 'surrogatepass')
+    if sampled_run not in sample.translate(sampled_digits):
+        return True
+    if not isinstance(input, bytes):
+        input = input.encode('utf-8', 'surrogatepass')
+    input = input.translate(digits)
+    return wide_integer not in input and wide_negative_integer not in input
+
+
+class JsonCodec(object):
+    """The standard library codec, the only one honouring the jsonNumbers option"""
+
+    name = 'json'
+
+    def __init__(self, parse_float=None):
+        self.parse_float = parse_float
+
+    def loads(self, input):
+        return json.loads(input, parse_float=self.parse_float)
+
+    def dumps(self, data, params=None):
+        return json.dumps(data, separators=(',', ':'))
+
+
+class OrjsonCodec(JsonCodec):
+
+    name = 'orjson'
+
+    def loads(self, input):
+        if self.parse_float is not None or not exact(input):
+            return super(OrjsonCodec, self).loads(input)
+        try:
+            return orjson.loads(input)
+        except orjson.JSONDecodeError:
+            # NaN and Infinity are left to the standard library
+            return super(OrjsonCodec, self).loads(input)
+
+    def dumps(self, data, params=None):
+        try:
+            result = orjson.dumps(data).decode('utf-8')
+        except TypeError:
+            return super(OrjsonCodec, self).dumps(data)
+        # request bodies are latin-1 encoded for signing, escape the rest like the standard library does
+        if not result.isascii() or exponent.search(result):
+            return super(OrjsonCodec, self).dumps(data)
+        return result
+
+
+class UjsonCodec(JsonCodec):
+
+    name = 'ujson'
+
+    def loads(self, input):
+        if self.parse_float is not None or not exact(input):
+            return super(UjsonCodec, self).loads(input)
+        try:
+            return ujson.loads(input)
+        except (ValueError, OverflowError):
+            return super(UjsonCodec, self).loads(input)
+
+    def dumps(self, data, params=None):
+        try:
+            return ujson.dumps(data, ensure_ascii=True, escape_forward_slashes=False)
+        except (TypeError, OverflowError):
+            return super(UjsonCodec, self).dumps(data)
+
+
+class SimdjsonCodec(JsonCodec):
+    """Decodes with simdjson, encodes with the standard library"""
+
+    name = 'simdjson'
+
+    def loads(self, input):
+        if self.parse_float is not None or not exact(input):
+            return super(SimdjsonCodec, self).loads(input)
+        try:
+            return simdjson.loads(input)
+        except ValueError:
+            return super(SimdjsonCodec, self).loads(input)
+
+
+codecs = {
+    'json': JsonCodec,
+    'orjson': OrjsonCodec if orjson else None,
+    'ujson': UjsonCodec if ujson else None,
+    'simdjson': SimdjsonCodec if simdjson else None,
+}
+
+# 'auto' picks the first one installed, ujson is left out as it trades float precision for speed
+preferred = ['orjson', 'simdjson', 'json']
+
+numbers = {
+    None: None,
+    'float': None,
+    'string': NumberString,
+    'decimal': Decimal,
+}
+
+instances = {}
+
+
+def get_json_codec(name='json', json_numbers=None):
+    """Returns a shared codec instance, name is one of json, orjson, ujson, simdjson or auto"""
+    key = (name, json_numbers)
+    if key not in instances:
+        if name == 'auto':
+            name = next(codec for codec in preferred if codecs[codec] is not None)
+        if name not in codecs:
+            raise NotSupported('jsonCodec ' + str(name) + ' is not supported, use one of ' + ', '.join(list(codecs.keys()) + ['auto']))
+        if codecs[name] is None:
+            raise NotSupported('jsonCodec ' + name + ' requires the ' + name + ' package, install it with `pip install ' + name + '`')
+        if json_numbers not in numbers:
+            raise NotSupported('jsonNumbers ' + str(json_numbers) + ' is not supported, use float, string or decimal')
+        instances[key] = codecs[name](numbers[json_numbers])
+    return instances[key]
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+"""Deferred imports of the exchange modules and of the heavy dependencies"""
+
+import importlib
+import types
+
+__all__ = [
+    'LazyExchanges',
+    'LazyModule',
+]
+
+
+class LazyModule(object):
+    """Stands in for a module that is imported on first attribute access"""
+
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def __getattr__(self, attribute):
+        module = self.__dict__['_module']
+        if module is None:
+            module = self.__dict__['_module'] = importlib.import_module(self._name)
+        return getattr(module, attribute)
+
+    def __repr__(self):
+        return '<lazy module ' + repr(self._name) + '>'
+
+
+class LazyExchanges(types.ModuleType):
+    """The class of the ccxt and ccxt.async_support packages
+
+    The exchange classes listed in the exchanges attribute of the package are
+    imported on first access to ccxt.<id> or on `from ccxt import <id>`.
+    """
+
+    def __getattr__(self, name):
+        if name in self.__dict__.get('exchanges', ()):
+            exchange = getattr(importlib.import_module(self.__name__ + '.' + name), name)
+            setattr(self, name, exchange)
+            return exchange
+        raise AttributeError('module ' + repr(self.__name__) + ' has no attribute ' + repr(name))
+
+    def __setattr__(self, name, value):
+        # importing the ccxt.<id> module binds it to the package, bind the exchange class instead
+        if isinstance(value, types.ModuleType) and value.__name__ == self.__name__ + '.' + name and name in self.__dict__.get('exchanges', ()):
+            value = getattr(value, name)
+        super(LazyExchanges, self).__setattr__(name, value)
+
+    def __dir__(self):
+        return sorted(set(super(LazyExchanges, self).__dir__()) | set(self.__dict__.get('exchanges', ())))
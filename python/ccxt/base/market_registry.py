@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+
+"""The markets and currencies indexed by set_markets, shared by the instances that load the same markets"""
+
+import hashlib
+import pickle
+import sys
+import weakref
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+__all__ = [
+    'FrozenDict',
+    'MarketRegistry',
+    'registries',
+]
+
+# the registries stay alive while an instance uses them
+registries = weakref.WeakValueDictionary()
+
+interned_keys = ('id', 'symbol', 'base', 'quote', 'settle', 'baseId', 'quoteId', 'settleId', 'type')
+
+
+class FrozenDict(dict):
+    """A dict shared by many markets, changing it in one market would change it in all of them"""
+
+    __slots__ = ()
+
+    def read_only(self, *args, **kwargs):
+        raise TypeError('the precision and limits of shared markets are read-only, copy them with dict() to change them')
+
+    __setitem__ = __delitem__ = __ior__ = clear = pop = popitem = setdefault = update = read_only
+
+    def __reduce__(self):
+        # the copies and the pickles are plain dicts
+        return dict, (dict(self),)
+
+
+def intern_flat(pool, value):
+    if type(value) is not dict:
+        return value
+    try:
+        # the types tell 8 from 8.0 and 1 from True
+        key = (tuple(value.items()), tuple(map(type, value.values())))
+    except TypeError:  # unhashable values
+        return value
+    shared = pool.get(key)
+    if shared is None:
+        shared = pool[key] = FrozenDict(value)
+    return shared
+
+
+class MarketRegistry(object):
+    """The result of one set_markets, the dicts are read-only once the registry is shared"""
+
+    __slots__ = (
+        'markets',
+        'markets_by_id',
+        'symbols',
+        'ids',
+        'currencies',
+        'currencies_by_id',
+        'base_currencies',
+        'quote_currencies',
+        'source_currencies',
+        'changes',
+        'defaults',
+        '__weakref__',
+    )
+
+    def __init__(self):
+        for name in MarketRegistry.__slots__[:-1]:
+            setattr(self, name, None)
+
+    @staticmethod
+    def fingerprint(*args):
+        """A digest of everything set_markets depends on, None if it cannot be serialized, computed once per load instead of keeping the markets to compare"""
+        data = None
+        if orjson is not None:
+            try:
+                data = orjson.dumps(args, option=orjson.OPT_NON_STR_KEYS)
+            except TypeError:
+                pass
+        if data is None:
+            try:
+                data = pickle.dumps(args, pickle.HIGHEST_PROTOCOL)
+            except (pickle.PicklingError, TypeError, AttributeError):
+                return None
+        return hashlib.sha1(data).hexdigest()
+
+    @staticmethod
+    def diff(old, new, reuse=False):
+        """The markets added, removed and changed by symbol, reuse puts the unchanged old markets into new"""
+        added = {}
+        changed = {}
+        for symbol, market in new.items():
+            existing = old.get(symbol)
+            if existing is None:
+                added[symbol] = market
+            elif existing is not market:
+                if existing == market:
+                    if reuse:
+                        new[symbol] = existing
+                else:
+                    changed[symbol] = market
+        removed = {symbol: market for symbol, market in old.items() if symbol not in new}
+        return {'added': added, 'removed': removed, 'changed': changed}
+
+    @staticmethod
+    def intern(markets):
+        """Replaces the equal precision and limits structures and the codes of the markets with one shared read-only copy"""
+        pool = {}
+        limits_pool = {}
+        for market in markets:
+            precision = market.get('precision')
+            if type(precision) is dict:
+                market['precision'] = intern_flat(pool, precision)
+            limits = market.get('limits')
+            if type(limits) is dict:
+                limits = {key: intern_flat(pool, value) for key, value in limits.items()}
+                key = tuple([(key, id(value)) for key, value in limits.items()])
+                shared = limits_pool.get(key)
+                if shared is None:
+                    shared = limits_pool[key] = FrozenDict(limits)
+                market['limits'] = shared
+            for key in interned_keys:
+                value = market.get(key)
+                if type(value) is str:
+                    market[key] = sys.intern(value)
+        return markets
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+"""A file cache of the loaded markets and currencies shared by the processes of one machine"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+import zlib
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # not available on Windows, the cache is then used without locking
+
+__all__ = [
+    'MarketsCache',
+    'default_markets_cache_directory',
+]
+
+
+def default_markets_cache_directory():
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'ccxt', 'markets')
+
+
+class MarketsCache(object):
+    """One zlib-compressed json file per exchange id and settings
+
+    The file name is derived from a hash of the key, so that instances with
+    different options, urls (sandbox mode) or library versions do not share
+    their markets. Writes go through a temporary file and os.replace, so the
+    readers never see a partial file, and the refresh is serialized with an
+    flock on a lock file next to it.
+    """
+
+    def __init__(self, directory, id, key, ttl, codec=None):
+        digest = hashlib.sha256(json.dumps(key, sort_keys=True, default=str).encode()).hexdigest()[:16]
+        self.directory = directory
+        self.path = os.path.join(directory, id + '-' + digest + '.json.z')
+        self.ttl = ttl  # milliseconds
+        self.codec = codec
+        self.fd = None
+
+    def loads(self, data):
+        return self.codec.loads(data) if self.codec else json.loads(data)
+
+    def dumps(self, data):
+        return self.codec.dumps(data) if self.codec else json.dumps(data, separators=(',', ':'))
+
+    def read(self):
+        """Returns the cached {'markets', 'currencies', 'timestamp', 'fresh'} or None"""
+        try:
+            with open(self.path, 'rb') as file:
+                data = self.loads(zlib.decompress(file.read()))
+        except (IOError, OSError, ValueError, zlib.error):
+            return None
+        if not isinstance(data, dict) or 'markets' not in data:
+            return None
+        data['fresh'] = time.time() * 1000 - data.get('timestamp', 0) < self.ttl
+        return data
+
+    def write(self, markets, currencies=None):
+        """Stores the markets atomically, returns False if they cannot be serialized"""
+        try:
+            data = self.dumps({
+                'timestamp': int(time.time() * 1000),
+                'markets': markets,
+                'currencies': currencies,
+            })
+        except (TypeError, ValueError):
+            return False
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory, 0o700)
+        fd, temporary = tempfile.mkstemp(dir=self.directory, prefix='.' + os.path.basename(self.path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(zlib.compress(data.encode('utf-8'), 6))
+            os.replace(temporary, self.path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+        return True
+
+    def lock(self, blocking=True):
+        """Takes the refresh lock, returns False if another process holds it and blocking is off"""
+        if fcntl is None:
+            return True
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory, 0o700)
+        self.fd = os.open(self.path + '.lock', os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(self.fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except (IOError, OSError):
+            os.close(self.fd)
+            self.fd = None
+            return False
+        return True
+
+    def unlock(self):
+        if self.fd is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+            os.close(self.fd)
+            self.fd = None
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+
+"""Candles by column, NumPy arrays when NumPy is installed and lists otherwise"""
+
+import calendar
+import datetime
+import itertools
+import operator
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from ccxt.base.errors import NotSupported
+
+__all__ = [
+    'ohlcv_fields',
+    'ohlcv_columns',
+    'ohlcv_array',
+    'ohlcv_rows',
+    'build_ohlcvc_columns',
+    'resample_ohlcv_columns',
+]
+
+ohlcv_fields = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+
+# the epoch is a Thursday, the candles of weeks open on Mondays
+epoch = datetime.datetime(1970, 1, 1)
+week = 7 * 24 * 60 * 60 * 1000
+monday = 4 * 24 * 60 * 60 * 1000
+
+if numpy is not None:
+    ohlcv_dtype = numpy.dtype([('timestamp', numpy.int64)] + [(field, numpy.float64) for field in ohlcv_fields[1:]])
+
+
+def ohlcv_columns(ohlcvs):
+    """The columns of a list of candles, of a structured array or of columns, a missing value is nan with NumPy
+
+    The candles without a timestamp are dropped.
+    """
+    if numpy is None:
+        if isinstance(ohlcvs, dict):
+            columns = ohlcvs
+        else:
+            columns = {field: [ohlcv[i] for ohlcv in ohlcvs] for i, field in enumerate(ohlcv_fields)}
+        if any(timestamp is None for timestamp in columns['timestamp']):
+            kept = [i for i, timestamp in enumerate(columns['timestamp']) if timestamp is not None]
+            columns = {field: [column[i] for i in kept] for field, column in columns.items()}
+        return columns
+    if isinstance(ohlcvs, numpy.ndarray) and ohlcvs.dtype.names:
+        return {field: ohlcvs[field] for field in ohlcvs.dtype.names}
+    if isinstance(ohlcvs, dict):
+        columns = {field: numpy.asarray(column, dtype=numpy.int64 if field == 'count' else numpy.float64) for field, column in ohlcvs.items()}
+        timestamps = numpy.asarray(ohlcvs['timestamp'])
+        if timestamps.dtype.kind in 'iu':
+            columns['timestamp'] = timestamps.astype(numpy.int64)
+    else:
+        if not len(ohlcvs):
+            values = numpy.empty((6, 0), dtype=numpy.float64)
+        else:
+            try:
+                values = numpy.array(ohlcvs, dtype=numpy.float64)
+            except ValueError:  # the candles of some exchanges have more than six values
+                values = numpy.array([ohlcv[0:6] for ohlcv in ohlcvs], dtype=numpy.float64)
+            values = values[:, 0:6].T.copy()
+        columns = dict(zip(ohlcv_fields, values))
+    timestamps = columns['timestamp']
+    if timestamps.dtype.kind == 'f':
+        missing = numpy.isnan(timestamps)
+        if missing.any():
+            columns = {field: column[~missing] for field, column in columns.items()}
+        # the timestamps in milliseconds are exact in a double
+        columns['timestamp'] = columns['timestamp'].astype(numpy.int64)
+    return columns
+
+
+def ohlcv_array(ohlcvs):
+    """The candles as a structured NumPy array with the fields of ohlcv_fields"""
+    if numpy is None:
+        raise NotSupported('ohlcv_array() requires NumPy, use ohlcv_columns() without it')
+    if isinstance(ohlcvs, numpy.ndarray) and ohlcvs.dtype.names:
+        return ohlcvs
+    columns = ohlcv_columns(ohlcvs)
+    array = numpy.empty(len(columns['timestamp']), dtype=ohlcv_dtype)
+    for field in ohlcv_fields:
+        array[field] = columns[field]
+    return array
+
+
+def ohlcv_rows(columns):
+    """The list of candles of columns, the inverse of ohlcv_columns()"""
+    fields = [field for field in ohlcv_fields + ('count',) if field in columns]
+    if numpy is not None:
+        values = []
+        for field in fields:
+            column = numpy.asarray(columns[field])
+            if column.dtype.kind == 'f' and numpy.isnan(column).any():
+                column = numpy.where(numpy.isnan(column), None, column)
+            values.append(column.tolist())
+        return [list(row) for row in zip(*values)]
+    return [list(row) for row in zip(*[columns[field] for field in fields])]
+
+
+def timeframe_months(timeframe):
+    """The number of months of a timeframe of months or years, None for the shorter ones"""
+    unit = timeframe[-1]
+    if unit == 'M':
+        return int(timeframe[0:-1])
+    if unit == 'y':
+        return int(timeframe[0:-1]) * 12
+    return None
+
+
+def candle_openings(timestamps, ms, months=None):
+    """The opening time of the candle of each timestamp, in UTC
+
+    The candles of months start on the first day of a month and those of weeks on a Monday, the others are
+    aligned to the epoch, which is a Thursday.
+    """
+    if months:
+        if numpy is not None:
+            opened = numpy.asarray(timestamps).astype('datetime64[ms]').astype('datetime64[M]').astype(numpy.int64) // months * months
+            return opened.astype('datetime64[M]').astype('datetime64[ms]').astype(numpy.int64)
+        result = []
+        for timestamp in timestamps:
+            date = epoch + datetime.timedelta(milliseconds=timestamp)
+            opened = ((date.year - 1970) * 12 + date.month - 1) // months * months
+            result.append(calendar.timegm((1970 + opened // 12, opened % 12 + 1, 1, 0, 0, 0)) * 1000)
+        return result
+    if ms % week == 0:
+        if numpy is not None:
+            return (timestamps - monday) // ms * ms + monday
+        return [(timestamp - monday) // ms * ms + monday for timestamp in timestamps]
+    if numpy is not None:
+        return timestamps // ms * ms
+    return [timestamp // ms * ms for timestamp in timestamps]
+
+
+def group_starts(openings):
+    """The index of the first value of each run of equal values"""
+    if numpy is not None:
+        return numpy.flatnonzero(numpy.concatenate((numpy.ones(min(len(openings), 1), dtype=bool), openings[1:] != openings[:-1])))
+    return [i for i in range(0, len(openings)) if i == 0 or openings[i] != openings[i - 1]]
+
+
+def sort_columns(columns, key='timestamp'):
+    keys = columns[key]
+    if numpy is not None:
+        if len(keys) and not numpy.all(keys[1:] >= keys[:-1]):
+            order = numpy.argsort(keys, kind='stable')
+            return {field: column[order] for field, column in columns.items()}
+        return columns
+    if all(map(operator.le, keys, itertools.islice(keys, 1, None))):
+        return columns
+    order = sorted(range(0, len(keys)), key=keys.__getitem__)
+    return {field: [column[i] for i in order] for field, column in columns.items()}
+
+
+def build_ohlcvc_columns(timestamps, prices, amounts, ms, months=None):
+    """The candles of ms milliseconds or of months of trades, with the count of trades of each candle"""
+    if numpy is not None:
+        trades = sort_columns({
+            'timestamp': numpy.asarray(timestamps, dtype=numpy.int64),
+            'price': numpy.asarray(prices, dtype=numpy.float64),
+            'amount': numpy.asarray(amounts, dtype=numpy.float64),
+        })
+        openings = candle_openings(trades['timestamp'], ms, months)
+        starts = group_starts(openings)
+        if not len(starts):
+            return dict(ohlcv_columns([]), count=numpy.empty(0, dtype=numpy.int64))
+        prices = trades['price']
+        ends = numpy.append(starts[1:], len(prices))
+        return {
+            'timestamp': openings[starts],
+            'open': prices[starts],
+            'high': numpy.maximum.reduceat(prices, starts),
+            'low': numpy.minimum.reduceat(prices, starts),
+            'close': prices[ends - 1],
+            'volume': numpy.add.reduceat(trades['amount'], starts),
+            'count': ends - starts,
+        }
+    trades = sort_columns({'timestamp': list(timestamps), 'price': list(prices), 'amount': list(amounts)})
+    openings = candle_openings(trades['timestamp'], ms, months)
+    starts = group_starts(openings)
+    columns = {field: [] for field in ohlcv_fields + ('count',)}
+    for start, end in zip(starts, starts[1:] + [len(openings)]):
+        prices = trades['price'][start:end]
+        columns['timestamp'].append(openings[start])
+        columns['open'].append(prices[0])
+        columns['high'].append(max(prices))
+        columns['low'].append(min(prices))
+        columns['close'].append(prices[-1])
+        columns['volume'].append(sum(trades['amount'][start:end]))
+        columns['count'].append(end - start)
+    return columns
+
+
+def resample_ohlcv_columns(columns, ms, months=None):
+    """The candles of ms milliseconds or of months of shorter candles, the missing highs, lows and volumes are skipped"""
+    columns = sort_columns(ohlcv_columns(columns))
+    if numpy is not None:
+        timestamps = columns['timestamp']
+        openings = candle_openings(timestamps, ms, months)
+        starts = group_starts(openings)
+        if not len(starts):
+            return {field: column[0:0] for field, column in columns.items()}
+        ends = numpy.append(starts[1:], len(timestamps))
+        result = {
+            'timestamp': openings[starts],
+            'open': columns['open'][starts],
+            # fmax and fmin skip nan unless all the values are nan
+            'high': numpy.fmax.reduceat(columns['high'], starts),
+            'low': numpy.fmin.reduceat(columns['low'], starts),
+            'close': columns['close'][ends - 1],
+            'volume': numpy.add.reduceat(numpy.nan_to_num(columns['volume']), starts),
+        }
+        if 'count' in columns:
+            result['count'] = numpy.add.reduceat(columns['count'], starts)
+        return result
+    openings = candle_openings(columns['timestamp'], ms, months)
+    starts = group_starts(openings)
+    result = {field: [] for field in columns}
+    for start, end in zip(starts, starts[1:] + [len(openings)]):
+        highs = [high for high in columns['high'][start:end] if high is not None]
+        lows = [low for low in columns['low'][start:end] if low is not None]
+        result['timestamp'].append(openings[start])
+        result['open'].append(columns['open'][start])
+        result['high'].append(max(highs) if highs else None)
+        result['low'].append(min(lows) if lows else None)
+        result['close'].append(columns['close'][end - 1])
+        result['volume'].append(sum(volume for volume in columns['volume'][start:end] if volume is not None))
+        if 'count' in columns:
+            result['count'].append(sum(columns['count'][start:end]))
+    return result
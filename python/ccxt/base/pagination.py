@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+
+"""The cursors of the paginated history of fetch_ohlcv, fetch_trades and fetch_my_trades"""
+
+import json
+
+__all__ = [
+    'Pagination',
+    'paginations',
+]
+
+# how the exchanges page their history, by exchange id and method, the default is {'strategy': 'since'},
+# an exchange overrides them with options['paginate'][method]
+#
+#   'since'   the timestamp of the last item is the since of the next page, an empty page of a
+#             'window' (in milliseconds) moves to the next window instead of ending the history
+#   'id'      the id of the last item is the params[key] of the next page
+#   'offset'  the count of the items fetched so far is the params[key] of the next page
+#   'end'     backwards from the most recent items, the timestamp of the first item times 'scale' is the
+#             params[key] of the next page
+paginations = {
+    'binance': {
+        'fetch_trades': {'strategy': 'since', 'window': 3600000},  # aggTrades are fetched by the hour
+        'fetch_my_trades': {'strategy': 'id', 'key': 'fromId'},
+    },
+    'kraken': {
+        'fetch_my_trades': {'strategy': 'offset', 'key': 'ofs'},
+    },
+    'poloniex': {
+        'fetch_trades': {'strategy': 'end', 'key': 'end', 'scale': 0.001},  # in seconds
+    },
+}
+
+
+class Pagination(object):
+    """The cursor of one history, request() is the arguments of the next page, advance() takes the page"""
+
+    def __init__(self, exchange, method, symbol=None, since=None, until=None, limit=None, params={}, timeframe='1m'):
+        self.exchange = exchange
+        self.method = method
+        self.symbol = symbol
+        self.since = since
+        self.until = until
+        self.limit = limit
+        self.params = params
+        self.timeframe = timeframe
+        self.ohlcv = method == 'fetch_ohlcv'
+        self.duration = exchange.parse_timeframe(timeframe) * 1000 if self.ohlcv else None
+        config = exchange.safe_value(exchange.safe_value(exchange.options, 'paginate', {}), method)
+        if config is None:
+            config = exchange.safe_value(paginations.get(exchange.id, {}), method, {})
+        self.strategy = exchange.safe_string(config, 'strategy', 'since')
+        self.key = exchange.safe_string(config, 'key')
+        self.scale = exchange.safe_value(config, 'scale', 1)
+        self.window = exchange.safe_integer(config, 'window')
+        if self.until is None and self.window:
+            self.until = exchange.milliseconds()
+        self.cursor = None
+        self.count = 0
+        self.done = False
+        self.seen = set()
+
+    def resume(self, last, keys, count):
+        """Continues a history from its last item, the keys of the items of its last timestamp and its count of items"""
+        self.seen = set(keys)
+        self.count = count
+        strategy = self.strategy
+        if strategy == 'since':
+            if self.ohlcv:
+                self.cursor = last['timestamp'] + self.duration
+            elif last.get('id') is not None:
+                self.cursor = last['timestamp']
+            else:
+                # the items without ids of the same millisecond cannot be told apart
+                self.cursor = last['timestamp'] + 1
+        elif strategy == 'id':
+            self.cursor = last['id']
+        elif strategy == 'offset':
+            self.cursor = count
+        elif strategy == 'end':
+            self.cursor = int(last['timestamp'] * self.scale)
+
+    def request(self):
+        """The (since, limit, params) of the next page, None when the history is complete"""
+        if self.done:
+            return None
+        params = self.params
+        since = self.since
+        if self.cursor is not None:
+            if self.strategy in ('id', 'offset', 'end'):
+                params = dict(params, **{self.key: self.cursor})
+                since = None if self.strategy == 'id' else since
+            else:
+                since = self.cursor
+        return since, self.limit, params
+
+    def fetch(self):
+        """The new items of the next page, None when the history is complete"""
+        request = self.request()
+        if request is None:
+            return None
+        since, limit, params = request
+        page = getattr(self.exchange, self.method)(*self.arguments(since, limit, params))
+        return self.advance(page)
+
+    def arguments(self, since, limit, params):
+        if self.ohlcv:
+            return self.symbol, self.timeframe, since, limit, params
+        return self.symbol, since, limit, params
+
+    def timestamp(self, item):
+        return item[0] if self.ohlcv else item['timestamp']
+
+    def identify(self, item):
+        """The key that tells the repeated items of overlapping pages"""
+        if self.ohlcv:
+            return item[0]
+        if item.get('id') is not None:
+            return item['id']
+        # the exchanges without trade ids, like kraken
+        return item['timestamp'], json.dumps(item.get('info'), sort_keys=True, default=str)
+
+    def filter(self, page):
+        """The items of the page not seen before, within since and until"""
+        fresh = []
+        # the pages overlap with the previous page only, the keys of the older ones are forgotten
+        # to keep the memory of a long history bounded
+        seen = self.seen
+        keys = set()
+        for item in page:
+            key = self.identify(item)
+            if key in keys:
+                continue
+            keys.add(key)
+            if key in seen:
+                continue
+            timestamp = self.timestamp(item)
+            if timestamp is not None:
+                if self.until is not None and timestamp >= self.until:
+                    continue
+                if self.since is not None and timestamp < self.since:
+                    continue
+            fresh.append(item)
+        if page:
+            self.seen = keys
+        return fresh
+
+    def windows(self):
+        """The disjoint (since, until) windows of the history to fetch concurrently, None if they are unknown"""
+        if self.strategy != 'since' or self.since is None or self.until is None:
+            return None
+        window = self.window
+        if window is None and self.ohlcv and self.limit:
+            window = self.limit * self.duration
+        if not window:
+            return None
+        return [(start, min(start + window, self.until)) for start in range(self.since, self.until, window)]
+
+    def advance(self, page):
+        """Moves the cursor past the page and returns its new items"""
+        page = page or []
+        fresh = self.filter(page)
+        timestamps = [self.timestamp(item) for item in page if self.timestamp(item) is not None]
+        strategy = self.strategy
+        if not page:
+            if strategy == 'since' and self.window and self.until is not None:
+                start = self.cursor if self.cursor is not None else self.since
+                if start is not None and start + self.window < self.until:
+                    # no items in this window, the next may have some
+                    self.cursor = start + self.window
+                    return fresh
+            self.done = True
+        elif strategy == 'since':
+            last = max(timestamps) if timestamps else None
+            if last is None or (self.until is not None and last >= self.until):
+                self.done = True
+            elif self.cursor is not None and last < self.cursor:
+                # the exchange does not page by since
+                self.done = True
+            elif self.ohlcv:
+                self.cursor = last + self.duration
+            elif fresh:
+                # the last millisecond again, its other items may be on the next page
+                self.cursor = last
+            else:
+                self.cursor = last + 1
+        elif not fresh:
+            self.done = True
+        elif strategy == 'id':
+            self.cursor = page[-1]['id']
+            if timestamps and self.until is not None and max(timestamps) >= self.until:
+                self.done = True
+        elif strategy == 'offset':
+            self.count += len(page)
+            self.cursor = self.count
+        elif strategy == 'end':
+            first = min(timestamps) if timestamps else None
+            if first is None or (self.since is not None and first < self.since):
+                self.done = True
+            else:
+                self.cursor = int(first * self.scale)
+        else:
+            self.done = True
+        return fresh
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+"""The keyed HMAC contexts, the loaded private keys and the decoded credentials of an exchange, kept between the requests it signs"""
+
+import base64
+import hashlib
+import hmac
+import json
+
+from ccxt.base.lazy import LazyModule
+
+# eddsa signing
+try:
+    import axolotl_curve25519 as eddsa
+except ImportError:
+    eddsa = None
+
+# rsa signing, imported on first use
+backends = LazyModule('cryptography.hazmat.backends')
+hashes = LazyModule('cryptography.hazmat.primitives.hashes')
+padding = LazyModule('cryptography.hazmat.primitives.asymmetric.padding')
+serialization = LazyModule('cryptography.hazmat.primitives.serialization')
+
+__all__ = [
+    'Signer',
+]
+
+
+def base64urlencode(s):
+    return base64.urlsafe_b64encode(s).decode('latin-1').replace('=', '')
+
+
+class Signer(object):
+    """The hmac, jwt, rsa, eddsa and the decoders of the credentials of an exchange instance
+
+    A context is an HMAC of a secret that has hashed its padded key already, the signature of a
+    request is a copy of it updated with the request. The contexts and the private keys are keyed
+    by their secrets and the decoded credentials are those of the credentials of the exchange, so
+    the signatures are those of the static methods of Exchange. check() drops them all when the
+    credentials of the exchange change.
+    """
+
+    jwt_algorithms = {
+        'HS256': hashlib.sha256,
+        'HS384': hashlib.sha384,
+        'HS512': hashlib.sha512,
+    }
+
+    rsa_algorithms = {
+        'RS256': 'SHA256',
+        'RS384': 'SHA384',
+        'RS512': 'SHA512',
+    }
+
+    def __init__(self, codec, size=16):
+        # the class with the base58 codec of the static methods, Exchange
+        self.codec = codec
+        self.size = size
+        self.contexts = {}
+        self.keys = {}
+        self.headers = {}
+        self.decoded = {}
+        self.secret = None
+        self.apiKey = None
+
+    def check(self, secret, apiKey=None):
+        """Forgets the keys and the decoded credentials of the previous credentials when the exchange has new ones"""
+        if secret is not self.secret or apiKey is not self.apiKey:
+            self.contexts.clear()
+            self.keys.clear()
+            self.decoded.clear()
+            self.secret = secret
+            self.apiKey = apiKey
+
+    def cached(self, cache, key, load):
+        value = cache.get(key)
+        if value is None:
+            if len(cache) >= self.size:
+                cache.clear()
+            value = cache[key] = load()
+        return value
+
+    def hmac(self, request, secret, algorithm=hashlib.sha256, digest='hex'):
+        context = self.contexts.get((secret, algorithm))
+        if context is None:
+            context = self.cached(self.contexts, (secret, algorithm), lambda: hmac.new(secret, None, algorithm))
+        h = context.copy()
+        h.update(request)
+        binary = h.digest()
+        if digest == 'hex':
+            return base64.b16encode(binary).decode('latin-1').lower()
+        elif digest == 'base64':
+            return base64.standard_b64encode(binary).decode('latin-1')
+        return binary
+
+    def jwt(self, request, secret, alg='HS256'):
+        # the encoded header of each algorithm is the same for all the tokens
+        encoded_header = self.headers.get(alg)
+        if encoded_header is None:
+            encoded_header = self.headers[alg] = base64urlencode(json.dumps({'alg': alg, 'typ': 'JWT'}, separators=(',', ':')).encode('latin-1'))
+        encoded_data = base64urlencode(json.dumps(request, separators=(',', ':')).encode('latin-1'))
+        token = encoded_header + '.' + encoded_data
+        if alg[:2] == 'RS':
+            signature = self.rsa(token, secret, alg)
+        else:
+            signature = self.hmac(token.encode('latin-1'), secret, self.jwt_algorithms[alg], 'binary')
+        return token + '.' + base64urlencode(signature)
+
+    def rsa(self, request, secret, alg='RS256'):
+        algorithm = getattr(hashes, self.rsa_algorithms[alg])()
+        key = self.cached(self.keys, ('rsa', secret), lambda: serialization.load_pem_private_key(secret, None, backends.default_backend()))
+        return key.sign(request.encode('latin-1'), padding.PKCS1v15(), algorithm)
+
+    def eddsa(self, request, secret, curve='ed25519'):
+        random = b'\x00' * 64
+        request = base64.b16decode(request, casefold=True)
+        key = self.cached(self.keys, ('eddsa', secret), lambda: base64.b16decode(secret, casefold=True))
+        signature = eddsa.calculateSignature(random, key, request)
+        return self.codec.binary_to_base58(signature)
+
+    def decode(self, s, name, decode):
+        if s is not None and (s is self.secret or s is self.apiKey):
+            return self.cached(self.decoded, (name, s), lambda: decode(s))
+        return decode(s)
+
+    def base64_to_binary(self, s):
+        return self.decode(s, 'base64', base64.standard_b64decode)
+
+    def base58_to_binary(self, s):
+        return self.decode(s, 'base58', self.codec.base58_to_binary)
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+
+"""Token buckets shared by the sync and the async rate limiters"""
+
+import math
+import os
+import struct
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # not available on Windows
+
+from ccxt.base.errors import NotSupported
+
+__all__ = [
+    'TokenBucket',
+    'FileTokenBucket',
+    'shared_token_bucket',
+]
+
+
+class TokenBucket(object):
+    """A thread-safe in-process token bucket
+
+    The config follows Exchange.tokenBucket: refillRate is in tokens per
+    millisecond, a request is let through while the bucket is positive and
+    then charged its cost, so the bucket may go below zero.
+    """
+
+    clock = staticmethod(time.monotonic)
+
+    def __init__(self, config={}):
+        self.refillRate = config.get('refillRate', 0.001)
+        self.capacity = config.get('capacity', 1.0)
+        self.defaultCost = config.get('defaultCost', 1.0)
+        self.lock = threading.Lock()
+        self.tokens = 0.0
+        self.timestamp = self.clock()
+
+    def unlimited(self):
+        return not self.refillRate or math.isinf(self.refillRate)
+
+    def refill(self, tokens, timestamp, now):
+        return min(self.capacity, tokens + (now - timestamp) * self.refillRate * 1000)
+
+    def consume(self, tokens, cost):
+        """Returns the new amount of tokens and the seconds to wait, zero if the cost was charged"""
+        if tokens > 0:
+            return tokens - cost, 0.0
+        return tokens, max(-tokens / (self.refillRate * 1000), 1e-6)
+
+    def transaction(self, update):
+        """Refills the bucket and replaces its tokens with update(tokens) → (tokens, result) atomically"""
+        with self.lock:
+            now = self.clock()
+            self.tokens, result = update(self.refill(self.tokens, self.timestamp, now))
+            self.timestamp = now
+        return result
+
+    def take(self, cost=None):
+        """Charges the bucket if it is positive, otherwise returns the seconds until it will be"""
+        if self.unlimited():
+            return 0.0
+        cost = self.defaultCost if cost is None else cost
+        return self.transaction(lambda tokens: self.consume(tokens, cost))
+
+    def sync(self, tokens, refill_rate=None, capacity=None, hold=None):
+        """Overwrites the local estimate with the budget reported by the exchange
+
+        The capacity is the budget of the window, the bucket grows to the budgets reported without one,
+        hold is the seconds until a window that is used up resets, nothing goes through before.
+        """
+        if refill_rate is not None:
+            self.refillRate = refill_rate
+        if self.unlimited():
+            return
+        self.capacity = capacity if capacity is not None else max(self.capacity, tokens)
+        tokens = min(self.capacity, tokens)
+        if hold:
+            tokens = min(tokens, -hold * self.refillRate * 1000)
+        return self.transaction(lambda current: (tokens, None))
+
+    def set_refill_rate(self, refill_rate):
+        """Changes the rate, the tokens refilled until now are counted at the former rate"""
+        def update(tokens):
+            self.refillRate = refill_rate
+            return tokens, None
+        return self.transaction(update)
+
+    def pause(self, seconds):
+        """Drains the bucket so that nothing goes through for the given number of seconds"""
+        if self.unlimited():
+            return
+        deficit = -seconds * self.refillRate * 1000
+        return self.transaction(lambda tokens: (min(tokens, deficit), None))
+
+
+class FileTokenBucket(TokenBucket):
+    """A token bucket stored in a file and guarded with flock, shared by the processes of one machine"""
+
+    clock = staticmethod(time.time)
+    state = struct.Struct('<dd')
+
+    def __init__(self, config={}, path=None):
+        if fcntl is None:
+            raise NotSupported('FileTokenBucket requires fcntl, it is not available on this platform')
+        super(FileTokenBucket, self).__init__(config)
+        self.path = path
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(self.fd, fcntl.LOCK_EX)
+        try:
+            if len(os.pread(self.fd, self.state.size, 0)) != self.state.size:
+                os.pwrite(self.fd, self.state.pack(0.0, self.clock()), 0)
+        finally:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+
+    def __del__(self):
+        if getattr(self, 'fd', None) is not None:
+            os.close(self.fd)
+
+    def transaction(self, update):
+        with self.lock:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+            try:
+                now = self.clock()
+                data = os.pread(self.fd, self.state.size, 0)
+                tokens, timestamp = self.state.unpack(data) if len(data) == self.state.size else (0.0, now)
+                tokens, result = update(self.refill(tokens, timestamp, now))
+                os.pwrite(self.fd, self.state.pack(tokens, now), 0)
+            finally:
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+        return result
+
+
+shared_buckets = {}
+shared_buckets_lock = threading.Lock()
+
+
+def shared_token_bucket(key, config={}, backend='process'):
+    """Returns the bucket registered under a key, creating it on first use
+
+    backend 'process' shares the bucket between the instances of one process,
+    backend 'file' also shares it with other processes through a file in the
+    temporary directory named after the key
+    """
+    with shared_buckets_lock:
+        bucket = shared_buckets.get((backend, key))
+        if bucket is None:
+            if backend == 'process':
+                bucket = TokenBucket(config)
+            elif backend == 'file':
+                filename = 'ccxt-' + ''.join(c if c.isalnum() or c in '-.' else '_' for c in key) + '.bucket'
+                bucket = FileTokenBucket(config, os.path.join(tempfile.gettempdir(), filename))
+            else:
+                raise NotSupported('rate limit backend ' + str(backend) + ' is not supported, use \'process\' or \'file\'')
+            shared_buckets[(backend, key)] = bucket
+        return bucket
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import json
+import os
+import sys
+import threading
+
+from decimal import Decimal
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt.async_support as ccxt  # noqa: E402
+from ccxt.async_support.base import exchange as async_exchange  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+trades = [{'id': i, 'price': 0.1 * i, 'amount': '1.5', 'side': 'buy'} for i in range(0, 5000)]
+
+
+class Handler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if self.path == '/trades':
+            status, content_type, body = 200, 'application/json', json.dumps(trades).encode()
+        elif self.path == '/error':
+            status, content_type, body = 400, 'application/json', b'{"error":"Invalid nonce"}'
+        elif self.path == '/nonce':
+            status, content_type, body = 200, 'application/json', b'{"error":["EAPI:Invalid nonce"]}'
+        else:
+            status, content_type, body = 200, 'text/plain', b'pong'
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+server.daemon_threads = True
+thread = threading.Thread(target=server.serve_forever)
+thread.daemon = True
+thread.start()
+url = 'http://127.0.0.1:' + str(server.server_port) + '/'
+
+# ----------------------------------------------------------------------------
+
+
+class Kraken(ccxt.Exchange):
+    """Maps the errors of the responses of status 200 like kraken, and reads last_http_response like its cancel_order"""
+
+    def handle_errors(self, code, reason, url, method, headers, body, response, request_headers, request_body):
+        if body.find('Invalid nonce') >= 0:
+            raise ccxt.InvalidNonce(self.id + ' ' + body)
+
+    async def cancel_order(self):
+        try:
+            return await self.fetch(url + 'nonce')
+        except Exception as e:
+            if self.last_http_response and self.last_http_response.find('Invalid nonce') >= 0:
+                raise ccxt.OrderNotFound(self.id + ' cancelOrder() error ' + self.last_http_response)
+            raise e
+
+
+async def test_modes():
+    legacy = ccxt.Exchange({'id': 'transport'})
+    binary = ccxt.Exchange({'id': 'transport', 'aiohttp_read_bytes': True})
+    retained = ccxt.Exchange({'id': 'transport', 'aiohttp_read_bytes': True, 'enableLastJsonResponse': True})
+    kraken = Kraken({'id': 'transport', 'aiohttp_read_bytes': True})
+    try:
+        expected = await legacy.fetch(url + 'trades')
+        assert expected == trades
+        assert legacy.last_json_response == trades
+
+        assert await binary.fetch(url + 'trades') == expected
+        assert binary.last_http_response is None
+        assert binary.last_json_response is None
+        assert await binary.fetch(url + 'ping') == 'pong'
+        # the json bodies are not decoded to text unless something reads the text
+        assert not binary.is_response_text_required(200, expected)
+        assert binary.is_response_text_required(200, None) and binary.is_response_text_required(400, {})
+        assert kraken.is_response_text_required(200, expected)
+
+        assert await retained.fetch(url + 'trades') == expected
+        assert retained.last_json_response == expected
+        assert retained.last_http_response is None
+
+        try:
+            await binary.fetch(url + 'error')
+            assert False
+        except ccxt.BaseError as e:
+            assert 'Invalid nonce' in str(e)
+            assert binary.last_http_response == '{"error":"Invalid nonce"}'
+            assert binary.last_json_response == {'error': 'Invalid nonce'}
+
+        # the error mapping that reads last_http_response works with the responses not kept
+        assert await kraken.fetch(url + 'trades') == expected
+        assert kraken.last_http_response is None
+        try:
+            await kraken.cancel_order()
+            assert False
+        except ccxt.OrderNotFound:
+            pass
+        await kraken.fetch(url + 'ping')
+        assert kraken.last_http_response is None
+    finally:
+        for exchange in (legacy, binary, retained, kraken):
+            await exchange.close()
+
+
+async def test_streaming():
+    streamed = ccxt.Exchange({'id': 'transport', 'aiohttp_read_bytes': True, 'aiohttp_stream_threshold': 1024, 'aiohttp_stream_chunk_size': 4096})
+    exact = ccxt.Exchange({'id': 'transport', 'aiohttp_read_bytes': True, 'aiohttp_stream_threshold': 1024, 'jsonNumbers': 'decimal'})
+    try:
+        assert await streamed.fetch(url + 'trades') == trades
+        assert await streamed.fetch(url + 'ping') == 'pong'
+        try:
+            await streamed.fetch(url + 'error')
+            assert False
+        except ccxt.BaseError as e:
+            assert 'Invalid nonce' in str(e)
+
+        response = await exact.fetch(url + 'trades')
+        assert response[1]['price'] == Decimal('0.1')
+        assert response[1]['id'] == 1
+    finally:
+        for exchange in (streamed, exact):
+            await exchange.close()
+
+
+asyncio.run(test_modes())
+if async_exchange.ijson is not None:
+    asyncio.run(test_streaming())
+
+# ----------------------------------------------------------------------------
+# shared connectors and sessions
+
+
+async def test_shared_session():
+    config = {'id': 'transport', 'aiohttp_shared_session': True, 'aiohttp_connector': {'limit_per_host': 4, 'ipv4_only': True}}
+    first = ccxt.Exchange(config)
+    second = ccxt.Exchange(config)
+    other = ccxt.Exchange({'id': 'transport', 'aiohttp_shared_session': True})
+    own = ccxt.Exchange({'id': 'transport'})
+    for exchange in (first, second, other, own):
+        exchange.open()
+    assert first.session is second.session
+    assert first.session is not other.session
+    assert first.session.connector.limit_per_host == 4
+    assert first.session.connector.limit == 100
+    assert own.session.connector._ssl is other.session.connector._ssl  # the CA bundle is loaded once
+    assert await first.fetch(url + 'ping') == 'pong'
+    await first.close()
+    assert not second.session.closed
+    assert await second.fetch(url + 'ping') == 'pong'
+    session = second.session
+    await second.close()
+    assert session.closed
+    await other.close()
+    await own.close()
+    # reopening after the last instance released the session starts a new one
+    first.open()
+    assert not first.session.closed
+    await first.close()
+
+
+asyncio.run(test_shared_session())
+
+server.shutdown()
+server.server_close()
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+
+import os
+import random
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.base.exchange import Exchange  # noqa: E402
+
+# ----------------------------------------------------------------------------
+# the codecs as they were before their fast paths, the reference of their behavior
+
+alphabet = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+
+
+def legacy_decimal_to_bytes(n, endian='big'):
+    if n > 0:
+        next_byte = legacy_decimal_to_bytes(n // 0x100, endian)
+        remainder = bytes([n % 0x100])
+        return next_byte + remainder if endian == 'big' else remainder + next_byte
+    else:
+        return b''
+
+
+def legacy_number_to_le(n, size):
+    return legacy_decimal_to_bytes(int(n), 'little').ljust(size, b'\x00')
+
+
+def legacy_number_to_be(n, size):
+    return legacy_decimal_to_bytes(int(n), 'big').rjust(size, b'\x00')
+
+
+def legacy_binary_concat(*args):
+    result = bytes()
+    for arg in args:
+        result = result + arg
+    return result
+
+
+def legacy_base58_to_binary(s):
+    decoder = {c: i for i, c in enumerate(alphabet)}
+    result = 0
+    for i in range(len(s)):
+        result *= 58
+        result += decoder[s[i]]
+    return legacy_decimal_to_bytes(result)
+
+
+def legacy_binary_to_base58(b):
+    encoder = {i: c for i, c in enumerate(alphabet)}
+    result = 0
+    for byte in b:
+        result *= 0x100
+        result += byte
+    string = []
+    while result > 0:
+        result, next_character = divmod(result, 58)
+        string.append(encoder[next_character])
+    string.reverse()
+    return ''.join(string)
+
+
+def call(method, *args):
+    try:
+        return method(*args)
+    except Exception as e:
+        return type(e)
+
+
+random.seed(58)
+
+
+def random_bytes(size):
+    return bytes(bytearray(random.getrandbits(8) for i in range(0, size)))
+
+
+# base58, with the leading zeros dropped as before
+
+binaries = [b'', b'\x00', b'\x00\x00\x01', b'\x01', b'\xff' * 64, bytearray(b'\x00\xff')]
+binaries += [random_bytes(random.choice((random.randint(0, 80), 32, 64))) for i in range(0, 3000)]
+binaries += [b'\x00' * random.randint(1, 3) + random_bytes(random.randint(0, 40)) for i in range(0, 500)]
+for binary in binaries:
+    string = Exchange.binary_to_base58(binary)
+    assert string == legacy_binary_to_base58(binary), binary
+    assert Exchange.base58_to_binary(string) == legacy_base58_to_binary(string) == bytes(binary).lstrip(b'\x00'), binary
+
+strings = ['', '1', '11', '111z', 'z', '2', 'zzzzzzzzz', 'zzzzzzzzzz', '0', 'O', 'l', 'I', '1a!', None, 58, b'abc']
+strings += [''.join(random.choice(alphabet) for j in range(0, random.randint(0, 100))) for i in range(0, 3000)]
+for string in strings:
+    assert call(Exchange.base58_to_binary, string) == call(legacy_base58_to_binary, string), string
+    if not isinstance(call(Exchange.base58_to_binary, string), type):
+        assert Exchange.binary_to_base58(Exchange.base58_to_binary(string)) == string.lstrip('1'), string
+
+for value in (None, 'abc', [1, 255], [0, 0, 7]):
+    assert call(Exchange.binary_to_base58, value) == call(legacy_binary_to_base58, value), value
+
+# the integers, of any size and with the numbers of the payloads of wavesexchange
+
+numbers = [0, 1, 255, 256, 65535, 65536, 2 ** 63 - 1, 2 ** 63, 2 ** 64, -1, -256, True, False]
+numbers += [random.getrandbits(random.randint(1, 600)) for i in range(0, 3000)]
+numbers += [random.randint(1, 10 ** 8) * 10 ** random.randint(0, 10) for i in range(0, 1000)]
+for number in numbers:
+    for endian in ('big', 'little', 'other'):
+        assert Exchange.decimal_to_bytes(number, endian) == legacy_decimal_to_bytes(number, endian), (number, endian)
+    for size in (0, 1, 2, 4, 8, 32):
+        assert Exchange.number_to_le(number, size) == legacy_number_to_le(number, size), (number, size)
+        assert Exchange.number_to_be(number, size) == legacy_number_to_be(number, size), (number, size)
+    if number > 0:
+        assert int.from_bytes(Exchange.decimal_to_bytes(number), 'big') == number
+        assert int.from_bytes(Exchange.decimal_to_bytes(number, 'little'), 'little') == number
+for number in ('12', 12.7, '0'):
+    assert Exchange.number_to_be(number, 8) == legacy_number_to_be(number, 8), number
+    assert Exchange.number_to_le(number, 8) == legacy_number_to_le(number, 8), number
+
+# the concatenations
+
+for i in range(0, 1000):
+    parts = [random_bytes(random.randint(0, 40)) for j in range(0, random.randint(0, 20))]
+    if parts and random.random() < 0.2:
+        parts[0] = bytearray(parts[0])
+    assert Exchange.binary_concat(*parts) == legacy_binary_concat(*parts)
+    assert Exchange.binary_concat_array(parts) == legacy_binary_concat(*parts)
+    assert type(Exchange.binary_concat(*parts)) is type(legacy_binary_concat(*parts)) is bytes
+assert call(Exchange.binary_concat, b'a', 'b') == call(legacy_binary_concat, b'a', 'b')
+assert call(Exchange.binary_concat_array, [b'a', 1]) == call(legacy_binary_concat, b'a', 1)
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+
+import os
+import random
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+from ccxt.base import exchange as exchange_module  # noqa: E402
+from ccxt.base.exchange import Exchange  # noqa: E402
+from ccxt.base.broad_matcher import BroadMatcher, broad_matcher, matchers  # noqa: E402
+
+# ----------------------------------------------------------------------------
+# the matching as it was before the matchers, the reference of its behavior
+
+
+def legacy_find_broadly_matched_key(broad, string):
+    keys = list(broad.keys())
+    for i in range(0, len(keys)):
+        key = keys[i]
+        if string.find(key) >= 0:
+            return key
+    return None
+
+
+def call(method, *args):
+    try:
+        return method(*args)
+    except Exception as e:
+        return type(e)
+
+
+def raised(method, *args):
+    try:
+        method(*args)
+    except Exception as e:
+        return type(e), str(e)
+    return None
+
+
+def broad_tables(exceptions):
+    """The broad tables of the exceptions of an exchange, at any depth"""
+    tables = []
+    if isinstance(exceptions, dict):
+        for key, value in exceptions.items():
+            if key == 'broad' and isinstance(value, dict):
+                tables.append(value)
+            else:
+                tables += broad_tables(value)
+    return tables
+
+
+def messages(keys):
+    """The keys alone, in other text, two of them in either order, their prefixes and text without them"""
+    result = ['', 'no error here', '{"error":"something else went wrong"}', 'x' * 2000]
+    for key in keys:
+        result += [key, key.upper(), key[:-1], key[1:], 'error: ' + key + '.', '{"msg":"' + key + '","code":-1}']
+        result += ['x' * 2000 + key]
+    for i in range(0, 20):
+        if keys:
+            first, second = random.choice(keys), random.choice(keys)
+            result += [first + ' ' + second, second + ', ' + first]
+    return result
+
+
+random.seed(25)
+
+# the first key of each table of each exchange that is found in a message, as before
+
+tables = 0
+matched = 0
+for id in ccxt.exchanges:
+    exchange = getattr(ccxt, id)()
+    for broad in broad_tables(exchange.exceptions):
+        tables += 1
+        keys = list(broad.keys())
+        for message in messages(keys):
+            expected = legacy_find_broadly_matched_key(broad, message)
+            # twice, the second from the matches kept by the matcher
+            assert exchange.find_broadly_matched_key(broad, message) == expected, (id, message)
+            assert exchange.find_broadly_matched_key(broad, message) == expected, (id, message)
+            assert raised(exchange.throw_broadly_matched_exception, broad, message, id + ' ' + message) == \
+                (None if expected is None else (broad[expected], id + ' ' + message)), (id, message)
+            matched += expected is not None
+        for value in (None, 42, b'bytes', ['list']):
+            assert call(exchange.find_broadly_matched_key, broad, value) == call(legacy_find_broadly_matched_key, broad, value), (id, value)
+assert tables > 40, tables
+assert matched > 1000, matched
+
+# the instances of an exchange share the matcher of their table
+
+first, second = ccxt.yobit(), ccxt.yobit()
+assert first.exceptions['broad'] is not second.exceptions['broad']
+assert broad_matcher(first.exceptions['broad']) is broad_matcher(second.exceptions['broad'])
+
+# an instance compiles a table once, and again when the table is replaced
+
+compiled = []
+exchange = ccxt.yobit()
+original = exchange_module.broad_matcher
+exchange_module.broad_matcher = lambda broad: compiled.append(broad) or original(broad)
+try:
+    for i in range(0, 10):
+        assert exchange.find_broadly_matched_key(exchange.exceptions['broad'], 'message ' + str(i)) is None
+    assert len(compiled) == 1
+    exchange.exceptions['broad'] = dict(exchange.exceptions['broad'], **{'message 1': KeyError})
+    assert exchange.find_broadly_matched_key(exchange.exceptions['broad'], 'message 1') == 'message 1'
+    assert len(compiled) == 2
+finally:
+    exchange_module.broad_matcher = original
+
+# the keys added to a table are matched, in the order of the table
+
+exchange = Exchange()
+broad = {'not found': KeyError, 'Account not found': ValueError}
+assert exchange.find_broadly_matched_key(broad, 'Account not found') == 'not found'
+broad['Account'] = TypeError
+assert exchange.find_broadly_matched_key(broad, 'Account') == 'Account'
+del broad['not found']
+assert exchange.find_broadly_matched_key(broad, 'Account not found') == 'Account not found'
+broad = {}
+assert exchange.find_broadly_matched_key(broad, 'anything') is None
+assert exchange.find_broadly_matched_key(broad, None) is None
+assert exchange.find_broadly_matched_key({'': KeyError}, '') == ''
+assert call(exchange.find_broadly_matched_key, {1: KeyError}, 'text') is TypeError
+assert call(exchange.find_broadly_matched_key, {'a': KeyError}, None) is AttributeError
+
+# the matches kept are bounded, the long messages are not kept
+
+matcher = BroadMatcher(('rate limit', 'limit'), size=8, max_length=100)
+for i in range(0, 100):
+    assert matcher.match('limit ' + str(i)) == 'limit'
+    assert len(matcher.matches) <= 8
+assert matcher.match('rate limit exceeded' + ' ' * 100) == 'rate limit'
+assert 'rate limit exceeded' + ' ' * 100 not in matcher.matches
+assert matcher.match('rate limit exceeded') == 'rate limit'
+assert matcher.matches['rate limit exceeded'] == 'rate limit'
+assert matcher.match('nothing') is None
+assert 'nothing' in matcher.matches and matcher.match('nothing') is None
+for i in range(0, 1000):
+    broad_matcher({'key ' + str(i): KeyError})
+assert len(matchers) <= 256
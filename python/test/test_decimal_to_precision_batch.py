@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+
+import decimal
+import itertools
+import numbers
+import os
+import random
+import re
+import runpy
+import sys
+import threading
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.base import decimal_to_precision as module  # noqa: E402
+from ccxt.base.decimal_to_precision import decimal_to_precision  # noqa: E402
+from ccxt.base.decimal_to_precision import decimals_to_precision  # noqa: E402
+from ccxt.base.decimal_to_precision import TRUNCATE, ROUND, DECIMAL_PLACES, SIGNIFICANT_DIGITS, TICK_SIZE, NO_PADDING, PAD_WITH_ZERO  # noqa: E402
+from ccxt.base.exchange import Exchange  # noqa: E402
+
+# ----------------------------------------------------------------------------
+# decimal_to_precision as it was before its cached quantizers, the reference of its behavior
+
+
+def legacy_decimal_to_precision(n, rounding_mode=ROUND, precision=None, counting_mode=DECIMAL_PLACES, padding_mode=NO_PADDING):
+    assert precision is not None
+    if counting_mode == TICK_SIZE:
+        assert(isinstance(precision, float) or isinstance(precision, numbers.Integral))
+    else:
+        assert(isinstance(precision, numbers.Integral))
+    assert rounding_mode in [TRUNCATE, ROUND]
+    assert counting_mode in [DECIMAL_PLACES, SIGNIFICANT_DIGITS, TICK_SIZE]
+    assert padding_mode in [NO_PADDING, PAD_WITH_ZERO]
+
+    context = decimal.getcontext()
+
+    if counting_mode != TICK_SIZE:
+        precision = min(context.prec - 2, precision)
+
+    # all default except decimal.Underflow (raised when a number is rounded to zero)
+    context.traps[decimal.Underflow] = True
+    context.rounding = decimal.ROUND_HALF_UP  # rounds 0.5 away from zero
+
+    dec = decimal.Decimal(str(n))
+    precision_dec = decimal.Decimal(str(precision))
+    string = '{:f}'.format(dec)  # convert to string using .format to avoid engineering notation
+    precise = None
+
+    def power_of_10(x):
+        return decimal.Decimal('10') ** (-x)
+
+    if precision < 0:
+        if counting_mode == TICK_SIZE:
+            raise ValueError('TICK_SIZE cant be used with negative numPrecisionDigits')
+        to_nearest = power_of_10(precision)
+        if rounding_mode == ROUND:
+            return "{:f}".format(to_nearest * decimal.Decimal(legacy_decimal_to_precision(dec / to_nearest, rounding_mode, 0, DECIMAL_PLACES, padding_mode)))
+        elif rounding_mode == TRUNCATE:
+            return legacy_decimal_to_precision(dec - dec % to_nearest, rounding_mode, 0, DECIMAL_PLACES, padding_mode)
+
+    if counting_mode == TICK_SIZE:
+        # python modulo with negative numbers behaves different than js/php, so use abs first
+        missing = abs(dec) % precision_dec
+        if missing != 0:
+            if rounding_mode == ROUND:
+                if dec > 0:
+                    if missing >= precision / 2:
+                        dec = dec - missing + precision_dec
+                    else:
+                        dec = dec - missing
+                else:
+                    if missing >= precision / 2:
+                        dec = dec + missing - precision_dec
+                    else:
+                        dec = dec + missing
+            elif rounding_mode == TRUNCATE:
+                if dec < 0:
+                    dec = dec + missing
+                else:
+                    dec = dec - missing
+        parts = re.sub(r'0+$', '', '{:f}'.format(precision_dec)).split('.')
+        if len(parts) > 1:
+            new_precision = len(parts[1])
+        else:
+            match = re.search(r'0+$', parts[0])
+            if match is None:
+                new_precision = 0
+            else:
+                new_precision = - len(match.group(0))
+        return legacy_decimal_to_precision('{:f}'.format(dec), ROUND, new_precision, DECIMAL_PLACES, padding_mode)
+
+    if rounding_mode == ROUND:
+        if counting_mode == DECIMAL_PLACES:
+            precise = '{:f}'.format(dec.quantize(power_of_10(precision)))  # ROUND_HALF_EVEN is default context
+        elif counting_mode == SIGNIFICANT_DIGITS:
+            q = precision - dec.adjusted() - 1
+            sigfig = power_of_10(q)
+            if q < 0:
+                string_to_precision = string[:precision]
+                # string_to_precision is '' when we have zero precision
+                below = sigfig * decimal.Decimal(string_to_precision if string_to_precision else '0')
+                above = below + sigfig
+                precise = '{:f}'.format(min((below, above), key=lambda x: abs(x - dec)))
+            else:
+                precise = '{:f}'.format(dec.quantize(sigfig))
+        if precise == ('-0.' + len(precise) * '0')[:2] or precise == '-0':
+            precise = precise[1:]
+
+    elif rounding_mode == TRUNCATE:
+        # Slice a string
+        if counting_mode == DECIMAL_PLACES:
+            before, after = string.split('.') if '.' in string else (string, '')
+            precise = before + '.' + after[:precision]
+        elif counting_mode == SIGNIFICANT_DIGITS:
+            if precision == 0:
+                return '0'
+            dot = string.index('.') if '.' in string else len(string)
+            start = dot - dec.adjusted()
+            end = start + precision
+            # need to clarify these conditionals
+            if dot >= end:
+                end -= 1
+            if precision >= len(string.replace('.', '')):
+                precise = string
+            else:
+                precise = string[:end].ljust(dot, '0')
+        if precise == ('-0.' + len(precise) * '0')[:3] or precise == '-0':
+            precise = precise[1:]
+        precise = precise.rstrip('.')
+
+    if padding_mode == NO_PADDING:
+        return precise.rstrip('0').rstrip('.') if '.' in precise else precise
+    elif padding_mode == PAD_WITH_ZERO:
+        if '.' in precise:
+            if counting_mode == DECIMAL_PLACES:
+                before, after = precise.split('.')
+                return before + '.' + after.ljust(precision, '0')
+
+            elif counting_mode == SIGNIFICANT_DIGITS:
+                fsfg = len(list(itertools.takewhile(lambda x: x == '.' or x == '0', precise)))
+                if '.' in precise[fsfg:]:
+                    precision += 1
+                return precise[:fsfg] + precise[fsfg:].rstrip('0').ljust(precision, '0')
+        else:
+            if counting_mode == SIGNIFICANT_DIGITS:
+                if precision > len(precise):
+                    return precise + '.' + (precision - len(precise)) * '0'
+            elif counting_mode == DECIMAL_PLACES:
+                if precision > 0:
+                    return precise + '.' + precision * '0'
+            return precise
+
+
+def call(method, *args):
+    try:
+        return method(*args)
+    except Exception as e:
+        return type(e)
+
+
+def legacy(*args):
+    # the legacy implementation changes the decimal context it runs in
+    with decimal.localcontext():
+        return call(legacy_decimal_to_precision, *args)
+
+
+random.seed(17)
+
+# the generated suite, through the single and the batch calls
+
+path = os.path.join(root, 'test', 'test_decimal_to_precision.py')
+runpy.run_path(path, run_name='__main__')
+single = module.decimal_to_precision
+try:
+    module.decimal_to_precision = lambda n, *args, **kwargs: decimals_to_precision([n], *args, **kwargs)[0]
+    runpy.run_path(path, run_name='__main__')
+finally:
+    module.decimal_to_precision = single
+
+# parity with the reference over random numbers and arguments
+
+
+def random_number():
+    digits = ''.join(random.choice('0123456789') for i in range(0, random.randint(1, 24)))
+    point = random.randint(0, len(digits))
+    string = random.choice(('', '-')) + (digits[:point] or '0') + '.' + (digits[point:] or '0')
+    return random.choice((string, float(string), random.randint(-10 ** 12, 10 ** 12), string + 'e' + str(random.randint(-30, 30))))
+
+
+def random_tick():
+    return random.choice((1, 10, 100, 0.5, 0.25, 0.1, 0.05, 0.01, 0.001, 0.0005, 0.00001, 1e-8, 2.5, 0.2, 5, 0.000025))
+
+
+values = [random_number() for i in range(0, 400)] + [0, '0', '-0', '-0.0', 'NaN', 'abc', '', None, 1.5, -1.5, '0.5', '-0.5', '1e-40']
+modes = list(itertools.product((TRUNCATE, ROUND), (NO_PADDING, PAD_WITH_ZERO)))
+checked = 0
+for n in values:
+    for rounding_mode, padding_mode in modes:
+        for precision in (-3, -1, 0, 1, 2, 5, 8, 18, 40):
+            for counting_mode in (DECIMAL_PLACES, SIGNIFICANT_DIGITS):
+                args = (n, rounding_mode, precision, counting_mode, padding_mode)
+                assert call(decimal_to_precision, *args) == legacy(*args), args
+                checked += 1
+        for tick in (random_tick(), random_tick(), -1, 0.5):
+            args = (n, rounding_mode, tick, TICK_SIZE, padding_mode)
+            assert call(decimal_to_precision, *args) == legacy(*args), args
+            checked += 1
+assert checked > 30000
+
+# invalid arguments are rejected as before, each time
+
+for args in ((1, ROUND, None), (1, ROUND, 1.5), (1, ROUND, [2]), (1, 7, 2), (1, ROUND, 2, 9), (1, ROUND, 2, DECIMAL_PLACES, 0), (1, ROUND, '0.1', TICK_SIZE)):
+    for i in range(0, 2):
+        assert call(decimal_to_precision, *args) == legacy(*args) == AssertionError, args
+
+# the precision of the decimal context of the thread still bounds the digits
+
+with decimal.localcontext() as context:
+    context.prec = 10
+    args = ('1.123456789012345', ROUND, 12, DECIMAL_PLACES, NO_PADDING)
+    assert decimal_to_precision(*args) == '1.12345679'
+    context.prec = 12
+    assert decimal_to_precision(*args) == '1.123456789'
+
+# the other settings of the context of the first thread are not used by the others
+
+
+def in_thread(prec):
+    result = []
+
+    def run():
+        context = decimal.getcontext()
+        context.prec = prec
+        context.Emax = 3
+        context.traps[decimal.Inexact] = True
+        context.rounding = decimal.ROUND_DOWN
+        result.append(decimal_to_precision('123456.789', ROUND, 2, DECIMAL_PLACES, NO_PADDING))
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+module.contexts.clear()
+assert in_thread(29) == '123456.79'
+with decimal.localcontext() as context:
+    context.prec = 29
+    assert decimal_to_precision('123456.789', ROUND, 2, DECIMAL_PLACES, NO_PADDING) == '123456.79'
+assert module.contexts[29].Emax == 999999 and not module.contexts[29].traps[decimal.Inexact]
+
+# the global decimal context is left as is
+
+context = decimal.getcontext()
+assert context.rounding == decimal.ROUND_HALF_EVEN
+assert not context.traps[decimal.Underflow]
+
+# the batch calls of the exchange
+
+exchange = Exchange()
+exchange.markets = {'BTC/USDT': {'precision': {'price': 2, 'amount': 4}}}
+prices = ['47000.005', 47000.004, '-1.115']
+assert exchange.prices_to_precision('BTC/USDT', prices) == [exchange.price_to_precision('BTC/USDT', price) for price in prices] == ['47000.01', '47000', '-1.12']
+assert exchange.amounts_to_precision('BTC/USDT', prices) == [exchange.amount_to_precision('BTC/USDT', price) for price in prices]
+
+
+class overriding(Exchange):
+
+    def price_to_precision(self, symbol, price):
+        return 'overridden'
+
+
+exchange = overriding()
+exchange.markets = {'BTC/USDT': {'precision': {'price': 2, 'amount': 4}}}
+assert exchange.prices_to_precision('BTC/USDT', prices) == ['overridden'] * 3
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+import base64
+import hashlib
+import os
+import random
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.base import ecdsa_signer  # noqa: E402
+from ccxt.base.exchange import Exchange  # noqa: E402
+from ccxt.static_dependencies import ecdsa  # noqa: E402
+
+# ----------------------------------------------------------------------------
+# Exchange.ecdsa as it was before the table of the generator, the reference of the signatures
+
+
+def legacy_ecdsa(request, secret, algorithm='p256', hash=None, fixed_length=False):
+    algorithms = {
+        'p192': [ecdsa.NIST192p, 'sha256'],
+        'p224': [ecdsa.NIST224p, 'sha256'],
+        'p256': [ecdsa.NIST256p, 'sha256'],
+        'p384': [ecdsa.NIST384p, 'sha384'],
+        'p521': [ecdsa.NIST521p, 'sha512'],
+        'secp256k1': [ecdsa.SECP256k1, 'sha256'],
+    }
+    curve_info = algorithms[algorithm]
+    hash_function = getattr(hashlib, curve_info[1])
+    encoded_request = Exchange.encode(request)
+    if hash is not None:
+        digest = Exchange.hash(encoded_request, hash, 'binary')
+    else:
+        digest = base64.b16decode(encoded_request, casefold=True)
+    key = ecdsa.SigningKey.from_string(base64.b16decode(Exchange.encode(secret), casefold=True), curve=curve_info[0])
+    r_binary, s_binary, v = key.sign_digest_deterministic(digest, hashfunc=hash_function, sigencode=ecdsa.util.sigencode_strings_canonize)
+    r_int, s_int = ecdsa.util.sigdecode_strings((r_binary, s_binary), key.privkey.order)
+    counter = 0
+    minimum_size = (1 << (8 * 31)) - 1
+    half_order = key.privkey.order / 2
+    while fixed_length and (r_int > half_order or r_int <= minimum_size or s_int <= minimum_size):
+        r_binary, s_binary, v = key.sign_digest_deterministic(digest, hashfunc=hash_function, sigencode=ecdsa.util.sigencode_strings_canonize,
+                                                              extra_entropy=Exchange.number_to_le(counter, 32))
+        r_int, s_int = ecdsa.util.sigdecode_strings((r_binary, s_binary), key.privkey.order)
+        counter += 1
+    r, s = Exchange.decode(base64.b16encode(r_binary)).lower(), Exchange.decode(base64.b16encode(s_binary)).lower()
+    return {
+        'r': r,
+        's': s,
+        'v': v,
+    }
+
+
+def call(method, *args):
+    try:
+        return method(*args)
+    except Exception as e:
+        return type(e)
+
+
+random.seed(6979)
+
+curves = {
+    'p192': ecdsa.NIST192p,
+    'p224': ecdsa.NIST224p,
+    'p256': ecdsa.NIST256p,
+    'p384': ecdsa.NIST384p,
+    'p521': ecdsa.NIST521p,
+    'secp256k1': ecdsa.SECP256k1,
+}
+
+
+def secret_of(curve, secexp):
+    string = '%x' % secexp
+    return '0' * (2 * curve.baselen - len(string)) + string
+
+
+def cases(count):
+    for algorithm, curve in sorted(curves.items()):
+        secrets = [secret_of(curve, 1), secret_of(curve, curve.order - 1)] + [secret_of(curve, random.randrange(1, curve.order)) for i in range(0, count)]
+        for secret in secrets:
+            request = '%x' % random.getrandbits(64)
+            # the digests of a hash, hexadecimal digests of any size, and the signatures of a fixed length
+            yield request, secret, algorithm, random.choice(('sha256', 'sha384', 'sha512', 'md5')), False
+            digest = '%0*x' % (2 * random.choice((20, 32, curve.baselen)), random.getrandbits(8 * curve.baselen))
+            yield digest, secret.upper(), algorithm, None, False
+            yield request, secret, algorithm, 'sha256', True
+
+
+# the python engine and, when coincurve is installed, libsecp256k1 give the signatures of the vendored python-ecdsa
+
+signatures = [(case, call(legacy_ecdsa, *case)) for case in cases(4)]
+for case, signature in signatures:
+    assert call(Exchange.ecdsa, *case) == signature, case
+
+native = ecdsa_signer.load_native()
+ecdsa_signer.keys.clear()
+ecdsa_signer.native_module = None
+for case, signature in signatures:
+    if case[2] == 'secp256k1':
+        assert call(Exchange.ecdsa, *case) == signature, case
+ecdsa_signer.keys.clear()
+ecdsa_signer.native_module = native
+
+# the errors of the invalid secrets and digests
+
+invalid = [
+    ('1a', '00' * 32, 'p256', 'sha256'),  # zero
+    ('1a', secret_of(ecdsa.NIST256p, ecdsa.NIST256p.order), 'p256', 'sha256'),  # the order
+    ('1a', '1a' * 31, 'p256', 'sha256'),  # short
+    ('1a', 'zz' * 32, 'secp256k1', 'sha256'),  # not hexadecimal
+    ('1a' * 33, '1a' * 32, 'secp256k1', None),  # a digest longer than the curve
+    ('1a', '1a' * 24, 'p192', 'sha512'),
+]
+for request, secret, algorithm, hash in invalid:
+    assert call(Exchange.ecdsa, request, secret, algorithm, hash) == call(legacy_ecdsa, request, secret, algorithm, hash), (request, secret, algorithm, hash)
+    assert isinstance(call(Exchange.ecdsa, request, secret, algorithm, hash), type)
+
+# the table of the generator
+
+for name, curve in sorted(curves.items()):
+    instance = ecdsa_signer.Curve.get(curve)
+    for k in [1, 2, 15, 16, 17, curve.order - 1] + [random.randrange(1, curve.order) for i in range(0, 10)]:
+        point = curve.generator * k
+        assert instance.multiply_generator(k) == (point.x(), point.y()), (name, k)
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import csv
+import os
+import random
+import shutil
+import sys
+import tempfile
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+import ccxt.async_support  # noqa: E402
+from ccxt.base import exporter  # noqa: E402
+from ccxt.base.exporter import Exporter  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+random.seed(20)
+start = 1600000000000
+now = start + 6 * 3600000
+timestamps = sorted(start + random.randint(0, 6 * 3600000 - 1) for i in range(0, 1500)) + [now - 1] * 5
+trades = [{'id': str(i), 'timestamp': timestamp, 'datetime': ccxt.Exchange.iso8601(timestamp), 'symbol': 'BTC/USDT', 'order': None, 'type': None, 'side': 'buy' if i % 2 else 'sell',
+           'takerOrMaker': None, 'price': 100 + i / 100, 'amount': 0.5, 'cost': (100 + i / 100) * 0.5, 'fee': {'cost': 0.01, 'currency': 'USDT'} if i % 3 else None} for i, timestamp in enumerate(sorted(timestamps))]
+candles = [[timestamp, 1.0, 2.0, 0.5, 1.5, 10.0] for timestamp in range(start, now, 60000)]
+
+
+class interrupted(Exception):
+    pass
+
+
+class exporting(ccxt.Exchange):
+
+    def __init__(self, config={}):
+        super(exporting, self).__init__(config)
+        self.calls = 0
+        self.fail_after = None
+
+    def milliseconds(self):
+        return now
+
+    def call(self):
+        self.calls += 1
+        if self.fail_after is not None and self.calls > self.fail_after:
+            raise interrupted()
+
+    def fetch_trades(self, symbol, since=None, limit=None, params={}):
+        self.call()
+        # by the hour, as the aggTrades of binance
+        return [trade for trade in trades if since <= trade['timestamp'] <= since + 3600000][0:limit]
+
+    def fetch_my_trades(self, symbol=None, since=None, limit=None, params={}):
+        self.call()
+        return [trade for trade in trades if int(trade['id']) >= int(params.get('fromId', 0))][0:limit]
+
+    def fetch_ohlcv(self, symbol, timeframe='1m', since=None, limit=None, params={}):
+        self.call()
+        return [candle for candle in candles if candle[0] >= since][0:limit]
+
+
+def read(path, format):
+    if format == 'csv':
+        with open(path, newline='') as file:
+            rows = list(csv.reader(file))
+        return [row[0] for row in rows[1:]]
+    parts = Exporter(path, 'fetch_trades', format).parts()
+    if format == 'parquet':
+        import pyarrow.parquet
+        return [str(value) for part in parts for value in pyarrow.parquet.read_table(part).column(0).to_pylist()]
+    import pyarrow.ipc
+    values = []
+    for part in parts:
+        with pyarrow.ipc.open_file(part) as reader:
+            values += [str(value) for value in reader.read_all().column(0).to_pylist()]
+    return values
+
+
+directory = tempfile.mkdtemp()
+try:
+    formats = ['csv'] + (['parquet', 'arrow'] if exporter.pyarrow is not None else [])
+    for format in formats:
+        # interrupted twice, then resumed to the end
+        for method, config in (('fetch_trades', {'id': 'binance'}), ('fetch_my_trades', {'id': 'binance'})):
+            path = os.path.join(directory, method + '.' + format)
+            exchange = exporting(config)
+            counts = []
+            for fail_after in (7, 20, None):
+                exchange.calls = 0
+                exchange.fail_after = fail_after
+                try:
+                    counts.append(exchange.export_history(method, 'BTC/USDT', path, start, 50, {}, None, '1m', format))
+                except interrupted:
+                    pass
+            assert read(path, format) == [trade['id'] for trade in trades], (method, format)
+            # nothing to add
+            exchange.fail_after = None
+            assert exchange.export_history(method, 'BTC/USDT', path, start, 50, {}, None, '1m', format) == 0
+        # candles
+        path = os.path.join(directory, 'ohlcv.' + format)
+        exchange = exporting()
+        assert exchange.export_history('fetch_ohlcv', 'BTC/USDT', path, start, 100, {}, None, '1m', format) == len(candles)
+        assert exchange.export_history('fetch_ohlcv', 'BTC/USDT', path, start, 100, {}, None, '1m', format) == 0
+        assert read(path, format) == [str(candle[0]) for candle in candles]
+
+    # a row cut by a crash is written again
+
+    path = os.path.join(directory, 'cut.csv')
+    exchange = exporting({'id': 'binance'})
+    exchange.export_history('fetch_my_trades', 'BTC/USDT', path, None, 200, {}, start + 3600000)
+    with open(path, 'a') as file:
+        file.write('9999,16000')
+    exchange.export_history('fetch_my_trades', 'BTC/USDT', path, None, 200)
+    assert read(path, 'csv') == [trade['id'] for trade in trades]
+    with open(path) as file:
+        assert file.readline().strip() == 'id,timestamp,datetime,symbol,order,type,side,takerOrMaker,price,amount,cost,fee.cost,fee.currency'
+        assert file.readline().strip() == '0,%d,%s,BTC/USDT,,,sell,,100.0,0.5,50.0,,' % (trades[0]['timestamp'], trades[0]['datetime'])
+
+    # the rows of a csv file are counted from its .count file, only the rows after it are read
+
+    assert Exporter(path, 'fetch_my_trades').read_count() == (os.path.getsize(path), len(trades))
+    with open(path + '.count', 'w') as file:
+        file.write('%d %d\n' % (os.path.getsize(path), len(trades) + 1000))
+    assert Exporter(path, 'fetch_my_trades').read_tail()[0] == len(trades) + 1000
+    with open(path, 'rb') as file:
+        offset = len(b''.join(file.readlines()[0:11]))
+    with open(path + '.count', 'w') as file:
+        file.write('%d %d\n' % (offset, 10))
+    assert Exporter(path, 'fetch_my_trades').read_tail()[0] == len(trades)
+    os.remove(path + '.count')
+    assert Exporter(path, 'fetch_my_trades').read_tail()[0] == len(trades)
+
+    # the batches of parquet are bounded
+
+    if exporter.pyarrow is not None:
+        import pyarrow.parquet
+        path = os.path.join(directory, 'batches.parquet')
+        writer = Exporter(path, 'fetch_ohlcv', batch_size=100)
+        for i in range(0, len(candles), 30):
+            writer.write(candles[i:i + 30])
+            assert len(writer.batch) < 100
+        writer.close()
+        file = pyarrow.parquet.ParquetFile(Exporter(path, 'fetch_ohlcv').parts()[0])
+        assert file.num_row_groups == 3 and file.metadata.num_rows == len(candles)
+        # a part that did not end is not read back and is removed by the next run
+        with open(os.path.join(path, 'part-00001.parquet.tmp'), 'wb') as file:
+            file.write(b'PAR1')
+        assert Exporter(path, 'fetch_ohlcv').read_tail()[0] == len(candles)
+        assert exporting().export_history('fetch_ohlcv', 'BTC/USDT', path, now - 60000 * 3, 100) == 0
+        assert sorted(os.listdir(path)) == ['part-00000.parquet']
+
+    # a part is renamed every part_size rows, a crash loses the rows of the last one only
+
+    for format in formats[1:]:
+        path = os.path.join(directory, 'crash.' + format)
+        writer = Exporter(path, 'fetch_ohlcv', format, batch_size=50, part_size=100)
+        for i in range(0, len(candles), 25):
+            writer.write(candles[i:i + 25])
+        assert writer.writer is not None and writer.batch
+        # the process ends without close()
+        reader = Exporter(path, 'fetch_ohlcv', format)
+        assert len(reader.parts()) == 3 and reader.read_tail() == (300, [dict(zip(reader.names, candles[299]))])
+        assert exporting().export_history('fetch_ohlcv', 'BTC/USDT', path, start, 100, {}, None, '1m', format) == len(candles) - 300
+        assert read(path, format) == [str(candle[0]) for candle in candles]
+        # the rows of the last timestamp are read back across the row groups and the parts
+        path = os.path.join(directory, 'tail.' + format)
+        writer = Exporter(path, 'fetch_trades', format, batch_size=2, part_size=4)
+        writer.write(trades[0:3])
+        writer.write([dict(trade, timestamp=now) for trade in trades[3:10]])
+        writer.close()
+        count, tail = Exporter(path, 'fetch_trades', format).read_tail()
+        assert count == 10 and [row['id'] for row in tail] == [trade['id'] for trade in trades[3:10]]
+
+    # without pyarrow csv is written
+
+    pyarrow = exporter.pyarrow
+    exporter.pyarrow = None
+    try:
+        assert Exporter(os.path.join(directory, 'x.parquet'), 'fetch_trades').format == 'csv'
+        try:
+            Exporter(os.path.join(directory, 'x'), 'fetch_trades', 'parquet')
+            assert False
+        except ccxt.NotSupported:
+            pass
+    finally:
+        exporter.pyarrow = pyarrow
+
+    # many symbols in parallel, each with a copy of the instance and a session of its own
+
+    class threaded(exporting):
+
+        def fetch_ohlcv(self, symbol, timeframe='1m', since=None, limit=None, params={}):
+            sessions.add((symbol, self.session))
+            return super(threaded, self).fetch_ohlcv(symbol, timeframe, since, limit, params)
+
+    sessions = set()
+    exchange = threaded({'id': 'binance'})
+    counts = exchange.export_histories('fetch_ohlcv', ['BTC/USDT', 'ETH/USDT', 'ETH/BTC'], os.path.join(directory, 'symbols'), start, 100)
+    assert len(sessions) == 3 and len(set(session for symbol, session in sessions)) == 3
+    assert exchange.session not in [session for symbol, session in sessions] and exchange.calls == 0
+    assert counts == {'BTC/USDT': len(candles), 'ETH/USDT': len(candles), 'ETH/BTC': len(candles)}
+    assert sorted(os.listdir(os.path.join(directory, 'symbols'))) == ['BTC-USDT.csv', 'BTC-USDT.csv.count', 'ETH-BTC.csv', 'ETH-BTC.csv.count', 'ETH-USDT.csv', 'ETH-USDT.csv.count']
+
+    class async_exporting(ccxt.async_support.Exchange):
+
+        def milliseconds(self):
+            return now
+
+        async def fetch_trades(self, symbol, since=None, limit=None, params={}):
+            await asyncio.sleep(0.001)
+            return [trade for trade in trades if since <= trade['timestamp'] <= since + 3600000][0:limit]
+
+    async def test_async():
+        exchange = async_exporting({'id': 'binance', 'enableRateLimit': False})
+        try:
+            target = os.path.join(directory, 'async')
+            counts = await exchange.export_histories('fetch_trades', ['BTC/USDT', 'ETH/USDT'], target, start, 100)
+            assert counts == {'BTC/USDT': len(trades), 'ETH/USDT': len(trades)}
+            assert read(os.path.join(target, 'ETH-USDT.csv'), 'csv') == [trade['id'] for trade in trades]
+            assert await exchange.export_history('fetch_trades', 'BTC/USDT', os.path.join(target, 'BTC-USDT.csv'), start, 100) == 0
+        finally:
+            await exchange.close()
+
+    asyncio.get_event_loop().run_until_complete(test_async())
+finally:
+    shutil.rmtree(directory)
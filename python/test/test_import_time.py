@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+import os
+import subprocess
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+# milliseconds, the best of a few runs of python -X importtime
+budgets = {
+    'ccxt': float(os.environ.get('CCXT_IMPORT_TIME_BUDGET', 500)),
+    'ccxt.async_support': float(os.environ.get('CCXT_ASYNC_IMPORT_TIME_BUDGET', 1000)),
+}
+
+# not imported until an exchange or a signing method needs them
+deferred = ('cryptography', 'web3', 'ccxt.static_dependencies.ecdsa', 'ccxt.binance', 'ccxt.async_support.binance')
+
+
+def import_time(package, runs=3):
+    """Returns the cumulative import time of a package in milliseconds and the modules it imported"""
+    best = None
+    for i in range(0, runs):
+        output = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import ' + package], cwd=root, stderr=subprocess.PIPE, universal_newlines=True, check=True).stderr
+        modules = {}
+        for line in output.splitlines():
+            if line.startswith('import time:') and '|' in line:
+                self_time, cumulative, name = line[len('import time:'):].split('|')
+                if cumulative.strip().isdigit():
+                    modules[name.strip()] = int(cumulative) / 1000
+        best = modules if best is None or modules[package] < best[package] else best
+    return best[package], set(best)
+
+
+for package, budget in budgets.items():
+    elapsed, modules = import_time(package)
+    assert elapsed < budget, 'import ' + package + ' took ' + str(round(elapsed)) + 'ms, the budget is ' + str(budget) + 'ms'
+    for name in deferred:
+        assert name not in modules, 'import ' + package + ' should not import ' + name
+
+# the exchanges are still listed and resolved on first access
+
+import ccxt  # noqa: E402
+import ccxt.async_support  # noqa: E402
+
+assert 'binance' in ccxt.exchanges and 'binance' in dir(ccxt)
+assert ccxt.binance.__module__ == 'ccxt.binance'
+assert ccxt.async_support.binance.__module__ == 'ccxt.async_support.binance'
+assert ccxt.binanceus().id == 'binanceus'  # imports ccxt.binance as a module
+assert isinstance(ccxt.binance, type)
+import ccxt.kraken  # noqa: E402
+assert isinstance(ccxt.kraken, type)
+from ccxt import bitmex  # noqa: E402
+assert bitmex is ccxt.bitmex
+try:
+    ccxt.unknown
+    assert False
+except AttributeError:
+    pass
+assert all(isinstance(getattr(ccxt, id), type) for id in ccxt.exchanges)
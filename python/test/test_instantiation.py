@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import types
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+
+# ----------------------------------------------------------------------------
+# the per-class caches give every instance the same attributes and aliases
+
+
+def check_aliases(exchange):
+    for name in dir(exchange):
+        if name[0] != '_' and name[-1] != '_' and '_' in name and name not in ('json_codec', 'transport_stats'):
+            value = getattr(exchange, name)
+            alias = getattr(exchange, ccxt.Exchange.camelcase(name))
+            if isinstance(value, types.MethodType):
+                assert alias.__func__ is value.__func__, name
+            else:
+                assert alias is value or alias == value, name
+
+
+for id in ccxt.exchanges:
+    first = getattr(ccxt, id)()
+    second = getattr(ccxt, id)({'apiKey': 'key', 'custom_option': 1})
+    check_aliases(second)
+    assert second.customOption == 1
+    assert first.describe() == second.cached_describe()
+    assert first.api == second.api
+    assert first.options is not second.options
+
+assert ccxt.Exchange.camelcase('fetch_ohlcv') == 'fetchOHLCV'
+assert ccxt.binance().safeFloat({'a': '1.5'}, 'a') == 1.5
+assert ccxt.binance.fetchOHLCV is ccxt.binance.fetch_ohlcv
+
+# the instances work on copies of the shared describe()
+
+first = ccxt.kraken()
+first.options['inactiveCurrencies'].append('XXX')
+first.urls['api']['public'] = 'https://example.com'
+assert 'XXX' not in ccxt.kraken().options['inactiveCurrencies']
+assert ccxt.kraken().urls['api']['public'] != 'https://example.com'
+
+# an instance with its own api defines its methods, the next default one restores the class
+
+custom = ccxt.binance({'api': {'public': {'get': ['custom/endpoint']}}})
+assert hasattr(custom, 'publicGetCustomEndpoint')
+assert ccxt.binance().api_endpoint('ping', 'public', 'GET') == {'cost': 1, 'buckets': {}}
+assert hasattr(ccxt.binance(), 'publicGetPing')
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+import calendar
+import datetime
+import os
+import random
+import re
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.base.exchange import Exchange  # noqa: E402
+
+# ----------------------------------------------------------------------------
+# iso8601 and parse8601 as they were before their fast paths, the reference of their behavior
+
+
+def legacy_iso8601(timestamp=None):
+    if timestamp is None:
+        return timestamp
+    if not isinstance(timestamp, int):
+        return None
+    if int(timestamp) < 0:
+        return None
+    try:
+        utc = datetime.datetime.utcfromtimestamp(timestamp // 1000)
+        return utc.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-6] + "{:03d}".format(int(timestamp) % 1000) + 'Z'
+    except (TypeError, OverflowError, OSError):
+        return None
+
+
+def legacy_parse8601(timestamp=None):
+    if timestamp is None:
+        return timestamp
+    yyyy = '([0-9]{4})-?'
+    mm = '([0-9]{2})-?'
+    dd = '([0-9]{2})(?:T|[\\s])?'
+    h = '([0-9]{2}):?'
+    m = '([0-9]{2}):?'
+    s = '([0-9]{2})'
+    ms = '(\\.[0-9]{1,3})?'
+    tz = '(?:(\\+|\\-)([0-9]{2})\\:?([0-9]{2})|Z)?'
+    regex = r'' + yyyy + mm + dd + h + m + s + ms + tz
+    try:
+        match = re.search(regex, timestamp, re.IGNORECASE)
+        if match is None:
+            return None
+        yyyy, mm, dd, h, m, s, ms, sign, hours, minutes = match.groups()
+        ms = ms or '.000'
+        ms = (ms + '00')[0:4]
+        msint = int(ms[1:])
+        sign = sign or ''
+        sign = int(sign + '1') * -1
+        hours = int(hours or 0) * sign
+        minutes = int(minutes or 0) * sign
+        offset = datetime.timedelta(hours=hours, minutes=minutes)
+        string = yyyy + mm + dd + h + m + s + ms + 'Z'
+        dt = datetime.datetime.strptime(string, "%Y%m%d%H%M%S.%fZ")
+        dt = dt + offset
+        return calendar.timegm(dt.utctimetuple()) * 1000 + msint
+    except (TypeError, OverflowError, OSError, ValueError):
+        return None
+
+
+def call(method, *args):
+    try:
+        return method(*args)
+    except Exception as e:
+        return type(e)
+
+
+random.seed(8601)
+
+# formatting
+
+timestamps = [None, 0, 1, 999, 1000, -1, True, False, 1.5, '1', {}, 951782400000, 253402300799999, 253402300800000, 2 ** 63]
+timestamps += [random.randint(0, 253402300799999) for i in range(0, 20000)]
+start = random.randint(0, 2000000000000)
+timestamps += [start + i * random.randint(0, 50) for i in range(0, 20000)]  # consecutive trades
+for timestamp in timestamps:
+    assert call(Exchange.iso8601, timestamp) == call(legacy_iso8601, timestamp), timestamp
+
+# parsing, all the formats and the invalid dates
+
+
+def two_digits(low, high):
+    return '%02d' % random.randint(low, high)
+
+
+strings = [None, '', 33, {}, b'2020-01-01T00:00:00Z', '3333', 'Sr90', '0000-01-01T00:00:00Z', '0001-01-01T00:00:00Z', '0001-01-01T00:00:00+00:01',
+           '0001-01-01T00:00:00-00:01', '9999-12-31T23:59:59.999Z', '9999-12-31T23:59:59.999-00:01', '2019-02-29T00:00:00Z', '2020-02-29T00:00:00Z',
+           '2020-02-30T00:00:00Z', '2020-01-01T23:59:60Z', '2020-01-01T23:59:61Z', '2020-01-01T24:00:00Z', '1986-04-26T01:23:47.06Z']
+for i in range(0, 20000):
+    date = ('%04d' % random.choice((random.randint(0, 9999), random.randint(1960, 2040)))) + random.choice(('-', '')) + two_digits(0, 13) + random.choice(('-', '')) + two_digits(0, 32)
+    time = two_digits(0, 25) + random.choice((':', '')) + two_digits(0, 61) + random.choice((':', '')) + two_digits(0, 61)
+    fraction = random.choice(('', '.' + str(random.randint(0, 9)), '.' + two_digits(0, 99), '.%03d' % random.randint(0, 999), '.1234'))
+    zone = random.choice(('', 'Z', 'z', '+' + two_digits(0, 99) + random.choice((':', '')) + two_digits(0, 99), '-' + two_digits(0, 14) + ':' + two_digits(0, 59)))
+    separator = random.choice(('T', 't', ' ', ''))
+    prefix = random.choice(('', '', 'x', '12', ' '))
+    strings.append(prefix + date + separator + time + fraction + zone)
+for string in strings:
+    assert call(Exchange.parse8601, string) == call(legacy_parse8601, string), string
+
+# round trips
+
+for timestamp in timestamps[15:]:
+    assert Exchange.parse8601(Exchange.iso8601(timestamp)) == timestamp
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+
+from decimal import Decimal
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+from ccxt.base import json_codec  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+response = b'{"price":"0.10","amount":1.10,"ts":1600000000000,"flag":true,"list":[1,2.5e-7,null]}'
+data = {'symbol': 'BTC/USDT', 'price': 0.1, 'amount': 1, 'nested': [{'a': None, 'b': True}], 'text': u'café'}
+
+available = [name for name, codec in json_codec.codecs.items() if codec is not None]
+assert 'json' in available
+
+for name in available + ['auto']:
+    exchange = ccxt.Exchange({'jsonCodec': name})
+    assert exchange.parse_json(response) == exchange.parse_json(response.decode()) == {
+        'price': '0.10', 'amount': 1.1, 'ts': 1600000000000, 'flag': True, 'list': [1, 2.5e-7, None],
+    }
+    assert exchange.parse_json('ok') is None
+    assert exchange.parse_json('{"broken"') is None
+    assert exchange.unjson(exchange.json(data)) == data
+    assert exchange.json(data).isascii()  # request bodies are signed as latin-1
+    # values the fast codecs reject are handed over to the standard library
+    assert exchange.parse_json('{"big":123456789012345678901234567890}') == {'big': 123456789012345678901234567890}
+    assert exchange.json({'big': 123456789012345678901234567890}) == '{"big":123456789012345678901234567890}'
+    for number in ('-9999999999999999999', '-9223372036854775809', '-9223372036854775808', '18446744073709551615', '1600000000000000000'):
+        assert exchange.parse_json('[' + number + ']') == [int(number)], (name, number)
+        assert type(exchange.parse_json('{"a":' + number + '}')['a']) is int
+    # the floats are written as the standard library writes them
+    floats = {'a': [1e-7, 1e16, 1.5e-7, -2.5e-10, 1e22, 5e-324, 0.1, 123.0, 1e15]}
+    assert exchange.json(floats) == ccxt.Exchange.json(floats), name
+
+assert ccxt.Exchange().json(data) == ccxt.Exchange.json(data)
+
+# the wide integers are found from a sample of every fourth character at any offset, the timestamps are not taken for them
+for offset in range(0, 8):
+    for number in ('-9223372036854775809', '18446744073709551616'):
+        text = '{"a":"' + 'x' * offset + '","b":' + number + '}'
+        assert not json_codec.exact(text) and not json_codec.exact(text.encode()), (offset, number)
+    text = '{"a":"' + 'é' * offset + '","t":[1600000000000,1600000000000000,-1600000000000000]}'
+    assert json_codec.exact(text) and json_codec.exact(text.encode())
+
+for name in ('unknown', 'ujson', 'simdjson'):
+    if name not in available:
+        try:
+            ccxt.Exchange({'jsonCodec': name})
+            assert False
+        except ccxt.NotSupported:
+            pass
+
+# exact numbers
+
+exchange = ccxt.Exchange({'jsonNumbers': 'string'})
+parsed = exchange.parse_json(response)
+assert parsed['amount'] == '1.10'
+assert parsed['ts'] == 1600000000000
+assert exchange.safe_string(parsed, 'amount') == '1.10'
+assert exchange.safe_float(parsed, 'amount') == 1.1
+assert exchange.safe_integer(exchange.parse_json('{"a":2.0}'), 'a') == 2
+assert exchange.safe_integer({'a': '2.0'}, 'a') is None  # plain strings are left as before
+
+exchange = ccxt.Exchange({'jsonNumbers': 'decimal', 'jsonCodec': 'auto'})
+parsed = exchange.parse_json(response)
+assert parsed['amount'] == Decimal('1.10')
+assert exchange.safe_string(parsed, 'amount') == '1.10'
+assert exchange.safe_float(parsed, 'amount') == 1.1
+assert exchange.safe_integer(parsed, 'amount') == 1
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+
+import copy
+import gc
+import json
+import os
+import pickle
+import random
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+from ccxt.base import market_registry  # noqa: E402
+from ccxt.base.market_registry import registries  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+
+def fetch_markets():
+    return [{
+        'id': base + 'USDT', 'symbol': base + '/USDT', 'base': base, 'quote': 'USDT', 'baseId': base, 'quoteId': 'USDT',
+        'precision': {'amount': 8, 'price': 2 if base != 'ETH' else 2.0},
+        'limits': {'amount': {'min': 0.001, 'max': None}, 'price': {'min': None, 'max': None}},
+        'info': {'symbol': base + 'USDT'},
+    } for base in ('BTC', 'ETH', 'LTC')]
+
+
+names = ('markets', 'markets_by_id', 'symbols', 'ids', 'currencies', 'currencies_by_id', 'base_currencies', 'quote_currencies')
+
+# the shared markets are the same as the markets of an instance on its own
+
+own = ccxt.binance()
+own.set_markets(fetch_markets())
+first = ccxt.binance({'sharedMarkets': True})
+first.set_markets(fetch_markets())
+second = ccxt.binance({'sharedMarkets': True, 'apiKey': 'key'})
+second.set_markets(fetch_markets())
+for name in names:
+    assert getattr(own, name) == getattr(first, name), name
+    assert getattr(first, name) is getattr(second, name), name
+assert first.marketsById is second.markets_by_id
+assert first.market_id('BTC/USDT') == 'BTCUSDT'
+
+# the equal precision and limits are one copy, the types are kept
+
+btc, eth, ltc = (first.markets[symbol] for symbol in ('BTC/USDT', 'ETH/USDT', 'LTC/USDT'))
+assert btc['precision'] is ltc['precision'] and btc['limits'] is ltc['limits']
+assert btc['precision'] is not eth['precision'] and isinstance(eth['precision']['price'], float)
+assert own.markets['BTC/USDT']['precision'] is not own.markets['LTC/USDT']['precision']
+
+# the shared precision and limits are read-only, their copies are plain dicts
+
+for change in (lambda: btc['precision'].update(amount=6), lambda: btc['limits']['amount'].pop('min'), lambda: btc['limits'].clear()):
+    try:
+        change()
+        assert False
+    except TypeError:
+        pass
+try:
+    btc['precision']['amount'] = 6
+    assert False
+except TypeError:
+    pass
+assert ltc['precision']['amount'] == 8 and ltc['limits']['amount']['min'] == 0.001
+for plain in (dict(btc['precision']), copy.deepcopy(btc['limits'])['amount'], pickle.loads(pickle.dumps(btc['limits']))['amount']):
+    plain['min'] = 1
+    assert type(plain) is dict
+assert json.loads(json.dumps(btc['limits'])) == btc['limits']
+own.markets['BTC/USDT']['precision']['amount'] = 6  # the markets that are not shared are not read-only
+
+# other markets, fees or a reload are not shared
+
+other = ccxt.binance({'sharedMarkets': True})
+other.set_markets(fetch_markets()[1:])
+assert other.markets is not first.markets and len(other.markets) == 2
+fees = ccxt.binance({'sharedMarkets': True, 'fees': {'trading': {'taker': 0.002}}})
+fees.set_markets(fetch_markets())
+assert fees.markets is not first.markets and fees.markets['BTC/USDT']['taker'] == 0.002
+second.set_markets(fetch_markets())  # the currencies loaded before are a part of the new ones
+assert second.markets is first.markets  # unchanged by the reload
+
+# the registry is released with the instances
+
+count = len(registries)
+del first, second, btc, eth, ltc
+gc.collect()
+assert len(registries) < count
+
+# the markets are keyed by a digest of their content, the source markets are not kept
+
+first, second = ccxt.binance({'sharedMarkets': True}), ccxt.binance({'sharedMarkets': True})
+first.set_markets(fetch_markets())
+markets = fetch_markets()
+markets[0]['info']['status'] = 'BREAK'
+second.set_markets(markets)
+assert second.markets is not first.markets and second.markets['BTC/USDT']['info']['status'] == 'BREAK'
+third = ccxt.binance({'sharedMarkets': True})
+third.set_markets({market['symbol']: market for market in fetch_markets()})
+assert third.markets is first.markets
+assert not hasattr(first.market_registry, 'sources')
+types = ccxt.binance({'sharedMarkets': True})
+markets = fetch_markets()
+markets[0]['precision']['amount'] = 8.0
+types.set_markets(markets)
+assert types.markets is not first.markets
+# pickled when orjson is not installed
+orjson, market_registry.orjson = market_registry.orjson, None
+digest = market_registry.MarketRegistry.fingerprint(fetch_markets())
+assert digest == market_registry.MarketRegistry.fingerprint(fetch_markets())
+assert digest != market_registry.MarketRegistry.fingerprint(markets)
+market_registry.orjson = orjson
+
+# a reload updates the markets that changed and reports them
+
+
+def reload_markets(exchange, markets, currencies=None):
+    # the same as the full rebuild without the markets loaded before
+    rebuilt = ccxt.binance()
+    rebuilt.currencies = ccxt.Exchange.deep_extend(exchange.currencies)
+    rebuilt.set_markets([dict(market) for market in markets], currencies)
+    exchange.set_markets(markets, currencies)
+    for name in ('markets', 'markets_by_id', 'symbols', 'ids', 'currencies', 'currencies_by_id', 'base_currencies', 'quote_currencies'):
+        assert getattr(exchange, name) == getattr(rebuilt, name), name
+
+
+for shared in (False, True):
+    changes = []
+    exchange = ccxt.binance({'sharedMarkets': shared, 'onMarketsChange': changes.append})
+    exchange.set_markets(fetch_markets())
+    btc = exchange.markets['BTC/USDT']
+    indexes = exchange.markets, exchange.markets_by_id, exchange.symbols, exchange.ids
+    reload_markets(exchange, fetch_markets())
+    assert changes == [] and exchange.markets['BTC/USDT'] is btc
+    assert all(index is previous for index, previous in zip((exchange.markets, exchange.markets_by_id, exchange.symbols, exchange.ids), indexes))
+    # the same symbols and ids are not sorted again
+    markets = fetch_markets()
+    markets[0]['info'] = {'symbol': 'BTCUSDT', 'status': 'BREAK'}
+    symbols, ids = exchange.symbols, exchange.ids
+    reload_markets(exchange, markets)
+    assert exchange.symbols is symbols and exchange.ids is ids and exchange.markets_by_id['BTCUSDT']['info']['status'] == 'BREAK'
+    assert list(changes.pop()['changed']) == ['BTC/USDT']
+    reload_markets(exchange, fetch_markets())
+    assert list(changes.pop()['changed']) == ['BTC/USDT']
+    btc = exchange.markets['BTC/USDT']
+    markets = fetch_markets()
+    markets[1]['precision'] = {'amount': 6, 'price': 2}
+    markets[2] = dict(markets[2], id='LTCUSD', symbol='LTC/USD', quote='USD', quoteId='USD')
+    markets.append(dict(markets[0], id='XRPUSDT', symbol='XRP/USDT', base='XRP', baseId='XRP'))
+    reload_markets(exchange, markets)
+    assert exchange.markets['BTC/USDT'] is btc
+    assert sorted(changes[0]['added']) == ['LTC/USD', 'XRP/USDT']
+    assert list(changes[0]['removed']) == ['LTC/USDT'] and changes[0]['removed']['LTC/USDT']['id'] == 'LTCUSDT'
+    assert list(changes[0]['changed']) == ['ETH/USDT'] and changes[0]['changed']['ETH/USDT']['precision']['amount'] == 6
+    assert 'LTCUSDT' not in exchange.markets_by_id and exchange.markets_by_id['LTCUSD']['symbol'] == 'LTC/USD'
+    assert 'LTC' in exchange.currencies and 'USD' in exchange.currencies  # the currencies are never removed
+
+# the markets reloaded with other fees are extended again
+
+exchange = ccxt.binance()
+exchange.set_markets(fetch_markets())
+exchange.fees['trading'] = dict(exchange.fees['trading'], percentage=False)
+exchange.set_markets(fetch_markets())
+assert all(market['percentage'] is False for market in exchange.markets.values())
+
+# random listings, delistings and changes
+
+random.seed(1)
+exchange = ccxt.binance()
+listed = fetch_markets()
+exchange.set_markets([dict(market) for market in listed])
+for i in range(0, 50):
+    listed = [market for market in listed if random.random() > 0.1]
+    for market in random.sample(listed, min(2, len(listed))):
+        market['precision'] = {'amount': random.randint(0, 8), 'price': 2}
+    base = random.choice(('BTC', 'ETH', 'XRP', 'DOT', 'SOL'))
+    quote = random.choice(('USDT', 'USD', 'EUR'))
+    if not any(market['symbol'] == base + '/' + quote for market in listed):
+        listed.append(dict(listed[0] if listed else fetch_markets()[0], id=base + quote, symbol=base + '/' + quote, base=base, baseId=base, quote=quote, quoteId=quote))
+    reload_markets(exchange, [dict(market) for market in listed])
+
+# the fetched currencies are merged with the ones loaded before
+
+exchange = ccxt.binance()
+currencies = {'BTC': {'id': 'btc', 'code': 'BTC', 'precision': 8}, 'USDT': {'id': 'usdt', 'code': 'USDT', 'precision': 6}}
+exchange.set_markets(fetch_markets(), currencies)
+exchange.currencies['BTC']['name'] = 'Bitcoin'
+bitcoin = exchange.currencies['BTC']
+reload_markets(exchange, fetch_markets(), ccxt.Exchange.deep_extend(currencies, {'USDT': {'precision': 2}, 'ETH': {'id': 'eth', 'code': 'ETH'}}))
+assert exchange.currencies['BTC'] is bitcoin and exchange.currencies['USDT']['precision'] == 6
+assert exchange.currencies_by_id['eth']['code'] == 'ETH'
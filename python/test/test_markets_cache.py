@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import threading
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+import ccxt.async_support  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+directory = tempfile.mkdtemp()
+urls = {'urls': {'api': {'public': 'https://api.example.com'}, 'test': {'public': 'https://testnet.example.com'}}}
+
+
+def market(base, quote):
+    return {
+        'id': base + quote, 'symbol': base + '/' + quote, 'base': base, 'quote': quote, 'baseId': base, 'quoteId': quote,
+        'active': True, 'precision': {'amount': 8, 'price': 2}, 'limits': {'amount': {'min': 0.001}}, 'info': {},
+    }
+
+
+class counting(ccxt.Exchange):
+
+    id = 'counting'
+    quotes = ['USDT']
+
+    def describe(self):
+        return self.deep_extend(super(counting, self).describe(), urls)
+
+    def fetch_markets(self, params={}):
+        with open(os.path.join(directory, 'fetched'), 'a') as file:
+            file.write('.')
+        return [market('BTC', quote) for quote in self.quotes]
+
+
+class async_counting(ccxt.async_support.Exchange):
+
+    id = 'counting'
+    quotes = ['USDT']
+
+    def describe(self):
+        return self.deep_extend(super(async_counting, self).describe(), urls)
+
+    async def fetch_markets(self, params={}):
+        await asyncio.sleep(0.01)
+        return [market('BTC', quote) for quote in self.quotes]
+
+
+def fetched():
+    path = os.path.join(directory, 'fetched')
+    count = len(open(path).read()) if os.path.exists(path) else 0
+    if os.path.exists(path):
+        os.unlink(path)
+    return count
+
+
+def load(config={}):
+    exchange = counting(ccxt.Exchange.extend({'marketsCache': directory}, config))
+    exchange.load_markets()
+    return exchange
+
+
+try:
+    # the markets are fetched once and read from the file by the next instances
+
+    assert list(load().markets) == ['BTC/USDT']
+    assert fetched() == 1
+    exchange = load()
+    assert fetched() == 0
+    assert exchange.markets['BTC/USDT']['precision']['price'] == 2
+    assert exchange.markets_by_id['BTCUSDT']['symbol'] == 'BTC/USDT'
+    assert not exchange.markets['BTC/USDT']['info']
+
+    # the options and the sandbox mode have their own files
+
+    load({'options': {'defaultType': 'swap'}})
+    assert fetched() == 1
+    sandbox = counting({'marketsCache': directory})
+    sandbox.set_sandbox_mode(True)
+    sandbox.load_markets()
+    assert fetched() == 1
+    assert len([name for name in os.listdir(directory) if name.endswith('.json.z')]) == 3
+
+    # the options changed at runtime that do not change the markets share the file
+
+    exchange = load()
+    exchange.options['timeDifference'] = 1234
+    exchange.options['adjustForTimeDifference'] = True
+    assert exchange.get_markets_cache().path == load().get_markets_cache().path
+    assert fetched() == 0
+    exchange.options['defaultType'] = 'swap'
+    assert exchange.get_markets_cache().path == load({'options': {'defaultType': 'swap'}}).get_markets_cache().path
+    assert exchange.get_markets_cache().path != load().get_markets_cache().path
+    assert fetched() == 0
+    custom = load({'marketsCacheOptions': ['timeDifference'], 'options': {'timeDifference': 1}})
+    assert fetched() == 1
+    assert custom.get_markets_cache().path != load().get_markets_cache().path
+
+    # an explicit reload and an expired file are fetched again
+
+    exchange = load()
+    exchange.load_markets(True)
+    assert fetched() == 1
+    load({'marketsCacheTTL': 0})
+    assert fetched() == 1
+    counting({'marketsCache': False}).load_markets()
+    assert fetched() == 1
+
+    # the processes refreshing an expired file at once fetch the markets once
+
+    def worker():
+        load({'marketsCacheTTL': 1000, 'quotes': ['USDT', 'EUR']})
+
+    for name in os.listdir(directory):
+        os.unlink(os.path.join(directory, name))
+    processes = [multiprocessing.Process(target=worker) for i in range(0, 4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+    assert fetched() == 1
+    assert not [name for name in os.listdir(directory) if name.endswith('.tmp')]
+
+    # async instances start from an expired file and refresh it in the background
+
+    async def test_async():
+        exchange = async_counting({'marketsCache': directory, 'marketsCacheTTL': 0, 'quotes': ['USDT', 'EUR', 'BUSD']})
+        # the file io of the cache runs off the event loop
+        threads = []
+        cache = exchange.get_markets_cache()
+        for name in ('read', 'write', 'lock', 'unlock'):
+            def traced(*args, method=getattr(cache, name)):
+                threads.append(threading.current_thread())
+                return method(*args)
+            setattr(cache, name, traced)
+        exchange.get_markets_cache = lambda: cache
+        markets = await exchange.load_markets()
+        assert sorted(markets) == ['BTC/EUR', 'BTC/USDT']
+        await exchange.markets_refreshing
+        assert sorted(exchange.markets) == ['BTC/BUSD', 'BTC/EUR', 'BTC/USDT']
+        assert len(threads) == 4 and threading.main_thread() not in threads
+        fresh = async_counting({'marketsCache': directory, 'marketsCacheTTL': 1000})
+        assert len(await fresh.load_markets()) == 3
+        assert fresh.markets_refreshing is None
+        await exchange.close()
+        await fresh.close()
+
+    asyncio.get_event_loop().run_until_complete(test_async())
+
+    # an unreadable file is ignored
+
+    path = load({'marketsCacheTTL': 1000}).get_markets_cache().path
+    open(path, 'wb').write(b'not compressed')
+    fetched()
+    assert len(load().markets) == 1
+    assert fetched() == 1
+finally:
+    shutil.rmtree(directory)
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+
+import calendar
+import datetime
+import math
+import os
+import random
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+from ccxt.base import ohlcv  # noqa: E402
+from ccxt.base.ohlcv import ohlcv_columns, ohlcv_array, ohlcv_rows  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+
+def opening_of(timestamp, ms, timeframe=None):
+    """The reference opening, the Monday of the week or the first day of the month of a date"""
+    date = datetime.datetime.utcfromtimestamp(timestamp // 1000)
+    if timeframe == '1w':
+        return calendar.timegm((date - datetime.timedelta(days=date.weekday())).date().timetuple()) * 1000
+    if timeframe in ('1M', '3M', '1y'):
+        months = {'1M': 1, '3M': 3, '1y': 12}[timeframe]
+        month = (date.month - 1) // months * months + 1
+        return calendar.timegm((date.year, month, 1, 0, 0, 0)) * 1000
+    return timestamp // ms * ms
+
+
+def resample(ohlcvs, ms, timeframe=None):
+    """The reference, one candle at a time"""
+    result = []
+    for candle in sorted(ohlcvs, key=lambda candle: candle[0]):
+        opening = opening_of(candle[0], ms, timeframe)
+        if not result or result[-1][0] != opening:
+            result.append([opening, candle[1], candle[2], candle[3], candle[4], candle[5] or 0])
+        else:
+            last = result[-1]
+            last[2] = candle[2] if last[2] is None else last[2] if candle[2] is None else max(last[2], candle[2])
+            last[3] = candle[3] if last[3] is None else last[3] if candle[3] is None else min(last[3], candle[3])
+            last[4] = candle[4]
+            last[5] += candle[5] or 0
+    return result
+
+
+def build(trades, ms, timeframe=None):
+    """The reference, one trade at a time"""
+    result = []
+    for trade in sorted(trades, key=lambda trade: trade['timestamp']):
+        opening = opening_of(trade['timestamp'], ms, timeframe)
+        price = trade['price']
+        if not result or result[-1][0] != opening:
+            result.append([opening, price, price, price, price, trade['amount'], 1])
+        else:
+            last = result[-1]
+            last[2] = max(last[2], price)
+            last[3] = min(last[3], price)
+            last[4] = price
+            last[5] += trade['amount']
+            last[6] += 1
+    return result
+
+
+def same(rows, expected):
+    assert len(rows) == len(expected), (len(rows), len(expected))
+    for row, candle in zip(rows, expected):
+        assert len(row) == len(candle), (row, candle)
+        for value, reference in zip(row, candle):
+            # the sums of numpy are pairwise
+            assert value == reference or math.isclose(value, reference, rel_tol=1e-12), (row, candle)
+
+
+random.seed(18)
+exchange = ccxt.Exchange()
+start = 1600000000000 // 60000 * 60000
+candles = []
+for i in range(0, 3000):
+    if random.random() < 0.05:
+        continue  # a gap
+    low = random.uniform(100, 200)
+    candle = [start + i * 60000, low + random.random(), low + 2, low, low + random.random(), random.uniform(0, 10)]
+    if random.random() < 0.02:
+        candle[2] = candle[3] = candle[5] = None  # no trades
+    candles.append(candle)
+trades = [{'timestamp': start + random.randint(0, 10 ** 7), 'price': random.uniform(100, 200), 'amount': random.uniform(0, 2)} for i in range(0, 5000)]
+# daily candles and trades over years, for the weeks and the months of the calendar
+days = [[start + i * 86400000, 1 + random.random(), 3, 0.5, 1 + random.random(), random.uniform(0, 10)] for i in range(0, 1200)]
+months = [{'timestamp': start + random.randint(0, 1200 * 86400000), 'price': random.uniform(100, 200), 'amount': random.uniform(0, 2)} for i in range(0, 5000)]
+
+# with and without numpy
+numpy = ohlcv.numpy
+for module_numpy in ((numpy, None) if numpy else (None,)):
+    ohlcv.numpy = module_numpy
+    try:
+        for timeframe in ('5m', '15m', '1h', '1d'):
+            ms = exchange.parse_timeframe(timeframe) * 1000
+            expected = resample(candles, ms)
+            same(exchange.resample_ohlcv(candles, timeframe), expected)
+            same(ohlcv_rows(exchange.resample_ohlcv(ohlcv_columns(candles), timeframe)), expected)
+            same(exchange.resample_ohlcv(list(reversed(candles)), timeframe), expected)
+            same(ohlcv_rows(exchange.build_ohlcvc_columns(trades, timeframe)), build(trades, ms))
+        for timeframe in ('1w', '1M', '3M', '1y'):
+            ms = exchange.parse_timeframe(timeframe) * 1000
+            same(exchange.resample_ohlcv(days, timeframe), resample(days, ms, timeframe))
+            same(ohlcv_rows(exchange.build_ohlcvc_columns(months, timeframe)), build(months, ms, timeframe))
+        weeks = exchange.resample_ohlcv(days, '1w')
+        assert all(datetime.datetime.utcfromtimestamp(candle[0] // 1000).weekday() == 0 for candle in weeks)
+        assert all(datetime.datetime.utcfromtimestamp(candle[0] // 1000).day == 1 for candle in exchange.resample_ohlcv(days, '1M'))
+        # the candles without a timestamp are dropped
+        hour = start // 3600000 * 3600000
+        rows = [[hour, 1, 2, 0.5, 1.5, 10], [None, 1, 2, 0.5, 1.5, 10], [hour + 60000, 1, 2, 0.5, 1.5, 10]]
+        assert ohlcv_rows(ohlcv_columns(rows)) == [rows[0], rows[2]]
+        columns = {field: [row[i] for row in rows] for i, field in enumerate(ohlcv.ohlcv_fields)}
+        assert ohlcv_rows(ohlcv_columns(columns)) == [rows[0], rows[2]]
+        assert exchange.resample_ohlcv(rows, '1h') == [[hour, 1, 2, 0.5, 1.5, 20]]
+        # since and limit
+        since = start + 5 * 10 ** 6
+        columns = exchange.build_ohlcvc_columns(trades, '1m', since, 10)
+        same(ohlcv_rows(columns), build([trade for trade in trades if trade['timestamp'] >= since], 60000)[0:10])
+        assert ohlcv_rows(exchange.build_ohlcvc_columns([], '1m')) == []
+        assert exchange.resample_ohlcv([], '1h') == []
+        rows = [[start, 1, 2, 0.5, 1.5, 10]]
+        assert ohlcv_rows(ohlcv_columns(rows)) == rows
+    finally:
+        ohlcv.numpy = numpy
+
+# the structured array
+
+if numpy is not None:
+    array = ohlcv_array(candles)
+    assert array.dtype.names == ohlcv.ohlcv_fields
+    assert array['timestamp'].dtype == numpy.int64
+    assert array['timestamp'].tolist() == [candle[0] for candle in candles]
+    assert ohlcv_rows(ohlcv_columns(array)) == candles
+    resampled = exchange.resample_ohlcv(array, '15m')
+    assert resampled.dtype == array.dtype
+    same(ohlcv_rows(ohlcv_columns(resampled)), resample(candles, 900000))
+    # the candles of some exchanges have more values
+    assert ohlcv_rows(ohlcv_columns([candle + [1, 2] for candle in candles])) == candles
+
+# without numpy the structured array is not supported and the columns are lists
+
+ohlcv.numpy = None
+try:
+    assert ohlcv_columns(candles)['open'] == [candle[1] for candle in candles]
+    try:
+        ohlcv_array(candles)
+        assert False
+    except ccxt.NotSupported:
+        pass
+finally:
+    ohlcv.numpy = numpy
+
+# fetch_ohlcv_columns and fetch_ohlcv_array convert fetch_ohlcv
+
+
+class fetching(ccxt.Exchange):
+
+    def fetch_ohlcv(self, symbol, timeframe='1m', since=None, limit=None, params={}):
+        return candles
+
+
+exchange = fetching()
+assert ohlcv_rows(exchange.fetch_ohlcv_columns('BTC/USDT')) == candles
+if numpy is not None:
+    assert exchange.fetchOHLCVArray('BTC/USDT')['volume'].shape == (len(candles),)
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os
+import random
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+import ccxt.async_support  # noqa: E402
+
+# ----------------------------------------------------------------------------
+# an exchange that pages its history the ways the real ones do
+
+random.seed(19)
+start = 1600000000000
+now = start + 10 * 3600000
+timestamps = sorted(start + random.randint(0, 10 * 3600000 - 1) for i in range(0, 3000))
+# a quiet hour and many trades in one millisecond
+timestamps = [timestamp for timestamp in timestamps if not (start + 3 * 3600000 <= timestamp < start + 4 * 3600000)]
+timestamps += [start + 5 * 3600000] * 15
+timestamps.sort()
+trades = [{'id': str(i), 'timestamp': timestamp, 'info': {'i': i}} for i, timestamp in enumerate(timestamps)]
+candles = [[timestamp, 1.0, 2.0, 0.5, 1.5, 10.0] for timestamp in range(start, now, 60000)]
+
+
+def page_trades(since, limit, params, calls, backwards=False):
+    calls.append((since, params))
+    limit = limit or 100
+    if 'fromId' in params:  # by id, inclusive
+        return [trade for trade in trades if int(trade['id']) >= int(params['fromId'])][0:limit]
+    if 'ofs' in params:  # by offset, the most recent first
+        return list(reversed(trades))[params['ofs']:params['ofs'] + limit]
+    if backwards:  # the most recent from since to the end in seconds, as poloniex
+        end = params['end'] * 1000 if 'end' in params else now
+        return [trade for trade in trades if (since or 0) <= trade['timestamp'] <= end][-limit:]
+    if since is None:
+        return trades[-limit:]
+    # by the hour, as the aggTrades of binance
+    return [trade for trade in trades if since <= trade['timestamp'] <= since + 3600000][0:limit]
+
+
+def page_candles(since, limit):
+    since = start if since is None else since
+    return [candle for candle in candles if candle[0] >= since][0:limit or 50]
+
+
+class paging(ccxt.Exchange):
+
+    def __init__(self, config={}):
+        super(paging, self).__init__(config)
+        self.calls = []
+
+    def milliseconds(self):
+        return now
+
+    def fetch_trades(self, symbol, since=None, limit=None, params={}):
+        return page_trades(since, limit, params, self.calls, self.id == 'poloniex')
+
+    def fetch_my_trades(self, symbol=None, since=None, limit=None, params={}):
+        return page_trades(since, limit, params, self.calls)
+
+    def fetch_ohlcv(self, symbol, timeframe='1m', since=None, limit=None, params={}):
+        self.calls.append((since, params))
+        return page_candles(since, limit)
+
+
+class async_paging(ccxt.async_support.Exchange):
+
+    def __init__(self, config={}):
+        super(async_paging, self).__init__(config)
+        self.calls = []
+        self.running = 0
+        self.most = 0
+        self.cancelled = 0
+        self.delay = 0  # of the windows after the first one
+
+    def milliseconds(self):
+        return now
+
+    async def fetch_trades(self, symbol, since=None, limit=None, params={}):
+        self.running += 1
+        self.most = max(self.most, self.running)
+        try:
+            await asyncio.sleep(self.delay if since is not None and since >= start + 3600000 else 0.001)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.running -= 1
+        return page_trades(since, limit, params, self.calls)
+
+    async def fetch_ohlcv(self, symbol, timeframe='1m', since=None, limit=None, params={}):
+        await asyncio.sleep(0.001)
+        return page_candles(since, limit)
+
+
+def ids(items):
+    return [item['id'] for item in items]
+
+
+within = [trade for trade in trades if trade['timestamp'] >= start + 3600000]
+
+# by the hour, through the quiet hour and the crowded millisecond
+
+exchange = paging({'id': 'binance', 'options': {}})
+pages = list(exchange.paginate('fetch_trades', 'BTC/USDT', start, 20))
+assert all(len(page) for page in pages)
+assert ids(exchange.fetch_history('fetch_trades', 'BTC/USDT', start, 20)) == ids(trades)
+assert ids(exchange.fetch_history('fetch_trades', 'BTC/USDT', start + 3600000, 20)) == ids(within)
+assert ids(exchange.fetchHistory('fetch_trades', 'BTC/USDT', start, 20, {}, start + 2 * 3600000)) == ids([trade for trade in trades if trade['timestamp'] < start + 2 * 3600000])
+
+# by id, by offset and backwards
+
+assert ids(exchange.fetch_history('fetch_my_trades', 'BTC/USDT', None, 40, {'fromId': '0'})) == ids(trades)
+exchange = paging({'id': 'kraken'})
+history = exchange.fetch_history('fetch_my_trades', None, None, 30)
+# the items of one millisecond are in the order of the pages, the most recent first
+assert sorted(ids(history)) == sorted(ids(trades))
+assert [trade['timestamp'] for trade in history] == timestamps
+exchange = paging({'id': 'poloniex'})
+assert ids(exchange.fetch_history('fetch_trades', 'BTC/USDT', start + 3600000, 50)) == ids(within)
+
+# the options of an exchange override the strategies
+
+exchange = paging({'id': 'poloniex', 'options': {'paginate': {'fetch_trades': {'strategy': 'id', 'key': 'fromId'}}}})
+assert ids(exchange.fetch_history('fetch_trades', 'BTC/USDT', None, 64, {'fromId': '0'})) == ids(trades)
+
+# without a window an empty page ends the history, and an exchange that ignores since ends after its repeated page
+
+exchange = paging({'id': 'unknown'})
+assert ids(exchange.fetch_history('fetch_trades', 'BTC/USDT', start, 20)) == ids([trade for trade in trades if trade['timestamp'] < start + 3 * 3600000])
+exchange.fetch_trades = lambda symbol, since=None, limit=None, params={}: trades[-20:]
+assert ids(exchange.fetch_history('fetch_trades', 'BTC/USDT', None, 20)) == ids(trades[-20:])
+
+# candles
+
+exchange = paging()
+assert exchange.fetch_history('fetch_ohlcv', 'BTC/USDT', start, 50, {}, None, '1m') == candles
+assert exchange.fetch_history('fetch_ohlcv', 'BTC/USDT', start + 60000 * 7, 50, {}, start + 60000 * 100, '1m') == candles[7:100]
+
+# concurrently in windows, in order and without repeated items
+
+
+async def test_async():
+    exchange = async_paging({'id': 'binance', 'rateLimit': 100})
+    try:
+        assert ids(await exchange.fetch_history('fetch_trades', 'BTC/USDT', start, 20)) == ids(trades)
+        assert exchange.most > 1
+        # without a rate limit
+        exchange.rateLimit = 0
+        exchange.most = 0
+        assert ids(await exchange.fetch_history('fetch_trades', 'BTC/USDT', start, 20)) == ids(trades)
+        assert exchange.most == 4
+        exchange.rateLimit = 100
+        previous = None
+        async for page in exchange.paginate('fetch_trades', 'BTC/USDT', start + 3600000, 20, concurrency=3):
+            assert previous is None or page[0]['timestamp'] >= previous
+            previous = page[-1]['timestamp']
+        assert await exchange.fetch_history('fetch_ohlcv', 'BTC/USDT', start, 50, {}, None, '1m') == candles
+        # without since the pages are sequential
+        exchange.most = 0
+        assert ids(await exchange.fetch_history('fetch_trades', 'BTC/USDT', None, 20)) == ids(trades[-20:])
+        assert exchange.most == 1
+        # the windows are fetched at most concurrency ahead of the consumer, breaking out cancels the windows in progress
+        exchange.calls = []
+        exchange.delay = 10
+        pages = exchange.paginate('fetch_trades', 'BTC/USDT', start, 20, concurrency=2)
+        async for page in pages:
+            await asyncio.sleep(0.05)
+            break
+        assert exchange.running == 2 and len(asyncio.all_tasks()) == 3  # with this one
+        assert sorted(set((since - start) // 3600000 for since, params in exchange.calls)) == [0]
+        await pages.aclose()
+        await asyncio.sleep(0)
+        assert exchange.cancelled == 2 and exchange.running == 0
+    finally:
+        await exchange.close()
+
+
+asyncio.get_event_loop().run_until_complete(test_async())
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import itertools
+import os
+import sys
+
+from decimal import Decimal
+from numbers import Number
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.base.exchange import Exchange  # noqa: E402
+from ccxt.base.json_codec import NumberString  # noqa: E402
+
+# ----------------------------------------------------------------------------
+# the safe methods as they were before their fast paths, the reference of their behavior
+
+
+class Legacy(object):
+
+    @staticmethod
+    def key_exists(dictionary, key):
+        if dictionary is None or key is None:
+            return False
+        if isinstance(dictionary, list):
+            if isinstance(key, int) and 0 <= key and key < len(dictionary):
+                return dictionary[key] is not None
+            else:
+                return False
+        if key in dictionary:
+            return dictionary[key] is not None
+        return False
+
+    @staticmethod
+    def safe_float(dictionary, key, default_value=None):
+        value = default_value
+        try:
+            if Legacy.key_exists(dictionary, key):
+                value = float(dictionary[key])
+        except ValueError as e:
+            value = default_value
+        return value
+
+    @staticmethod
+    def safe_string(dictionary, key, default_value=None):
+        return str(dictionary[key]) if Legacy.key_exists(dictionary, key) else default_value
+
+    @staticmethod
+    def safe_string_lower(dictionary, key, default_value=None):
+        return str(dictionary[key]).lower() if Legacy.key_exists(dictionary, key) else default_value
+
+    @staticmethod
+    def safe_string_upper(dictionary, key, default_value=None):
+        return str(dictionary[key]).upper() if Legacy.key_exists(dictionary, key) else default_value
+
+    @staticmethod
+    def safe_integer(dictionary, key, default_value=None):
+        if not Legacy.key_exists(dictionary, key):
+            return default_value
+        value = dictionary[key]
+        if isinstance(value, Number) or (isinstance(value, str) and value.isnumeric()):
+            return int(value)
+        if isinstance(value, NumberString):
+            return int(float(value))
+        return default_value
+
+    @staticmethod
+    def safe_integer_product(dictionary, key, factor, default_value=None):
+        if not Legacy.key_exists(dictionary, key):
+            return default_value
+        value = dictionary[key]
+        if isinstance(value, Number):
+            return int(value * factor)
+        elif isinstance(value, str):
+            try:
+                return int(float(value) * factor)
+            except ValueError:
+                pass
+        return default_value
+
+    @staticmethod
+    def safe_timestamp(dictionary, key, default_value=None):
+        return Legacy.safe_integer_product(dictionary, key, 1000, default_value)
+
+    @staticmethod
+    def safe_value(dictionary, key, default_value=None):
+        return dictionary[key] if Legacy.key_exists(dictionary, key) else default_value
+
+    @staticmethod
+    def safe_either(method, dictionary, key1, key2, default_value=None):
+        value = method(dictionary, key1)
+        return value if value is not None else method(dictionary, key2, default_value)
+
+
+for name in ('safe_float', 'safe_string', 'safe_string_lower', 'safe_string_upper', 'safe_integer', 'safe_value'):
+    setattr(Legacy, name + '_2', staticmethod(lambda dictionary, key1, key2, default_value=None, name=name: Legacy.safe_either(getattr(Legacy, name), dictionary, key1, key2, default_value)))
+Legacy.safe_integer_product_2 = staticmethod(lambda dictionary, key1, key2, factor, default_value=None: Legacy.safe_either(lambda d, k, v=None: Legacy.safe_integer_product(d, k, factor, v), dictionary, key1, key2, default_value))
+Legacy.safe_timestamp_2 = staticmethod(lambda dictionary, key1, key2, default_value=None: Legacy.safe_integer_product_2(dictionary, key1, key2, 1000, default_value))
+
+
+def call(method, *args):
+    """The result or the type of the exception"""
+    try:
+        result = method(*args)
+        return type(result), result
+    except Exception as e:
+        return type(e)
+
+
+values = [
+    None, 0, 1, -7, 2 ** 70, 1.5, -0.0, float('inf'), float('nan'), True, False, Decimal('1.25'), Decimal('NaN'),
+    '', '0', '12', '-12', '1.5', '1e3', 'abc', 'ABC', ' 3 ', '²', '١٢', NumberString('1.75'), NumberString('8'),
+    [], [1], {}, {'a': 1}, (1, 2), b'12',
+]
+keys = [None, 'a', 'b', 'missing', 0, 1, 2, -1, 10, True, False, 1.0, (1,), ['unhashable']]
+containers = [None, 'a', 5, (None, 'a', 'b'), collections.OrderedDict([('a', '1.5'), ('b', None)])]
+for first, second in itertools.product(values, repeat=2):
+    containers.append({'a': first, 'b': second, None: first, 0: second, 1: first})
+    containers.append([first, second, None])
+
+one_key = ('safe_float', 'safe_string', 'safe_string_lower', 'safe_string_upper', 'safe_integer', 'safe_timestamp', 'safe_value')
+two_keys = ('safe_float_2', 'safe_string_2', 'safe_string_lower_2', 'safe_string_upper_2', 'safe_integer_2', 'safe_timestamp_2', 'safe_value_2')
+
+checked = 0
+for container in containers:
+    for key in keys:
+        for name in one_key:
+            for args in ((container, key), (container, key, 'default')):
+                expected = call(getattr(Legacy, name), *args)
+                actual = call(getattr(Exchange, name), *args)
+                # nan != nan
+                assert repr(expected) == repr(actual), (name, args, expected, actual)
+                checked += 1
+        for factor in (1, 0.001):
+            assert repr(call(Legacy.safe_integer_product, container, key, factor)) == repr(call(Exchange.safe_integer_product, container, key, factor))
+    for key1, key2 in itertools.product(keys[:6], repeat=2):
+        for name in two_keys:
+            expected = call(getattr(Legacy, name), container, key1, key2, 'default')
+            actual = call(getattr(Exchange, name), container, key1, key2, 'default')
+            assert repr(expected) == repr(actual), (name, container, key1, key2, expected, actual)
+            checked += 1
+        assert repr(call(Legacy.safe_integer_product_2, container, key1, key2, 10)) == repr(call(Exchange.safe_integer_product_2, container, key1, key2, 10))
+
+assert checked > 100000
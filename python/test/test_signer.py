@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import base64
+import hashlib
+import os
+import random
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+import ccxt.async_support  # noqa: E402
+from ccxt.base.exchange import Exchange  # noqa: E402
+from ccxt.base.signer import Signer, eddsa  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+random.seed(2104)
+
+# the signer gives the signatures of the static methods
+
+signer = Signer(Exchange)
+algorithms = [hashlib.md5, hashlib.sha1, hashlib.sha256, hashlib.sha384, hashlib.sha512, 'sha256']
+for i in range(0, 2000):
+    secret = bytes(bytearray(random.getrandbits(8) for j in range(0, random.choice((0, 16, 32, 64, 65, 128, 200)))))
+    request = bytes(bytearray(random.getrandbits(8) for j in range(0, random.randint(0, 300))))
+    algorithm = random.choice(algorithms)
+    digest = random.choice(('hex', 'base64', 'binary'))
+    assert signer.hmac(request, secret, algorithm, digest) == Exchange.hmac(request, secret, algorithm, digest)
+    for alg in ('HS256', 'HS384', 'HS512'):
+        payload = {'access_key': 'key', 'nonce': i, 'query': request.hex()}
+        assert signer.jwt(payload, secret, alg) == Exchange.jwt(payload, secret, alg)
+assert len(signer.contexts) <= signer.size
+
+# the decoded secret is that of the secret of the exchange
+
+secret = base64.b64encode(b'secret' * 8).decode()
+other = base64.b64encode(b'other' * 8).decode()
+signer.check(secret)
+assert signer.base64_to_binary(secret) == b'secret' * 8
+assert signer.base64_to_binary(secret) is signer.base64_to_binary(secret)
+assert signer.base64_to_binary(other) == b'other' * 8
+signer.check(other)
+assert not signer.contexts and not signer.decoded
+assert signer.base64_to_binary(other) == b'other' * 8
+assert signer.base64_to_binary(secret) == b'secret' * 8
+apiKey = Exchange.binary_to_base58(b'key' * 10)
+signer.check(other, apiKey)
+assert signer.base58_to_binary(apiKey) == Exchange.base58_to_binary(apiKey)
+assert signer.base58_to_binary(apiKey) is signer.base58_to_binary(apiKey)
+
+# the loaded private keys
+
+if eddsa is not None:
+    for i in range(0, 50):
+        key = bytes(bytearray(random.getrandbits(8) for j in range(0, 32))).hex()
+        request = bytes(bytearray(random.getrandbits(8) for j in range(0, random.randint(0, 300)))).hex()
+        assert signer.eddsa(request, key) == Exchange.eddsa(request, key)
+        assert signer.eddsa(request, key.upper()) == Exchange.eddsa(request, key)
+
+pem = None
+try:
+    from cryptography.hazmat.backends import default_backend
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    key = rsa.generate_private_key(public_exponent=65537, key_size=1024, backend=default_backend())
+    pem = key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption())
+except ImportError:
+    pass
+if pem is not None:
+    for alg in ('RS256', 'RS384', 'RS512'):
+        assert signer.rsa('request', pem, alg) == Exchange.rsa('request', pem, alg)
+        assert signer.jwt({'request': alg}, pem, alg) == Exchange.jwt({'request': alg}, pem, alg)
+    assert ('rsa', pem) in signer.keys
+    signer.check(secret)
+    assert not signer.keys
+
+# the requests of the exchanges are signed as with the static methods, before and after a change of the credentials
+
+
+def credentials(secret):
+    return {
+        'apiKey': 'key',
+        'secret': secret,
+        'uid': '123',
+        'password': 'password',
+        'login': 'login',
+        'privateKey': '1a' * 32,
+        'walletAddress': '0x' + '1a' * 20,
+        'token': 'token',
+    }
+
+
+def freeze(exchange):
+    exchange.nonce = lambda: 1600000000000
+    exchange.milliseconds = lambda: 1600000000000
+    exchange.seconds = lambda: 1600000000
+    exchange.microseconds = lambda: 1600000000000000
+    exchange.uuid = lambda: 'uuid'
+    exchange.uuid22 = lambda *args: 'uuid22'
+    exchange.uuid16 = lambda *args: 'uuid16'
+    return exchange
+
+
+def private_endpoint(api, prefix=()):
+    """The (api, method, path) of the first private endpoint of an api"""
+    for key, value in api.items():
+        if not isinstance(value, dict):
+            continue
+        for method, paths in value.items():
+            if method.lower() in ('get', 'post', 'put', 'delete') and isinstance(paths, (list, dict)) and paths:
+                name = '/'.join(prefix + (key,))
+                if 'private' in name.lower() or 'trade' in name.lower():
+                    return (key if not prefix else list(prefix + (key,))), method.upper(), list(paths)[0]
+        endpoint = private_endpoint(value, prefix + (key,))
+        if endpoint is not None:
+            return endpoint
+    return None
+
+
+def sign(exchange, endpoint):
+    api, method, path = endpoint
+    exchange.signer.check(exchange.secret, exchange.apiKey)
+    try:
+        return exchange.sign(path, api, method, {'symbol': 'BTC/USDT', 'amount': 1})
+    except Exception as e:
+        return type(e)
+
+
+signed = 0
+for id in ccxt.exchanges:
+    exchange = freeze(getattr(ccxt, id)(credentials(secret)))
+    static = freeze(getattr(ccxt, id)(credentials(secret)))
+    for name in ('hmac', 'jwt', 'rsa', 'eddsa', 'base64_to_binary', 'base58_to_binary'):
+        setattr(static, name, getattr(Exchange, name))
+    endpoint = private_endpoint(exchange.api or {})
+    if endpoint is None:
+        continue
+    assert sign(exchange, endpoint) == sign(static, endpoint), id
+    assert sign(exchange, endpoint) == sign(static, endpoint), id
+    exchange.secret = static.secret = other
+    assert sign(exchange, endpoint) == sign(static, endpoint), id
+    signed += not isinstance(sign(exchange, endpoint), type)
+assert signed > 100, signed
+
+# the base58 credentials of wavesexchange, and its eddsa signature
+
+if eddsa is not None:
+    tokens = []
+    for static in (False, True):
+        instance = freeze(ccxt.wavesexchange())
+        if static:
+            instance.eddsa = Exchange.eddsa
+            instance.base58_to_binary = Exchange.base58_to_binary
+        instance.apiKey = Exchange.binary_to_base58(b'\x01' + b'k' * 31)
+        instance.secret = Exchange.binary_to_base58(b'\x02' + b's' * 31)
+        instance.privatePostOauth2Token = lambda request: {'access_token': request['password']}
+        instance.signer.check(instance.secret, instance.apiKey)
+        instance.check_required_keys()
+        tokens.append(instance.get_access_token())
+    assert tokens[0] == tokens[1]
+
+# fetch2 forgets the decoded credentials when only the api key changes, sync and async
+
+
+def signed_request(path, api='public', method='GET', params={}, headers=None, body=None):
+    return {'url': 'https://example.com/' + path, 'method': method, 'headers': headers, 'body': body}
+
+
+exchange = ccxt.Exchange({'secret': other, 'apiKey': apiKey})
+exchange.sign = signed_request
+exchange.fetch = lambda url, method='GET', headers=None, body=None: exchange.signer.base58_to_binary(exchange.apiKey)
+assert exchange.fetch2('path') == Exchange.base58_to_binary(apiKey)
+exchange.apiKey = Exchange.binary_to_base58(b'new' * 10)
+assert exchange.fetch2('path') == b'new' * 10
+
+
+async def test_async():
+    exchange = ccxt.async_support.Exchange({'secret': other, 'apiKey': apiKey, 'enableRateLimit': False})
+
+    async def fetch(url, method='GET', headers=None, body=None):
+        return exchange.signer.base58_to_binary(exchange.apiKey)
+
+    exchange.sign = signed_request
+    exchange.fetch = fetch
+    try:
+        assert await exchange.fetch2('path') == Exchange.base58_to_binary(apiKey)
+        exchange.apiKey = Exchange.binary_to_base58(b'new' * 10)
+        assert await exchange.fetch2('path') == b'new' * 10
+        assert exchange.signer.apiKey is exchange.apiKey
+    finally:
+        await exchange.close()
+
+
+asyncio.get_event_loop().run_until_complete(test_async())
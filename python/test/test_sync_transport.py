@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import sys
+import threading
+
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+
+class Handler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        content_type = 'application/json'
+        status = 200
+        if self.path == '/text':
+            content_type = 'text/plain'
+            body = b'pong'
+        elif self.path == '/error':
+            body = b'{"error":["EOrder:Unknown order"]}'
+        elif self.path == '/invalid':
+            body = b'{"name":"caf\xe9"}'  # latin-1
+        elif self.path == '/missing':
+            status = 404
+            body = b'{"error":"not found"}'
+        else:
+            body = json.dumps({
+                'userAgent': self.headers.get('User-Agent'),
+                'cookie': self.headers.get('Cookie'),
+            }).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Set-Cookie', 'session=1')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+thread = threading.Thread(target=server.serve_forever)
+server.daemon_threads = True
+thread.daemon = True
+thread.start()
+url = 'http://127.0.0.1:' + str(server.server_port) + '/'
+
+# ----------------------------------------------------------------------------
+
+assert ccxt.Exchange.is_json_encoded_object(b'{"a":1}')
+assert ccxt.Exchange.is_json_encoded_object(b'[]')
+assert not ccxt.Exchange.is_json_encoded_object(b'ok')
+assert ccxt.Exchange.is_json_encoded_object('{"a":1}')
+
+exchange = ccxt.Exchange({'id': 'transport', 'userAgent': 'ccxt-test'})
+
+for i in range(0, 3):
+    response = exchange.fetch(url)
+    assert response == {'userAgent': 'ccxt-test', 'cookie': None}
+
+stats = exchange.transport_stats
+assert stats['requests'] == 3
+assert stats['connectionsOpened'] == 1
+assert stats['connectionsReused'] == 2
+assert stats['bytesIn'] > 0
+
+# the static headers follow the instance properties
+exchange.userAgent = 'ccxt-test-2'
+assert exchange.fetch(url)['userAgent'] == 'ccxt-test-2'
+exchange.headers['X-Test'] = '1'
+assert exchange.prepare_request_headers()['X-Test'] == '1'
+assert exchange.prepare_request_headers({'X-Other': '2'})['X-Other'] == '2'
+
+# the user agent dict changed in place
+exchange.userAgent = {'User-Agent': 'ccxt-test-3'}
+assert exchange.fetch(url)['userAgent'] == 'ccxt-test-3'
+exchange.userAgent['User-Agent'] = 'ccxt-test-4'
+assert exchange.fetch(url)['userAgent'] == 'ccxt-test-4'
+
+# the counters of the threads sharing an instance
+
+from concurrent.futures import ThreadPoolExecutor  # noqa: E402
+
+shared = ccxt.Exchange({'id': 'transport', 'requests_pool_maxsize': 8})
+with ThreadPoolExecutor(8) as executor:
+    list(executor.map(lambda i: shared.fetch(url), range(0, 200)))
+assert shared.transport_stats['requests'] == 200
+assert shared.transport_stats['connectionsOpened'] + shared.transport_stats['connectionsReused'] == 200
+assert shared.transport_stats == dict(shared.transport_stats)
+
+# the json responses are decoded to text only when the text is used
+
+
+class Reader(ccxt.Exchange):
+
+    bodies = []
+
+    def handle_errors(self, code, reason, url, method, headers, body, response, request_headers, request_body):
+        self.bodies.append(body)
+        if body.find('EOrder:Unknown order') >= 0:
+            raise ccxt.OrderNotFound(self.id + ' ' + body)
+
+
+quiet = ccxt.Exchange({'id': 'transport', 'enableLastHttpResponse': False})
+assert not quiet.is_response_text_required(200, {})
+assert quiet.fetch(url)['cookie'] is None and quiet.last_http_response is None
+assert quiet.fetch(url + 'text') == 'pong'
+assert quiet.is_response_text_required(200, None) and quiet.is_response_text_required(404, {})
+assert ccxt.Exchange({'id': 'transport'}).is_response_text_required(200, {})  # kept in last_http_response
+reader = Reader({'id': 'transport', 'enableLastHttpResponse': False, 'enableLastJsonResponse': False})
+assert reader.is_response_text_required(200, {})
+reader.fetch(url)
+assert reader.bodies[-1].startswith('{"userAgent"') and reader.last_http_response is None
+
+# the json of a body with invalid utf-8 is parsed from the text with the invalid bytes replaced
+assert quiet.parse_json(b'{"name":"caf\xe9"}') == {'name': 'caf\ufffd'}
+assert quiet.parse_json(b'{"name":"caf\xe9"') is None
+assert quiet.fetch(url + 'invalid') == {'name': 'caf\ufffd'}
+
+# the errors keep their response for the error mapping of the exchanges, even when the responses are not kept
+try:
+    reader.fetch(url + 'error')
+    assert False
+except ccxt.OrderNotFound:
+    assert reader.last_http_response == '{"error":["EOrder:Unknown order"]}'
+    assert reader.last_json_response == {'error': ['EOrder:Unknown order']}
+reader.fetch(url)
+assert reader.last_http_response is None and reader.last_json_response is None
+try:
+    quiet.fetch(url + 'missing')
+    assert False
+except ccxt.ExchangeNotAvailable:
+    assert quiet.last_http_response == '{"error":"not found"}'
+
+# the cookies are kept on request
+keeper = ccxt.Exchange({'id': 'transport', 'clearCookies': False})
+keeper.fetch(url)
+assert keeper.fetch(url)['cookie'] == 'session=1'
+
+server.shutdown()
@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+
+class throttled(ccxt.Exchange):
+
+    def describe(self):
+        return self.deep_extend(super(throttled, self).describe(), {
+            'id': 'throttled',
+            'rateLimit': 10,
+            'rateLimitBuckets': {
+                'orders': {'rateLimit': 40},
+            },
+            'api': {
+                'public': {
+                    'get': {
+                        'time': 1,
+                        'ticker/price': 2,
+                    },
+                },
+                'private': {
+                    'get': [
+                        'account',
+                    ],
+                    'post': {
+                        'order': {'cost': 1, 'buckets': {'orders': 1}},
+                    },
+                },
+            },
+        })
+
+    def sign(self, path, api='public', method='GET', params={}, headers=None, body=None):
+        return {'url': path, 'method': method, 'headers': headers, 'body': body}
+
+    def fetch(self, url, method='GET', headers=None, body=None):
+        return {}
+
+
+exchange = throttled({'enableRateLimit': True})
+
+# ----------------------------------------------------------------------------
+# endpoint definitions
+
+assert exchange.api_endpoint('time', 'public', 'GET') == {'cost': 1, 'buckets': {}}
+assert exchange.api_endpoint('ticker/price', 'public', 'GET') == {'cost': 2, 'buckets': {}}
+assert exchange.api_endpoint('account', 'private', 'GET') == {'cost': 1, 'buckets': {}}
+assert exchange.api_endpoint('order', 'private', 'POST') == {'cost': 1, 'buckets': {'orders': 1}}
+assert exchange.api_endpoint('unknown', 'public', 'GET') == {'cost': 1, 'buckets': {}}
+
+assert hasattr(exchange, 'publicGetTickerPrice')
+assert hasattr(exchange, 'private_post_order')
+assert exchange.rateLimitBuckets['orders']['rateLimit'] == 40
+
+# an instance with an api of its own leaves the costs of the other instances as they were
+
+custom = throttled({'api': {'public': {'get': {'time': 5}}, 'private': {'get': ['balance']}}})
+assert custom.api_endpoint('time', 'public', 'GET') == {'cost': 5, 'buckets': {}}
+assert custom.api_endpoint('ticker/price', 'public', 'GET') == {'cost': 2, 'buckets': {}}
+assert exchange.api_endpoint('time', 'public', 'GET') == {'cost': 1, 'buckets': {}}
+assert exchange.api_endpoint('ticker/price', 'public', 'GET') == {'cost': 2, 'buckets': {}}
+assert custom.api_endpoint('balance', 'private', 'GET') == {'cost': 1, 'buckets': {}}
+assert len(exchange.apiEndpoints) == 4 and ('private', 'GET', 'account') not in custom.apiEndpoints
+assert throttled().api_endpoint('ticker/price', 'public', 'GET') == {'cost': 2, 'buckets': {}}
+assert exchange.api_endpoint('ticker/price', 'public', 'GET') == {'cost': 2, 'buckets': {}}
+
+# ----------------------------------------------------------------------------
+# weighted costs
+
+start = time.time()
+for i in range(0, 4):
+    exchange.publicGetTime()
+cheap = time.time() - start
+
+start = time.time()
+for i in range(0, 4):
+    exchange.publicGetTickerPrice()
+heavy = time.time() - start
+
+assert heavy > cheap
+
+start = time.time()
+for i in range(0, 5):
+    exchange.privatePostOrder()
+orders = time.time() - start
+
+assert orders >= 0.1
+
+# ----------------------------------------------------------------------------
+# a rateLimit changed after the instance was built
+
+tuned = ccxt.Exchange()
+tuned.rateLimit = 50
+start = time.time()
+for i in range(0, 4):
+    tuned.throttle()
+assert 0.1 <= time.time() - start < 0.5
+assert tuned.rateLimiter.refillRate == 1 / 50
+
+slower = throttled({'enableRateLimit': True})
+slower.rateLimit = 50
+start = time.time()
+for i in range(0, 4):
+    slower.publicGetTime()
+assert time.time() - start >= 0.1
+
+# ----------------------------------------------------------------------------
+# threads sharing a sync instance burst up to the capacity
+
+from concurrent.futures import ThreadPoolExecutor  # noqa: E402
+
+bursty = throttled({'enableRateLimit': True, 'tokenBucket': {'capacity': 4}, 'requests_pool_maxsize': 8})
+assert bursty.session.get_adapter('https://example.com')._pool_maxsize == 8
+time.sleep(0.05)
+start = time.time()
+with ThreadPoolExecutor(4) as executor:
+    list(executor.map(lambda i: bursty.publicGetTime(), range(0, 4)))
+assert time.time() - start < 0.02
+start = time.time()
+with ThreadPoolExecutor(4) as executor:
+    list(executor.map(lambda i: bursty.publicGetTime(), range(0, 8)))
+assert time.time() - start >= 0.04
+
+# ----------------------------------------------------------------------------
+# instances sharing one budget
+
+shared1 = throttled({'enableRateLimit': True, 'rateLimitBackend': 'process'})
+shared2 = throttled({'enableRateLimit': True, 'rateLimitBackend': 'process'})
+assert shared1.rateLimiter is shared2.rateLimiter
+assert shared1.rateLimiters['orders'] is shared2.rateLimiters['orders']
+assert shared1.rateLimiter is not exchange.rateLimiter
+
+start = time.time()
+for i in range(0, 3):
+    shared1.publicGetTime()
+    shared2.publicGetTime()
+assert time.time() - start >= 0.04
+
+other = throttled({'enableRateLimit': True, 'rateLimitBackend': 'process', 'rateLimitKey': 'other'})
+assert other.rateLimiter is not shared1.rateLimiter
+
+from ccxt.base import token_bucket  # noqa: E402
+
+if token_bucket.fcntl is not None:
+    import tempfile  # noqa: E402
+    from ccxt.base.token_bucket import FileTokenBucket  # noqa: E402
+    path = os.path.join(tempfile.mkdtemp(), 'test.bucket')
+    bucket1 = FileTokenBucket({'refillRate': 1 / 10}, path)
+    bucket2 = FileTokenBucket({'refillRate': 1 / 10}, path)
+    time.sleep(0.01)
+    assert bucket1.take(2) == 0
+    assert bucket2.take() > 0  # the state is in the file, not in the instance
+
+# ----------------------------------------------------------------------------
+# adaptive rate limiting
+
+
+class limited(throttled):
+
+    responses = []
+
+    def fetch(self, url, method='GET', headers=None, body=None):
+        status, response_headers = self.responses.pop(0)
+        self.handle_rate_limit_headers(status, response_headers)
+        if status == 429:
+            raise ccxt.RateLimitExceeded(self.id + ' 429')
+        return {}
+
+
+adaptive = limited({
+    'enableRateLimit': True,
+    'adaptiveRateLimit': True,
+    'rateLimitBackoff': 10,
+    'rateLimitHeaders': {
+        'X-Used-Weight': {'type': 'used', 'limit': 1200, 'window': 60000},
+    },
+})
+
+assert adaptive.parse_retry_after('2') == 2000
+assert adaptive.parse_retry_after('0.5') == 500
+assert adaptive.parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0
+assert adaptive.parse_retry_after(None) is None
+
+adaptive.handle_rate_limit_headers(200, {'X-Used-Weight': '1200'})
+assert adaptive.rateLimiter.refillRate == 0.02
+assert adaptive.rateLimiter.take() > 0  # the weight is used up
+adaptive.handle_rate_limit_headers(200, {'X-Used-Weight': '10'})
+assert adaptive.rateLimiter.take() == 0
+# the bucket holds the budget of the window
+assert adaptive.rateLimiter.capacity == 1200
+assert all(adaptive.rateLimiter.take() == 0 for i in range(0, 1000))
+
+# a used up window holds the bucket until it resets, not until the refill of one unit
+
+milliseconds = adaptive.milliseconds
+adaptive.milliseconds = lambda: 1600000060000  # 20 seconds before the end of the minute
+adaptive.handle_rate_limit_headers(200, {'X-Used-Weight': '1200'})
+assert 19.9 < adaptive.rateLimiter.take() <= 20.1
+adaptive.handle_rate_limit_headers(200, {'X-Used-Weight': '0'})
+assert adaptive.rateLimiter.take() == 0
+adaptive.milliseconds = milliseconds
+
+# the used budget of a header without a limit is ignored
+
+unknown = limited({'enableRateLimit': True, 'adaptiveRateLimit': True, 'rateLimitHeaders': {'X-Used': {'type': 'used', 'window': 1000}}})
+tokens = unknown.rateLimiter.tokens
+unknown.handle_rate_limit_headers(200, {'X-Used': '5'})
+assert unknown.rateLimiter.tokens == tokens and unknown.rateLimiter.capacity == 1
+
+limited.responses = [(429, {'Retry-After': '0.05'}), (429, {}), (200, {})]
+start = time.time()
+assert adaptive.publicGetTime() == {}
+assert time.time() - start >= 0.05
+assert limited.responses == []
+
+limited.responses = [(429, {})]
+try:
+    adaptive.privatePostOrder()  # not idempotent
+    assert False
+except ccxt.RateLimitExceeded:
+    pass
+assert limited.responses == []
+
+limited.responses = [(429, {})] * 5
+try:
+    adaptive.publicGetTime()
+    assert False
+except ccxt.RateLimitExceeded:
+    pass
+assert len(limited.responses) == 5 - adaptive.rateLimitMaxRetries - 1
+
+# ----------------------------------------------------------------------------
+# event-driven async throttler, higher priority first
+
+if sys.version_info >= (3, 7):
+
+    import asyncio  # noqa: E402
+    import ccxt.async_support  # noqa: E402
+    from ccxt.async_support.base.throttle import Throttler, throttle  # noqa: E402
+
+    async def test_throttler_priorities():
+        throttler = Throttler({'refillRate': 1 / 5})
+        released = []
+
+        async def request(name, cost=None, priority=0):
+            await throttler(cost, priority)
+            released.append(name)
+
+        await throttler()  # drain the initial token
+        await asyncio.gather(
+            request('ticker1'),
+            request('ticker2'),
+            request('order', 1, 1),
+            request('cancel', 1, 2),
+        )
+        assert released == ['cancel', 'order', 'ticker1', 'ticker2']
+
+        start = time.time()
+        await asyncio.gather(*[throttler() for i in range(0, 10)])
+        assert time.time() - start >= 0.04
+
+    async def test_throttler_aging():
+        # the waiter of a low priority goes ahead of the higher ones arriving more than 2 * 20ms after it
+        throttler = Throttler({'refillRate': 1 / 20, 'priorityAging': 0.02})
+        released = []
+
+        async def request(name, priority=0):
+            await throttler(None, priority)
+            released.append(name)
+
+        await throttler()
+        tasks = [asyncio.ensure_future(request('low'))]
+        for i in range(0, 30):
+            await asyncio.sleep(0.005)
+            tasks.append(asyncio.ensure_future(request(i, 2)))
+        await asyncio.gather(*tasks)
+        assert 3 < released.index('low') < 12
+        assert [name for name in released if name != 'low'] == list(range(0, 30))
+
+    async def test_rate_limit_changes():
+        exchange = ccxt.async_support.Exchange({'rateLimit': 2000})
+        await exchange.throttle()
+        waiter = exchange.throttle()
+        exchange.rateLimit = 10
+        assert exchange.update_rate_limiter()
+        assert not exchange.update_rate_limiter()
+        start = time.time()
+        await waiter
+        for i in range(0, 3):
+            await exchange.throttle()
+        assert time.time() - start < 0.5
+        assert exchange.rateLimiter.refillRate == exchange.throttle.config['refillRate'] == 1 / 10
+
+        # the former interface follows the rate limit of each call
+        former = throttle({})
+        start = time.time()
+        for i in range(0, 4):
+            await former(10)
+        assert 0.02 <= time.time() - start < 0.5
+        start = time.time()
+        for i in range(0, 4):
+            await former(0)
+        assert time.time() - start < 0.01
+
+    asyncio.run(test_throttler_priorities())
+    asyncio.run(test_throttler_aging())
+    asyncio.run(test_rate_limit_changes())